@@ -0,0 +1,91 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from apps.user.authentication import ClaimsJWTAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async counterpart of DRF's `APIView` for the read endpoints served under ASGI.
+    - Requests are wrapped in a DRF `Request`, so filter backends, paginators and serializers work
+      unchanged; users are authenticated with `ClaimsJWTAuthentication.aauthenticate`.
+    - `permission_classes` and error responses behave like DRF's; responses are always JSON.
+    - Handlers are `async def` methods named after the HTTP method and return a DRF `Response`;
+      `action` names what they do, like a viewset action.
+    - Methods without a handler go to `sync_view`, the DRF view of the same route, run in a thread.
+    """
+
+    permission_classes = ()
+    action = None
+    authenticator = ClaimsJWTAuthentication()
+    renderer = JSONRenderer()
+    sync_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Authentication is by bearer token only, as with the DRF views.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        if request.method.lower() not in self.http_method_names or handler is None:
+            if self.sync_view is not None:
+                return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+
+        request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+        request.accepted_renderer = self.renderer
+        request.accepted_media_type = self.renderer.media_type
+        self.request = request
+        try:
+            request.user = await self.authenticate(request)
+            self.check_permissions(request)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(response)
+
+    async def authenticate(self, request):
+        result = await self.authenticator.aauthenticate(request)
+        if result is None:
+            return AnonymousUser()
+        return result[0]
+
+    def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            exc.auth_header = self.authenticator.authenticate_header(self.request)
+        response = exception_handler(exc, {"view": self, "request": self.request})
+        if response is None:
+            raise exc
+        return response
+
+    def finalize_response(self, response):
+        """Renders the DRF `Response` here, so Django does not hand a deferred render to a thread."""
+        if not isinstance(response, Response):
+            # Already a plain Django response, e.g. a 304 Not Modified.
+            return response
+        content = self.renderer.render(response.data, self.renderer.media_type)
+        rendered = HttpResponse(content, status=response.status_code, content_type=self.renderer.media_type)
+        for header, value in response.items():
+            if header.lower() != "content-type":
+                rendered[header] = value
+        return rendered
+
+    def get_serializer_context(self):
+        return {"request": self.request, "view": self}
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company_name', models.CharField(max_length=100)),
+                ('company_location', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['company_name'], name='company_name_idx'),
+        ),
+    ]
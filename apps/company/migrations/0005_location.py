@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.locations.gazetteer import relocate
+
+
+def locate_existing_companies(apps, schema_editor):
+    relocate(apps.get_model('company', 'Company').objects.all(), 'company_location')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0004_updated_at'),
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='location',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='locations.location'),
+        ),
+        migrations.RunPython(locate_existing_companies, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.locations.gazetteer import resolve_location
+from apps.locations.models import Location
 from apps.user.models import User
 
 
@@ -8,3 +10,24 @@ class Company(models.Model):
     company_location = models.CharField(max_length=100)
     description = models.TextField()
     owner = models.ForeignKey(User, on_delete=models.CASCADE, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # `company_location` resolved against the gazetteer on save, see `locate`.
+    location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company_name'], name='company_name_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'company_location' in update_fields:
+            self.locate()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'location'}
+        super().save(*args, **kwargs)
+
+    def locate(self):
+        """Resolves `company_location` against the gazetteer."""
+        place = resolve_location(self.company_location)
+        self.location_id = place and place.id
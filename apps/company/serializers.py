@@ -1,9 +1,12 @@
 from rest_framework import serializers
 
 from apps.company.models import Company
+from apps.locations.serializers import LocationField
+from apps.sparse_fields import SparseFieldsetSerializerMixin
 
 
-class CompanyCreateSerializer(serializers.ModelSerializer):
+class CompanyCreateSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    location = LocationField(source='location_id')
 
     class Meta:
         model = Company
@@ -57,3 +57,16 @@ class CompanyViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('company_name', response.data)
 
+
+    def test_company_list_is_conditional(self):
+        company = Company.objects.create(
+            company_name='Test Company', company_location='Test Location', description='Description.', owner=self.user
+        )
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        company.company_name = 'Renamed Company'
+        company.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -4,13 +4,19 @@ from rest_framework.response import Response
 
 from apps.company.models import Company
 from apps.company.serializers import CompanyCreateSerializer
+from apps.conditional import ConditionalGetMixin
 from apps.permissions import IsEmployer
+from apps.user.authentication import get_company_id
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Company.objects.all()
     serializer_class = CompanyCreateSerializer
     permission_classes = [IsAuthenticated, IsEmployer]
+    query_budgets = {
+        "list": 3,
+        "create": 4,
+    }
 
     def create(self, request):
         """
@@ -21,7 +27,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
             - 409 Conflict if the user already own a company or the company name already exists.
             - 400 Bad Request if data is invalid.
         """
-        if Company.objects.filter(owner=request.user).exists():
+        if get_company_id(request.user) is not None:
             return Response({'message': 'User already owns a company.'}, status=status.HTTP_409_CONFLICT)
 
         data = request.data.copy()
@@ -0,0 +1,91 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for the `list` and `retrieve` actions of a view over models with `updated_at`.
+    - The validators come from one aggregate query over the queryset the response is built from:
+      the row count and the latest of `last_modified_fields`. The ETag hashes them with the path,
+      query string and user (`get_etag_scope`); Last-Modified is the latest timestamp.
+    - Page-number pagination reuses the count (`condition_count`) instead of counting again.
+    - A matching `If-None-Match` (or, without one, `If-Modified-Since`) answers 304 before the
+      response is looked up in a cache or serialized.
+    - Deleting a row lowers the count, which changes the ETag but not Last-Modified: lists are
+      best revalidated with `If-None-Match`.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    # Timestamps the response depends on, including those of related rows it nests.
+    last_modified_fields = ("updated_at",)
+
+    def get_etag_scope(self, request):
+        """Who the response is built for; users of one scope share ETags."""
+        return f"user:{request.user.pk}"
+
+    def get_condition_queryset(self, request, *args, **kwargs):
+        if self.action == "retrieve":
+            return self.get_queryset().filter(pk=kwargs["pk"])
+        return self.filter_queryset(self.get_queryset())
+
+    def get_condition_aggregates(self):
+        return {
+            "count": Count("pk"),
+            **{f"last_{number}": Max(field) for number, field in enumerate(self.last_modified_fields)},
+        }
+
+    def get_validators(self, request, row):
+        """
+        - **Returns**: the `(etag, last_modified)` of the aggregated `row`, or `(None, None)` for a
+          missing detail row, which is answered without validators (404, or a fallback).
+        """
+        if row["count"] == 0 and self.action == "retrieve":
+            return None, None
+        if self.action == "list":
+            # Lets the paginator skip its own COUNT.
+            self.condition_count = row["count"]
+        last = max((value for key, value in row.items() if key != "count" and value is not None), default=None)
+        query = sorted(request.query_params.lists())
+        fingerprint = f"{request.path}|{query}|{self.get_etag_scope(request)}|{row['count']}|{last and last.isoformat()}"
+        etag = f'"{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()}"'
+        return etag, last and int(last.timestamp())
+
+    def finish_conditional(self, request, validators, response):
+        etag, last_modified = validators
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+        queryset = self.get_condition_queryset(request, *args, **kwargs)
+        validators = self.get_validators(request, queryset.order_by().aggregate(**self.get_condition_aggregates()))
+        if validators[0] is None:
+            return handler(request, *args, **kwargs)
+        not_modified = get_conditional_response(request, etag=validators[0], last_modified=validators[1])
+        if not_modified is not None:
+            return not_modified
+        return self.finish_conditional(request, validators, handler(request, *args, **kwargs))
+
+    async def aconditional_response(self, handler, request, queryset, *args, **kwargs):
+        """Async `conditional_response`; the caller builds the condition queryset, which may need a thread."""
+        row = await queryset.order_by().aaggregate(**self.get_condition_aggregates())
+        validators = self.get_validators(request, row)
+        if validators[0] is None:
+            return await handler(request, *args, **kwargs)
+        not_modified = get_conditional_response(request, etag=validators[0], last_modified=validators[1])
+        if not_modified is not None:
+            return not_modified
+        return self.finish_conditional(request, validators, await handler(request, *args, **kwargs))
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
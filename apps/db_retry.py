@@ -0,0 +1,46 @@
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The database is busy, try again shortly."
+    default_code = "database_busy"
+
+
+def is_database_locked(exc):
+    """Whether `exc` is SQLite giving up on a lock held by another connection ("database is locked")."""
+    return isinstance(exc, OperationalError) and "locked" in str(exc)
+
+
+def retry_on_locked(func):
+    """
+    Calls `func`, retrying it while the database reports it locked.
+    - `func` must run its writes in its own `transaction.atomic()` block, which a failed attempt rolls back.
+    - Waits a random delay of up to `DATABASE_LOCKED_RETRY_DELAY` doubled per attempt (capped at
+      `DATABASE_LOCKED_RETRY_MAX_DELAY`) between the `DATABASE_LOCKED_RETRIES` retries.
+    - **Returns**: what `func` returns.
+    - Raises `DatabaseBusy` (503) once the retries are spent; other database errors are not retried.
+    """
+    retries = getattr(settings, "DATABASE_LOCKED_RETRIES", 4)
+    base_delay = getattr(settings, "DATABASE_LOCKED_RETRY_DELAY", 0.05)
+    max_delay = getattr(settings, "DATABASE_LOCKED_RETRY_MAX_DELAY", 1.0)
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except OperationalError as exc:
+            if not is_database_locked(exc):
+                raise
+            if attempt == retries:
+                logger.warning("Database still locked after %d attempts", attempt + 1)
+                raise DatabaseBusy() from exc
+            # Full jitter, so the writers that collided do not all come back at once.
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.jobs'
+
+    def ready(self):
+        from apps.jobs import signals
+
+        post_migrate.connect(signals.setup_search_index, sender=self)
@@ -0,0 +1,86 @@
+"""
+Cold storage of expired job listings: `archive_expired` moves listings expired for longer than a
+grace period, with their applications, into `ArchivedJobListing` and `ArchivedJobApplication`,
+keeping the hot tables to the listings still in use.
+
+Each batch is copied and deleted in one transaction, so an interrupted run leaves every listing
+either fully archived or untouched, and the next run resumes with the listings left.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.jobs.models import (
+    ApplicationDailyStats,
+    ArchivedJobApplication,
+    ArchivedJobListing,
+    JobApplication,
+    JobListing,
+)
+from apps.user.authentication import get_company_id
+
+
+def copy_fields(instance, model):
+    """The values of the fields `model` shares with `instance`, by attribute name (`company_id`, ...)."""
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in model._meta.concrete_fields
+        if hasattr(instance, field.attname)
+    }
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Archives up to `batch_size` listings that expired before `cutoff`, oldest id first.
+    - **Returns**: the number of listings and applications archived.
+    """
+    with transaction.atomic():
+        job_ids = list(
+            JobListing.objects.select_for_update().filter(expires_at__lt=cutoff)
+            .order_by("pk").values_list("pk", flat=True)[:batch_size]
+        )
+        if not job_ids:
+            return 0, 0
+        jobs = JobListing.objects.filter(pk__in=job_ids)
+        applications = list(JobApplication.objects.filter(job_id__in=job_ids))
+        ArchivedJobListing.objects.bulk_create(
+            ArchivedJobListing(**copy_fields(job, ArchivedJobListing)) for job in jobs
+        )
+        ArchivedJobApplication.objects.bulk_create(
+            (ArchivedJobApplication(**copy_fields(application, ArchivedJobApplication)) for application in applications),
+            batch_size=1000,
+        )
+        # The rollups move along, so the employer analytics still count the archived listings.
+        ApplicationDailyStats.objects.filter(job_id__in=job_ids).update(archived_job_id=F("job_id"), job=None)
+        # Cascades to the applications; the signals unindex the listings and invalidate the caches.
+        jobs.delete()
+    return len(job_ids), len(applications)
+
+
+def archive_expired(batch_size=500, grace_days=None, now=None):
+    """
+    Archives every listing expired for more than `grace_days` (default `JOB_ARCHIVE_GRACE_DAYS`),
+    `batch_size` listings per transaction.
+    - **Returns**: yields the `(listings, applications)` archived by each batch.
+    """
+    if grace_days is None:
+        grace_days = getattr(settings, "JOB_ARCHIVE_GRACE_DAYS", 30)
+    cutoff = (now or timezone.now()) - timedelta(days=grace_days)
+    while True:
+        listings, applications = archive_batch(cutoff, batch_size)
+        if not listings:
+            return
+        yield listings, applications
+
+
+def get_visible_archived_jobs(user):
+    """Archived listings staff and the owning employers read through the job endpoints; candidates see none."""
+    jobs = ArchivedJobListing.objects.select_related("company")
+    if user.is_staff:
+        return jobs
+    if user.roles == "employer":
+        return jobs.filter(company_id=get_company_id(user))
+    return jobs.none()
@@ -0,0 +1,130 @@
+"""
+Async versions of the hot read endpoints, routed by `job_portal.asgi_urls` under ASGI.
+
+They answer exactly like the `JobViewSet` and `JobApplicationViewSet` actions they replace,
+share their response cache entries, and hand every other method of their route to them.
+"""
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.async_views import AsyncAPIView
+from apps.conditional import ConditionalGetMixin
+from apps.jobs.cache import ScopedResponseCacheMixin
+from apps.jobs.archive import get_visible_archived_jobs
+from apps.jobs.facets import get_facets
+from apps.jobs.models import JobApplication
+from apps.jobs.serializers import ArchivedJobSerializer, JobApplicationSerializer, JobSerializer
+from apps.jobs.views import JobApplicationViewSet, JobViewSet, get_visible_jobs
+from apps.sparse_fields import SparseFieldsetMixin
+
+
+class AsyncJobView(ScopedResponseCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, AsyncAPIView):
+    permission_classes = JobViewSet.permission_classes
+    serializer_class = JobSerializer
+    last_modified_fields = JobViewSet.last_modified_fields
+    sparse_fieldset_columns = JobViewSet.sparse_fieldset_columns
+
+    def get_queryset(self):
+        return self.narrow_queryset(get_visible_jobs(self.request.user))
+
+
+class AsyncJobListView(AsyncJobView):
+    """Async `GET /jobs/jobs/`, see `JobViewSet.list`."""
+
+    filter_backends = JobViewSet.filter_backends
+    search_fields = JobViewSet.search_fields
+    filterset_class = JobViewSet.filterset_class
+    pagination_class = JobViewSet.pagination_class
+    action = "list"
+    query_budgets = {"list": 4}
+
+    async def get(self, request):
+        if request.query_params.get("archived") in ("1", "true"):
+            return await self.list_archived(request)
+        return await self.acached_response(self.conditional_list, request)
+
+    async def list_archived(self, request):
+        """See `JobViewSet.list_archived`."""
+        if not request.user.is_staff and request.user.roles != "employer":
+            return Response(
+                {"message": "You must be an employer or admin to access this resource."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        # Resolving the employer's company can query.
+        jobs = await sync_to_async(get_visible_archived_jobs)(request.user)
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(jobs.order_by("-created_at", "-id"), request, view=self)
+        return paginator.get_paginated_response(
+            ArchivedJobSerializer(page, many=True, context=self.get_serializer_context()).data
+        )
+
+    async def conditional_list(self, request):
+        queryset = await sync_to_async(self.get_condition_queryset)(request)
+        return await self.aconditional_response(partial(self.list, queryset=queryset), request, queryset)
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    async def list(self, request, queryset):
+        # `queryset` is filtered in a thread by `conditional_list`, as building the filterset can query
+        # (the `company` choice is validated against its table); it is evaluated with the async ORM.
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        response = paginator.get_paginated_response(
+            JobSerializer(page, many=True, context=self.get_serializer_context()).data
+        )
+        if request.query_params.get("facets") in ("1", "true"):
+            response.data["facets"] = await sync_to_async(get_facets)(
+                queryset, request, self.get_cache_scope(request)
+            )
+        return response
+
+
+class AsyncJobDetailView(AsyncJobView):
+    """Async `GET /jobs/jobs/<pk>/`, see `JobViewSet.retrieve`."""
+
+    action = "retrieve"
+    query_budgets = {"retrieve": 2}
+
+    async def get(self, request, pk):
+        return await self.acached_response(self.conditional_retrieve, request, pk)
+
+    async def conditional_retrieve(self, request, pk):
+        queryset = self.get_condition_queryset(request, pk=pk)
+        return await self.aconditional_response(self.retrieve, request, queryset, pk)
+
+    async def retrieve(self, request, pk):
+        job = await self.get_queryset().filter(pk=pk).afirst()
+        if job is None:
+            archived = await aget_object_or_404(get_visible_archived_jobs(request.user), pk=pk)
+            return Response(ArchivedJobSerializer(archived, context=self.get_serializer_context()).data)
+        return Response(JobSerializer(job, context=self.get_serializer_context()).data)
+
+
+class AsyncJobApplicationListView(ConditionalGetMixin, AsyncAPIView):
+    """Async `GET /jobs/applications/`, the candidate's own applications; see `JobApplicationViewSet`."""
+
+    permission_classes = JobApplicationViewSet.permission_classes
+    filterset_class = JobApplicationViewSet.filterset_class
+    pagination_class = JobApplicationViewSet.pagination_class
+    action = "list"
+    query_budgets = {"list": 2}
+
+    async def get(self, request):
+        applications = JobApplication.objects.filter(candidate=request.user)
+        # The `status` filter is a plain choice, validated without a query.
+        applications = DjangoFilterBackend().filter_queryset(request, applications, self)
+        return await self.aconditional_response(partial(self.list, queryset=applications), request, applications)
+
+    async def list(self, request, queryset):
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = JobApplicationSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,115 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from apps.jobs.cache import invalidate_company_jobs
+from apps.jobs.models import JobListing
+from apps.jobs.recommend import record_job_changes
+from apps.jobs.search import get_search_backend
+from apps.jobs.serializers import JobSerializer
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq")
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+
+
+class UnsupportedImportFormat(Exception):
+    pass
+
+
+def iter_lines(stream):
+    """Yields the raw lines of a request body without reading it into memory."""
+    if stream is None:
+        return iter(())
+    return iter(stream.readline, b"")
+
+
+def iter_ndjson_rows(lines):
+    """
+    Yields `(row_number, data, error)` for each non-blank NDJSON line.
+    `data` is None and `error` is set when the line is not a JSON object.
+    """
+    for number, line in enumerate(codecs.iterdecode(lines, "utf-8"), start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield number, None, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+            continue
+        if not isinstance(data, dict):
+            yield number, None, {"non_field_errors": ["Expected a JSON object."]}
+            continue
+        yield number, data, None
+
+
+def iter_csv_rows(lines):
+    """Yields `(row_number, data, None)` for each CSV row; the first line is the header."""
+    reader = csv.DictReader(codecs.iterdecode(lines, "utf-8-sig"))
+    for number, data in enumerate(reader, start=1):
+        data = {key: value for key, value in data.items() if key is not None and value not in (None, "")}
+        yield number, data, None
+
+
+def iter_rows(stream, content_type):
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        return iter_ndjson_rows(iter_lines(stream))
+    if content_type in CSV_CONTENT_TYPES:
+        return iter_csv_rows(iter_lines(stream))
+    raise UnsupportedImportFormat(content_type)
+
+
+def import_jobs(rows, company, batch_size=None, max_errors=None):
+    """
+    Validates rows with `JobSerializer` and inserts the valid ones for `company`.
+    - Rows are consumed `batch_size` at a time; each batch is one `bulk_create` in its own
+      transaction, so memory only ever holds one batch.
+    - At most `max_errors` row errors are kept in the report; the rest are only counted.
+    - **Returns**: a dict with `created`, `failed`, `errors` and `errors_truncated`.
+    """
+    batch_size = batch_size or getattr(settings, "BULK_IMPORT_BATCH_SIZE", 1000)
+    max_errors = max_errors if max_errors is not None else getattr(settings, "BULK_IMPORT_MAX_ERRORS", 1000)
+    report = {"created": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    backend = get_search_backend()
+    rows = iter(rows)
+
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        jobs = []
+        # One serializer validates the whole chunk, like ListSerializer's child, so its
+        # fields are built once per chunk rather than once per row.
+        serializer = JobSerializer()
+        for number, data, error in batch:
+            if error is None:
+                try:
+                    validated_data = serializer.run_validation(data)
+                except ValidationError as exc:
+                    error = exc.detail
+                else:
+                    job = JobListing(company=company, **validated_data)
+                    # bulk_create skips `save()`, which resolves the location.
+                    job.locate()
+                    jobs.append(job)
+                    continue
+            report["failed"] += 1
+            if len(report["errors"]) < max_errors:
+                report["errors"].append({"row": number, "errors": error})
+            else:
+                report["errors_truncated"] = True
+        if jobs:
+            with transaction.atomic():
+                created = JobListing.objects.bulk_create(jobs)
+                backend.index_jobs(created)
+            record_job_changes(job.id for job in created)
+            report["created"] += len(created)
+
+    if report["created"]:
+        invalidate_company_jobs(company.id)
+    return report
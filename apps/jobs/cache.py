@@ -0,0 +1,184 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date
+from rest_framework.response import Response
+
+from apps.replicas.router import read_from_replica
+from apps.user.authentication import get_company_id
+
+HITS_KEY = "jobs:response-cache:hits"
+MISSES_KEY = "jobs:response-cache:misses"
+
+
+def version_key(scope):
+    return f"jobs:response-cache:version:{scope}"
+
+
+def get_scope_version(scope):
+    """
+    Returns the current version of a scope. A missing counter starts at the current time,
+    so an evicted counter never falls back to a version that still has entries cached.
+    """
+    return cache.get_or_set(version_key(scope), time.time_ns, None)
+
+
+async def aget_scope_version(scope):
+    return await cache.aget_or_set(version_key(scope), time.time_ns, None)
+
+
+def bump_scope_version(scope):
+    try:
+        cache.incr(version_key(scope))
+    except ValueError:
+        cache.set(version_key(scope), time.time_ns(), None)
+
+
+def invalidate_company_jobs(company_id):
+    """
+    Invalidates every cached job response a change to a company's listings can show up in:
+    the shared candidate and staff scopes and the owning employer's scope.
+    """
+    for scope in ("candidate", "staff", f"company:{company_id}"):
+        bump_scope_version(scope)
+
+
+def get_cache_timeout():
+    """
+    `JOB_RESPONSE_CACHE_TIMEOUT`, cut to `REPLICA_MAX_LAG_SECONDS` for a response read from a replica:
+    it may miss the write that just bumped the scope version, so it is kept no longer than a replica may lag.
+    """
+    timeout = getattr(settings, "JOB_RESPONSE_CACHE_TIMEOUT", 300)
+    if read_from_replica():
+        timeout = min(timeout, getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5))
+    return timeout
+
+
+def record(counter_key):
+    try:
+        cache.incr(counter_key)
+    except ValueError:
+        cache.add(counter_key, 0, None)
+        cache.incr(counter_key)
+
+
+async def arecord(counter_key):
+    try:
+        await cache.aincr(counter_key)
+    except ValueError:
+        await cache.aadd(counter_key, 0, None)
+        await cache.aincr(counter_key)
+
+
+def get_cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def validator_headers(response):
+    """The conditional GET validators of a response, cached along with its data."""
+    return {header: response[header] for header in ("ETag", "Last-Modified") if response.has_header(header)}
+
+
+def hit_response(request, data, headers):
+    """Answers from a cache entry, with a 304 when the request's validators still match the entry's."""
+    last_modified = headers.get("Last-Modified")
+    not_modified = get_conditional_response(
+        request, etag=headers.get("ETag"), last_modified=last_modified and parse_http_date(last_modified)
+    )
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        not_modified["X-Cache"] = "HIT"
+        return not_modified
+    return Response(data, headers={**headers, "X-Cache": "HIT"})
+
+
+class ScopedResponseCacheMixin:
+    """
+    Caches `list` and `retrieve` responses of a role-scoped viewset.
+    - Entries are shared by every user of a scope (all candidates, all staff, one employer's company),
+      keyed by the scope version, the path and the sorted query string (filters, search, page).
+    - Writes never delete entries: they bump the scope version, which orphans the old entries.
+    - Responses carry `X-Cache: HIT` or `X-Cache: MISS`.
+    - Entries keep the ETag and Last-Modified of `ConditionalGetMixin` (listed after this mixin), so
+      hits are revalidated, and answered 304, without a query.
+    - Async views wrap their handlers with `acached_response` and share the same entries.
+    """
+
+    def get_cache_scope(self, request):
+        if not hasattr(self, "_cache_scope"):
+            self._cache_scope = self.resolve_cache_scope(request)
+        return self._cache_scope
+
+    def resolve_cache_scope(self, request):
+        user = request.user
+        if user.is_staff:
+            return "staff"
+        if user.roles == "employer":
+            company_id = get_company_id(user)
+            return f"company:{company_id}" if company_id else None
+        if user.roles == "candidate":
+            return "candidate"
+        return None
+
+    def get_cache_key(self, request, scope, version=None):
+        if version is None:
+            version = get_scope_version(scope)
+        query = sorted(request.query_params.lists())
+        fingerprint = f"{request.get_host()}|{request.path}|{query}|{request.accepted_renderer.format}"
+        digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+        return f"jobs:response-cache:{scope}:{version}:{digest}"
+
+    def get_etag_scope(self, request):
+        # Cached responses, with their ETag, are shared by the whole scope.
+        return self.get_cache_scope(request) or super().get_etag_scope(request)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        scope = self.get_cache_scope(request)
+        if scope is None:
+            return handler(request, *args, **kwargs)
+        key = self.get_cache_key(request, scope)
+        cached = cache.get(key)
+        if cached is not None:
+            record(HITS_KEY)
+            return hit_response(request, *cached)
+
+        record(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, (response.data, validator_headers(response)), get_cache_timeout())
+        response["X-Cache"] = "MISS"
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        scope = self.get_cache_scope(request)
+        if scope is None:
+            return await handler(request, *args, **kwargs)
+        key = self.get_cache_key(request, scope, await aget_scope_version(scope))
+        cached = await cache.aget(key)
+        if cached is not None:
+            await arecord(HITS_KEY)
+            return hit_response(request, *cached)
+
+        await arecord(MISSES_KEY)
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            await cache.aset(key, (response.data, validator_headers(response)), get_cache_timeout())
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,81 @@
+"""
+Per-status applicant counters of job listings (`pending_count`, `accepted_count`, `rejected_count`).
+
+Signals move them with `F()` updates when an application is created, deleted or saved with
+another status; bulk writes that bypass signals call `apply_count_changes` themselves.
+`reconcile_counts` recounts them from the applications to repair any drift.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, When
+from django.utils import timezone
+
+from apps.jobs.cache import bump_scope_version
+from apps.jobs.models import JobApplication, JobListing
+
+COUNTER_FIELDS = {status: f"{status}_count" for status, _ in JobApplication.STATUS_CHOICES}
+
+
+def apply_count_changes(changes):
+    """Adds `changes` (`{job_id: {status: delta}}`) to the listings' counters with one UPDATE."""
+    updates = {}
+    for status, field in COUNTER_FIELDS.items():
+        whens = [
+            When(pk=job_id, then=F(field) + deltas[status]) for job_id, deltas in changes.items() if deltas.get(status)
+        ]
+        if whens:
+            updates[field] = Case(*whens, default=F(field), output_field=JobListing._meta.get_field(field))
+    if updates:
+        # The owning employer sees the counters, so their change dates the listing.
+        JobListing.objects.filter(pk__in=changes).update(**updates, updated_at=timezone.now())
+
+
+def invalidate_company_counts(company_id):
+    """Only the owning employer sees the counters, so only their cached job responses go stale."""
+    bump_scope_version(f"company:{company_id}")
+
+
+def count_applications(job_ids):
+    """Returns `{job_id: {status: count}}` for `job_ids`, from one grouped query."""
+    counts = defaultdict(Counter)
+    rows = JobApplication.objects.filter(job_id__in=job_ids).values_list("job_id", "status").annotate(count=Count("id"))
+    for job_id, status, count in rows.order_by():
+        counts[job_id][status] = count
+    return counts
+
+
+def reconcile_counts(batch_size=1000, dry_run=False):
+    """
+    Recounts the applications of every listing, `batch_size` listings at a time, and rewrites the
+    counters that drifted. Each batch is recounted and fixed in one transaction, with the listings
+    locked where the database supports it, so concurrent applications are not lost.
+    - **Returns**: a list of `(job_id, stored, actual)` for the drifted listings, counters as `{status: count}`.
+    """
+    fields = list(COUNTER_FIELDS.values())
+    drifted = []
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            jobs = list(
+                JobListing.objects.select_for_update().filter(pk__gt=last_id).order_by("pk").only("pk", "company_id", "updated_at", *fields)[:batch_size]
+            )
+            if not jobs:
+                break
+            last_id = jobs[-1].pk
+            counts = count_applications([job.pk for job in jobs])
+            changed = []
+            for job in jobs:
+                stored = {status: getattr(job, field) for status, field in COUNTER_FIELDS.items()}
+                actual = {status: counts[job.pk][status] for status in COUNTER_FIELDS}
+                if stored != actual:
+                    drifted.append((job.pk, stored, actual))
+                    for status, field in COUNTER_FIELDS.items():
+                        setattr(job, field, actual[status])
+                    job.updated_at = timezone.now()
+                    changed.append(job)
+            if changed and not dry_run:
+                JobListing.objects.bulk_update(changed, [*fields, "updated_at"])
+                for company_id in {job.company_id for job in changed}:
+                    invalidate_company_counts(company_id)
+    return drifted
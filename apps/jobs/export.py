@@ -0,0 +1,55 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from apps.jobs.serializers import JobApplicationSerializer
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class Echo:
+    """File-like object whose `write` returns the value, so `csv.writer` can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def iter_serialized(applications):
+    """
+    Serializes applications one at a time from a chunked server-side iterator.
+    - A single serializer instance is reused, so its fields are built once.
+    """
+    serializer = JobApplicationSerializer()
+    chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    for application in applications.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(application)
+
+
+def iter_ndjson(applications):
+    for row in iter_serialized(applications):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_csv(applications):
+    fields = [name for name, field in JobApplicationSerializer().fields.items() if not field.write_only]
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in iter_serialized(applications):
+        yield writer.writerow([row[field] for field in fields])
+
+
+def stream_applications(applications, export_format, filename):
+    """
+    Returns a `StreamingHttpResponse` exporting `applications` as NDJSON or CSV.
+    Peak memory is bounded by `EXPORT_CHUNK_SIZE` rows whatever the number of applications.
+    """
+    rows = iter_ndjson(applications) if export_format == "ndjson" else iter_csv(applications)
+    response = StreamingHttpResponse(rows, content_type=EXPORT_FORMATS[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
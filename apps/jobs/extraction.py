@@ -0,0 +1,85 @@
+"""
+Plain-text extraction from resume files.
+
+Nothing here touches the database or Django settings, so the functions can run in
+worker processes of a `ProcessPoolExecutor`.
+"""
+import os
+import re
+import zipfile
+from collections import Counter
+from xml.etree import ElementTree
+
+from pypdf import PdfReader
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+MAX_TERM_LENGTH = 64
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the to was were will with".split()
+)
+
+
+def extract_pdf(path):
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def extract_docx(path):
+    """Reads the text runs of `word/document.xml`, one line per paragraph."""
+    paragraphs = []
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as document:
+        runs = []
+        for _, element in ElementTree.iterparse(document):
+            if element.tag == f"{WORD_NAMESPACE}t" and element.text:
+                runs.append(element.text)
+            elif element.tag == f"{WORD_NAMESPACE}p":
+                paragraphs.append("".join(runs))
+                runs = []
+                element.clear()
+    return "\n".join(paragraphs)
+
+
+def extract_txt(path):
+    with open(path, "rb") as fh:
+        return fh.read().decode("utf-8", errors="replace")
+
+
+EXTRACTORS = {
+    ".pdf": extract_pdf,
+    ".docx": extract_docx,
+    ".txt": extract_txt,
+}
+
+
+def extract_text(path):
+    """
+    Returns the plain text of a PDF, DOCX or TXT resume, picked by file extension.
+    - Files with another extension are read as UTF-8 text.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    return EXTRACTORS.get(extension, extract_txt)(path)
+
+
+def extract_resume(path):
+    """
+    Worker entry point: **Returns** `(text, None)`, or `(None, error)` when the file cannot be
+    read, so one broken resume never fails the batch it was submitted with.
+    """
+    try:
+        return extract_text(path), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+def tokenize(text):
+    """Lowercased terms of a text (`c++`, `node.js` and `c#` are kept whole), without stop words."""
+    return [
+        term
+        for term in TOKEN_RE.findall(text.lower())
+        if len(term) <= MAX_TERM_LENGTH and term not in STOP_WORDS
+    ]
+
+
+def term_frequencies(text):
+    return Counter(tokenize(text))
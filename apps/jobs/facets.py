@@ -0,0 +1,83 @@
+import hashlib
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from apps.jobs.cache import get_cache_timeout, get_scope_version
+
+DEFAULT_SALARY_BUCKETS = (25000, 50000, 100000, 200000)
+# Parameters that page or order the results without changing the matching set.
+NON_FILTER_PARAMS = {"page", "page_size", "cursor", "pagination", "ordering", "facets"}
+
+
+def salary_buckets():
+    """Returns the `(min, max)` salary ranges of the facet, `max` exclusive and None for the last one."""
+    bounds = [0, *getattr(settings, "JOB_SALARY_FACET_BUCKETS", DEFAULT_SALARY_BUCKETS)]
+    return list(zip(bounds, bounds[1:] + [None]))
+
+
+def salary_bucket_expression(buckets):
+    return Case(
+        *(When(salary__lt=upper, then=Value(index)) for index, (_, upper) in enumerate(buckets[:-1])),
+        default=Value(len(buckets) - 1),
+        output_field=IntegerField(),
+    )
+
+
+def compute_facets(queryset):
+    """
+    Counts the jobs of `queryset` per location, salary bucket and company.
+    - One query groups by all three at once; the per-facet counts are summed from its rows.
+    """
+    buckets = salary_buckets()
+    rows = (
+        queryset.order_by()
+        .values("job_location", "company_id", "company__company_name")
+        .annotate(salary_bucket=salary_bucket_expression(buckets), count=Count("id"))
+    )
+    locations = defaultdict(int)
+    salaries = defaultdict(int)
+    companies = defaultdict(int)
+    company_names = {}
+    for row in rows:
+        locations[row["job_location"]] += row["count"]
+        salaries[row["salary_bucket"]] += row["count"]
+        companies[row["company_id"]] += row["count"]
+        company_names[row["company_id"]] = row["company__company_name"]
+
+    def by_count(counts):
+        return sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+
+    return {
+        "location": [{"value": location, "count": count} for location, count in by_count(locations)],
+        "salary": [
+            {"min": buckets[index][0], "max": buckets[index][1], "count": salaries[index]}
+            for index in range(len(buckets))
+            if salaries[index]
+        ],
+        "company": [
+            {"id": company_id, "name": company_names[company_id], "count": count}
+            for company_id, count in by_count(companies)
+        ],
+    }
+
+
+def facet_cache_key(request, scope):
+    """Facets depend on the filters and search only, so every page and ordering shares one entry."""
+    params = sorted((key, values) for key, values in request.query_params.lists() if key not in NON_FILTER_PARAMS)
+    digest = hashlib.sha1(f"{request.path}|{params}".encode("utf-8")).hexdigest()
+    return f"jobs:facets:{scope}:{get_scope_version(scope)}:{digest}"
+
+
+def get_facets(queryset, request, scope):
+    """Returns the facets of the filtered queryset, cached per scope version and filter signature."""
+    if scope is None:
+        return compute_facets(queryset)
+    key = facet_cache_key(request, scope)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, get_cache_timeout())
+    return facets
@@ -0,0 +1,78 @@
+import re
+
+import django_filters
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from apps.jobs.models import JobApplication, JobListing
+from apps.locations.gazetteer import resolve_location
+from apps.locations.geo import within_radius
+
+COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+class StableOrderingFilter(django_filters.OrderingFilter):
+    """`OrderingFilter` that breaks ties on the id, so pages of equal salaries never overlap."""
+
+    def filter(self, qs, value):
+        qs = super().filter(qs, value)
+        if value:
+            qs = qs.order_by(*qs.query.order_by, "-id")
+        return qs
+
+
+class JobListingFilter(django_filters.FilterSet):
+    """
+    Filters for /jobs/jobs/.
+    - `salary`, `job_location`, `is_active` and `company` match exactly.
+    - `salary_min`/`salary_max` and `created_after`/`created_before` are inclusive ranges.
+    - `ordering` accepts `salary`, `created_at` and their `-` descending forms.
+    - `near` (a place of the gazetteer, or `lat,lon`) keeps the jobs within `radius_km` of it
+      (`JOB_RADIUS_DEFAULT_KM`, at most `JOB_RADIUS_MAX_KM`), nearest first unless `ordering` is sent.
+    """
+
+    salary_min = django_filters.NumberFilter(field_name="salary", lookup_expr="gte")
+    salary_max = django_filters.NumberFilter(field_name="salary", lookup_expr="lte")
+    created_after = django_filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="gte")
+    created_before = django_filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="lte")
+    ordering = StableOrderingFilter(fields=("salary", "created_at"))
+    near = django_filters.CharFilter(method="filter_near")
+    # Read by `filter_near`.
+    radius_km = django_filters.NumberFilter(method="filter_radius_km")
+
+    class Meta:
+        model = JobListing
+        fields = ["salary", "job_location", "is_active", "company"]
+
+    def filter_near(self, queryset, name, value):
+        match = COORDINATES.match(value)
+        if match:
+            latitude, longitude = float(match[1]), float(match[2])
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ValidationError({"near": ["Coordinates out of range."]})
+        else:
+            place = resolve_location(value)
+            if place is None:
+                raise ValidationError({"near": ["Unknown location."]})
+            latitude, longitude = place.latitude, place.longitude
+
+        radius = self.form.cleaned_data.get("radius_km")
+        radius = float(radius) if radius is not None else getattr(settings, "JOB_RADIUS_DEFAULT_KM", 25)
+        max_radius = getattr(settings, "JOB_RADIUS_MAX_KM", 500)
+        if not 0 < radius <= max_radius:
+            raise ValidationError({"radius_km": [f"Must be more than 0 and at most {max_radius}."]})
+        queryset = within_radius(queryset, latitude, longitude, radius)
+        if not self.data.get("ordering"):
+            queryset = queryset.order_by("distance_km", "-id")
+        return queryset
+
+    def filter_radius_km(self, queryset, name, value):
+        return queryset
+
+
+class JobApplicationFilter(django_filters.FilterSet):
+    """Filters for /jobs/applications/: `status` matches exactly."""
+
+    class Meta:
+        model = JobApplication
+        fields = ["status"]
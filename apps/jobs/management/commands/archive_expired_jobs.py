@@ -0,0 +1,30 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.archive import archive_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves job listings expired for more than --grace-days, with their applications, into the archive "
+        "tables. Runs in batches of one transaction each; an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Listings archived per transaction.")
+        parser.add_argument(
+            "--grace-days", type=int, default=None, help="Days past expiry to wait (default JOB_ARCHIVE_GRACE_DAYS)."
+        )
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+
+    def handle(self, *args, **options):
+        batches = archive_expired(batch_size=options["batch_size"], grace_days=options["grace_days"])
+        total_listings = total_applications = 0
+        for listings, applications in islice(batches, options["max_batches"]):
+            total_listings += listings
+            total_applications += applications
+            self.stdout.write(f"archived listings={listings} applications={applications}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total_listings} listings and {total_applications} applications."
+        ))
@@ -0,0 +1,38 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.resume_search import index_pending_resumes
+
+
+class Command(BaseCommand):
+    help = "Extracts the text of new resumes in a process pool and adds it to the applicant search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Extraction processes; 0 extracts in this process.",
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new resumes instead of exiting.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when nothing is pending.")
+
+    def handle(self, *args, **options):
+        executor = ProcessPoolExecutor(max_workers=options["workers"]) if options["workers"] else None
+        try:
+            while True:
+                stats = index_pending_resumes(batch_size=options["batch_size"], executor=executor)
+                if any(stats.values()):
+                    self.stdout.write(f"indexed={stats['indexed']} failed={stats['failed']}")
+                if stats["indexed"] + stats["failed"] >= options["batch_size"]:
+                    continue
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        finally:
+            if executor is not None:
+                executor.shutdown()
@@ -0,0 +1,177 @@
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.company.models import Company
+from apps.jobs.cache import invalidate_company_jobs
+from apps.jobs.counters import reconcile_counts
+from apps.jobs.models import JobApplication, JobListing
+from apps.jobs.recommend import record_job_changes
+from apps.jobs.rollups import rebuild_daily_stats
+from apps.jobs.sample_data import LOCATIONS, make_rng, sentence
+from apps.jobs.search import get_search_backend
+from apps.user.models import User
+
+STATUS_WEIGHTS = {"pending": 70, "accepted": 10, "rejected": 20}
+
+
+def zipf_cum_weights(size, exponent):
+    """Cumulative weights of ranks 1..size under Zipf's law, for `random.choices`."""
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(size)))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a synthetic dataset with bulk_create: employers with one company each, candidates, "
+        "job listings and applications. A few companies post most listings and a few listings get most "
+        "applications (Zipf). Every user's password is --password."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employers", type=int, default=100)
+        parser.add_argument("--candidates", type=int, default=2000)
+        parser.add_argument("--listings", type=int, default=10000)
+        parser.add_argument("--applications", type=int, default=50000)
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of company and listing popularity.")
+        parser.add_argument("--days", type=int, default=365, help="Listings are spread over this many past days.")
+        parser.add_argument("--password", default="password123")
+        parser.add_argument("--prefix", default="gen", help="Prefix of the generated usernames and emails.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options["employers"] < 1 and options["listings"]:
+            raise CommandError("Listings need at least one employer.")
+        if options["applications"] > options["candidates"] * options["listings"]:
+            raise CommandError("More applications than (candidate, listing) pairs.")
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Users prefixed {prefix!r} already exist, pick another --prefix.")
+        self.rng = make_rng(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+
+        password = make_password(options["password"])
+        employers = self.create_users(prefix, "employer", options["employers"], password)
+        candidates = self.create_users(prefix, "candidate", options["candidates"], password)
+        companies = Company.objects.bulk_create(
+            (
+                Company(
+                    company_name=f"{prefix} company {number}",
+                    company_location=self.rng.choice(LOCATIONS),
+                    description=sentence(self.rng, 30),
+                    owner=owner,
+                )
+                for number, owner in enumerate(employers)
+            ),
+            batch_size=self.batch_size,
+        )
+        # bulk_create skips `save()`, which resolves the locations against the gazetteer.
+        for company in companies:
+            company.locate()
+        Company.objects.bulk_update(companies, ["location"], batch_size=self.batch_size)
+        jobs = self.create_listings(companies, options["listings"], options["skew"], options["days"])
+        applications = self.create_applications(jobs, candidates, options["applications"], options["skew"])
+        # bulk_create sends no signals, so the listings' applicant counters and daily rollups are computed once at the end.
+        reconcile_counts(batch_size=self.batch_size)
+        rebuild_daily_stats()
+        for company in companies:
+            invalidate_company_jobs(company.id)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(employers)} employers, {len(candidates)} candidates, {len(companies)} companies, "
+            f"{len(jobs)} listings and {applications} applications."
+        ))
+
+    def create_users(self, prefix, role, count, password):
+        return User.objects.bulk_create(
+            (
+                User(
+                    username=f"{prefix}-{role}-{number}",
+                    email=f"{prefix}-{role}-{number}@example.com",
+                    roles=role,
+                    password=password,
+                )
+                for number in range(count)
+            ),
+            batch_size=self.batch_size,
+        )
+
+    def create_listings(self, companies, count, skew, days):
+        # Company popularity ranks are shuffled, so the busiest employers are not the first created.
+        ranked = self.rng.sample(companies, len(companies))
+        cum_weights = zipf_cum_weights(len(ranked), skew)
+        backend = get_search_backend()
+        ttl = timedelta(days=getattr(settings, "JOB_LISTING_TTL_DAYS", 60))
+        jobs = []
+        for batch in batched(range(count), self.batch_size):
+            listings = [
+                JobListing(
+                    company=company,
+                    job_title=sentence(self.rng, 3),
+                    job_description=sentence(self.rng, 80),
+                    job_location=self.rng.choice(LOCATIONS),
+                    salary=self.rng.randrange(10000, 250000, 500),
+                    is_active=self.rng.random() < 0.9,
+                )
+                for company in self.rng.choices(ranked, cum_weights=cum_weights, k=len(batch))
+            ]
+            for job in listings:
+                job.locate()
+            with transaction.atomic():
+                created = JobListing.objects.bulk_create(listings)
+                # `auto_now_add` stamps bulk_create rows with the current time; spread them out afterwards.
+                for job in created:
+                    job.created_at = self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+                    job.expires_at = job.created_at + ttl
+                JobListing.objects.bulk_update(created, ["created_at", "expires_at"])
+                backend.index_jobs(created)
+            record_job_changes(job.id for job in created)
+            jobs.extend(created)
+        return jobs
+
+    def create_applications(self, jobs, candidates, count, skew):
+        ranked = self.rng.sample(jobs, len(jobs))
+        cum_weights = zipf_cum_weights(len(ranked), skew)
+        statuses = list(STATUS_WEIGHTS)
+        status_weights = list(STATUS_WEIGHTS.values())
+        pairs = set()
+        created = 0
+        while created < count:
+            applications = []
+            while len(applications) < min(self.batch_size, count - created):
+                job = self.rng.choices(ranked, cum_weights=cum_weights)[0]
+                candidate = self.rng.choice(candidates)
+                if (job.id, candidate.id) in pairs:
+                    continue
+                pairs.add((job.id, candidate.id))
+                applications.append(JobApplication(
+                    job=job,
+                    candidate=candidate,
+                    resume=f"resumes/generated/{candidate.id}.pdf",
+                    cover_letter=sentence(self.rng, 20),
+                    status=self.rng.choices(statuses, weights=status_weights)[0],
+                ))
+            with transaction.atomic():
+                applications = JobApplication.objects.bulk_create(applications)
+                for application in applications:
+                    age = (self.now - application.job.created_at).total_seconds()
+                    application.applied_at = self.now - timedelta(seconds=self.rng.uniform(0, age))
+                    if application.status != "pending":
+                        waited = (self.now - application.applied_at).total_seconds()
+                        application.decided_at = application.applied_at + timedelta(
+                            seconds=self.rng.uniform(0, min(waited, 30 * 86400))
+                        )
+                JobApplication.objects.bulk_update(applications, ["applied_at", "decided_at"])
+            created += len(applications)
+        return created
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.company.models import Company
+from apps.jobs.cache import invalidate_company_jobs
+from apps.jobs.models import JobListing
+from apps.locations.gazetteer import relocate
+
+
+class Command(BaseCommand):
+    help = (
+        "Resolves the locations of every company and job listing against the gazetteer again "
+        "(e.g. after load_gazetteer), saving the ones that changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows read and saved at a time.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        companies = relocate(Company.objects.all(), "company_location", touch=True, batch_size=batch_size)
+        jobs = relocate(
+            JobListing.objects.all(), "job_location", coordinates=True, touch=True, load=("company_id",), batch_size=batch_size
+        )
+        for company_id in {company.pk for company in companies} | {job.company_id for job in jobs}:
+            invalidate_company_jobs(company_id)
+        self.stdout.write(self.style.SUCCESS(f"Relocated {len(companies)} companies and {len(jobs)} listings."))
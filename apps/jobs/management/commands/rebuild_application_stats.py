@@ -0,0 +1,19 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the daily application rollups of the employer analytics from the applications, "
+        "for every day or from --since on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=date.fromisoformat, help="First day to recompute (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        rows = rebuild_daily_stats(since=options["since"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} daily rollup rows."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.models import JobListing
+from apps.jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the job search index from the JobListing and Company tables."
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {JobListing.objects.count()} job listings."))
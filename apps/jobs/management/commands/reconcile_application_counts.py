@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.counters import reconcile_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the applications of every job listing and fixes the per-status applicant counters "
+        "that drifted (e.g. after raw SQL or bulk writes that bypass signals)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Listings recounted per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Report the drifted listings without fixing them.")
+
+    def handle(self, *args, **options):
+        drifted = reconcile_counts(batch_size=options["batch_size"], dry_run=options["dry_run"])
+        for job_id, stored, actual in drifted:
+            self.stdout.write(f"Job {job_id}: stored {stored}, counted {actual}")
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} listings with drifted counters."))
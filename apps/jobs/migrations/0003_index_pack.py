@@ -0,0 +1,62 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """Keeps the earliest application of each (job, candidate) pair so the unique constraint can be added."""
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    duplicates = (
+        JobApplication.objects.values('job', 'candidate')
+        .annotate(keep=Min('id'), applications=Count('id'))
+        .filter(applications__gt=1)
+    )
+    for row in duplicates:
+        JobApplication.objects.filter(job=row['job'], candidate=row['candidate']).exclude(id=row['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_index_pack'),
+        ('jobs', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['candidate', '-applied_at', '-id'], name='application_candidate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['candidate', 'status'], name='application_cand_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', 'status'], name='application_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='job_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['company', '-created_at', '-id'], name='job_company_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job_location'], name='job_active_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['salary'], name='job_active_salary_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(fields=('job', 'candidate'), name='unique_job_application'),
+        ),
+    ]
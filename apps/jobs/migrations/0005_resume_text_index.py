@@ -0,0 +1,50 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_resume_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('tf', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resumeblob',
+            name='term_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resumeblob',
+            name='text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='resumeblob',
+            name='text_status',
+            field=models.CharField(choices=[('pending', 'pending'), ('done', 'done'), ('failed', 'failed')], default='pending', max_length=7),
+        ),
+        migrations.AddIndex(
+            model_name='resumeblob',
+            index=models.Index(condition=models.Q(('text_status', 'pending')), fields=['id'], name='resume_blob_pending_idx'),
+        ),
+        migrations.AddField(
+            model_name='resumeterm',
+            name='blob',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='jobs.resumeblob'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumeterm',
+            constraint=models.UniqueConstraint(fields=('term', 'blob'), name='unique_resume_term'),
+        ),
+    ]
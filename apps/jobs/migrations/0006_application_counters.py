@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:43
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_applications(apps, schema_editor):
+    """Fills the counters of the existing listings from one grouped count of their applications."""
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    JobListing = apps.get_model('jobs', 'JobListing')
+    rows = JobApplication.objects.values_list('job_id', 'status').annotate(count=Count('id')).order_by()
+    for job_id, status, count in rows:
+        JobListing.objects.filter(pk=job_id).update(**{f'{status}_count': count})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_resume_text_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='accepted_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def roll_up_applications(apps, schema_editor):
+    """
+    Counts the existing applications per listing and day. Their decision times were never recorded,
+    so their decisions are left out of the rollups.
+    """
+    ApplicationDailyStats = apps.get_model('jobs', 'ApplicationDailyStats')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    rows = JobApplication.objects.values_list('job_id', TruncDate('applied_at')).annotate(count=Count('id')).order_by()
+    ApplicationDailyStats.objects.bulk_create(
+        (ApplicationDailyStats(job_id=job_id, day=day, applications=count) for job_id, day, count in rows),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_application_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='decided_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ApplicationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('accepted', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('decision_seconds', models.FloatField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.joblisting')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'day'), name='unique_job_daily_stats')],
+            },
+        ),
+        migrations.RunPython(roll_up_applications, migrations.RunPython.noop),
+    ]
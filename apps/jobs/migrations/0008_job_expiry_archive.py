@@ -0,0 +1,87 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:50
+
+import apps.jobs.models
+import apps.jobs.storage
+import django.db.models.deletion
+from django.conf import settings
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def expire_after_ttl(apps, schema_editor):
+    """Existing listings expire `JOB_LISTING_TTL_DAYS` after their creation, like new ones."""
+    JobListing = apps.get_model('jobs', 'JobListing')
+    ttl = timedelta(days=getattr(settings, 'JOB_LISTING_TTL_DAYS', 60))
+    JobListing.objects.update(expires_at=F('created_at') + ttl)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_index_pack'),
+        ('jobs', '0007_application_daily_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJobApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('resume', models.FileField(storage=apps.jobs.storage.get_resume_storage, upload_to='')),
+                ('cover_letter', models.TextField(blank=True, null=True)),
+                ('applied_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('accepted', 'accepted'), ('rejected', 'rejected')], max_length=10)),
+                ('decided_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedJobListing',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('job_title', models.CharField(max_length=200)),
+                ('job_description', models.TextField()),
+                ('job_location', models.CharField(max_length=100)),
+                ('salary', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField()),
+                ('is_active', models.BooleanField()),
+                ('pending_count', models.PositiveIntegerField()),
+                ('accepted_count', models.PositiveIntegerField()),
+                ('rejected_count', models.PositiveIntegerField()),
+                ('expires_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='expires_at',
+            field=models.DateTimeField(default=apps.jobs.models.default_expiry),
+        ),
+        migrations.RunPython(expire_after_ttl, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['expires_at'], name='job_expires_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedjobapplication',
+            name='candidate',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedjobapplication',
+            name='resume_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='jobs.resumeblob'),
+        ),
+        migrations.AddField(
+            model_name='archivedjoblisting',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='company.company'),
+        ),
+        migrations.AddField(
+            model_name='archivedjobapplication',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='jobs.archivedjoblisting'),
+        ),
+    ]
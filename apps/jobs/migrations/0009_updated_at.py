@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:53
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+
+def date_existing_rows(apps, schema_editor):
+    """Dates existing rows by their last known change rather than the migration time."""
+    apps.get_model('jobs', 'JobListing').objects.update(updated_at=F('created_at'))
+    apps.get_model('jobs', 'JobApplication').objects.update(updated_at=Coalesce('decided_at', 'applied_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_expiry_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(date_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.locations.gazetteer import relocate
+
+
+def locate_existing_listings(apps, schema_editor):
+    for name in ('JobListing', 'ArchivedJobListing'):
+        relocate(apps.get_model('jobs', name).objects.all(), 'job_location', coordinates=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0005_location'),
+        ('jobs', '0009_updated_at'),
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedjoblisting',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedjoblisting',
+            name='location',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='archivedjoblisting',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='location',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['latitude', 'longitude'], name='job_lat_lon_idx'),
+        ),
+        migrations.RunPython(locate_existing_listings, migrations.RunPython.noop),
+    ]
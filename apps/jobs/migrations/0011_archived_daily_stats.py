@@ -0,0 +1,65 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:24
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+
+
+def roll_up_archived_applications(apps, schema_editor):
+    """Archiving used to delete the rollups of the listings it moved: counts them again from their archived applications."""
+    ApplicationDailyStats = apps.get_model('jobs', 'ApplicationDailyStats')
+    ArchivedJobApplication = apps.get_model('jobs', 'ArchivedJobApplication')
+    rows = defaultdict(Counter)
+    received = ArchivedJobApplication.objects.values_list('job_id', TruncDate('applied_at')).annotate(count=Count('id'))
+    for job_id, day, count in received.order_by():
+        rows[job_id, day]['applications'] = count
+    wait = ExpressionWrapper(F('decided_at') - F('applied_at'), output_field=DurationField())
+    decided = (
+        ArchivedJobApplication.objects.filter(status__in=('accepted', 'rejected'), decided_at__isnull=False)
+        .values_list('job_id', TruncDate('decided_at'), 'status')
+        .annotate(count=Count('id'), wait=Sum(wait))
+    )
+    for job_id, day, status, count, total_wait in decided.order_by():
+        rows[job_id, day][status] = count
+        rows[job_id, day]['decision_seconds'] += (total_wait or timedelta()).total_seconds()
+    ApplicationDailyStats.objects.bulk_create(
+        (ApplicationDailyStats(archived_job_id=job_id, day=day, **counts) for (job_id, day), counts in rows.items()),
+        batch_size=1000,
+    )
+
+
+def drop_archived_rollups(apps, schema_editor):
+    apps.get_model('jobs', 'ApplicationDailyStats').objects.filter(job__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationdailystats',
+            name='archived_job',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.archivedjoblisting'),
+        ),
+        migrations.AlterField(
+            model_name='applicationdailystats',
+            name='job',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.joblisting'),
+        ),
+        migrations.AddConstraint(
+            model_name='applicationdailystats',
+            constraint=models.UniqueConstraint(fields=('archived_job', 'day'), name='unique_archived_job_daily_stats'),
+        ),
+        migrations.AddConstraint(
+            model_name='applicationdailystats',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('archived_job__isnull', True), ('job__isnull', False)), models.Q(('archived_job__isnull', False), ('job__isnull', True)), _connector='OR'), name='daily_stats_one_job'),
+        ),
+        migrations.RunPython(roll_up_archived_applications, drop_archived_rollups),
+    ]
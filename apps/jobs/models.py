@@ -1,9 +1,27 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from apps.company.models import Company
+from apps.jobs.storage import get_resume_storage
+from apps.locations.gazetteer import resolve_location
+from apps.locations.models import Location
 from apps.user.models import User
 
 
+def default_expiry():
+    return timezone.now() + timedelta(days=getattr(settings, 'JOB_LISTING_TTL_DAYS', 60))
+
+
+class JobListingQuerySet(models.QuerySet):
+    def open(self):
+        """Listings candidates can see and apply to: active and not expired."""
+        return self.filter(is_active=True, expires_at__gt=timezone.now())
+
+
 class JobListing(models.Model):
     job_title = models.CharField(max_length=200)
     company = models.ForeignKey(Company, on_delete=models.CASCADE)
@@ -11,7 +29,128 @@ class JobListing(models.Model):
     job_location = models.CharField(max_length=100)
     salary = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also moved by `update()`s of the listing, for the conditional GETs of `apps.conditional`.
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Applications per status, kept up to date by `apps.jobs.counters`; `reconcile_application_counts` repairs drift.
+    pending_count = models.PositiveIntegerField(default=0)
+    accepted_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    # Candidates stop seeing the listing then; `archive_expired_jobs` later moves it to `ArchivedJobListing`.
+    expires_at = models.DateTimeField(default=default_expiry)
+    # `job_location` resolved against the gazetteer on save (`locate`), with the place's coordinates
+    # copied for radius queries (`apps.locations.geo`); `locate_listings` resolves them again.
+    location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+
+    objects = JobListingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Candidate list: active jobs, newest first (keyset order). Partial indexes only
+            # hold the active rows candidates can see.
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_active=True), name='job_active_created_idx'
+            ),
+            # Employer list: one company's jobs, newest first.
+            models.Index(fields=['company', '-created_at', '-id'], name='job_company_created_idx'),
+            # Candidate filters on location and salary.
+            models.Index(fields=['job_location'], condition=models.Q(is_active=True), name='job_active_location_idx'),
+            models.Index(fields=['salary'], condition=models.Q(is_active=True), name='job_active_salary_idx'),
+            # Archival: expired listings, oldest first.
+            models.Index(fields=['expires_at'], name='job_expires_idx'),
+            # Bounding box of radius queries.
+            models.Index(fields=['latitude', 'longitude'], name='job_lat_lon_idx'),
+        ]
+
+    COUNTER_FIELDS = ('pending_count', 'accepted_count', 'rejected_count')
+    LOCATION_FIELDS = ('location', 'latitude', 'longitude')
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'job_location' in update_fields:
+            self.locate()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.LOCATION_FIELDS}
+        # Saving a loaded listing must not write back counters that applications moved since it was read.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def locate(self):
+        """Resolves `job_location` against the gazetteer, setting `location` and its coordinates."""
+        place = resolve_location(self.job_location)
+        self.location_id = place and place.id
+        self.latitude = place and place.latitude
+        self.longitude = place and place.longitude
+
+
+class ResumeBlob(models.Model):
+    """One stored resume file, shared by every application and upload with the same content."""
+
+    TEXT_STATUS_CHOICES = [
+        ('pending', 'pending'),
+        ('done', 'done'),
+        ('failed', 'failed'),
+    ]
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    file = models.FileField(storage=get_resume_storage)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Plain text extracted by `manage.py extract_resume_text`, once per stored file.
+    text = models.TextField(blank=True, default='')
+    text_status = models.CharField(max_length=7, choices=TEXT_STATUS_CHOICES, default='pending')
+    term_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(text_status='pending'), name='resume_blob_pending_idx'),
+        ]
+
+
+class ResumeTerm(models.Model):
+    """Inverted index posting: how often `term` occurs in a resume's text."""
+
+    term = models.CharField(max_length=64)
+    blob = models.ForeignKey(ResumeBlob, on_delete=models.CASCADE, related_name='terms')
+    tf = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'blob'], name='unique_resume_term'),
+        ]
+
+
+class ResumeUpload(models.Model):
+    """
+    A resumable, chunked resume upload. Chunks are written at `offset` into a partial file,
+    which is moved into the content-addressed store once complete.
+    """
+
+    STATUS_CHOICES = [
+        ('in_progress', 'in_progress'),
+        ('complete', 'complete'),
+    ]
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=11, choices=STATUS_CHOICES, default='in_progress')
+    blob = models.ForeignKey(ResumeBlob, null=True, blank=True, on_delete=models.PROTECT)
+    deduplicated = models.BooleanField(default=False)
+    # Time spent receiving chunk bodies, for throughput; idle time between chunks is excluded.
+    receive_seconds = models.FloatField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def partial_name(self):
+        return f"partial/{self.id}.part"
 
 
 class JobApplication(models.Model):
@@ -22,7 +161,102 @@ class JobApplication(models.Model):
     ]
     job = models.ForeignKey(JobListing, on_delete=models.CASCADE)
     candidate = models.ForeignKey(User, on_delete=models.CASCADE)
-    resume = models.FileField()
+    resume = models.FileField(storage=get_resume_storage)
+    resume_blob = models.ForeignKey(ResumeBlob, null=True, blank=True, on_delete=models.PROTECT)
     cover_letter = models.TextField(blank=True, null=True)
     applied_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # When the application was last accepted or rejected, stamped by the signals on a status change.
+    decided_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'candidate'], name='unique_job_application'),
+        ]
+        indexes = [
+            # Candidate list: own applications, newest first, optionally filtered by status.
+            models.Index(fields=['candidate', '-applied_at', '-id'], name='application_candidate_idx'),
+            models.Index(fields=['candidate', 'status'], name='application_cand_status_idx'),
+            # Employer applicants list, by job and status.
+            models.Index(fields=['job', 'status'], name='application_job_status_idx'),
+        ]
+
+
+class ApplicationDailyStats(models.Model):
+    """
+    Applications a listing received and decided on one day, kept up to date by `apps.jobs.rollups`
+    so the employer analytics never scan the applications.
+    - Rows of a live listing have a `job`; `archive_expired_jobs` moves them to its `archived_job`.
+    """
+
+    job = models.ForeignKey(JobListing, on_delete=models.CASCADE, null=True, related_name='daily_stats')
+    archived_job = models.ForeignKey(
+        'ArchivedJobListing', on_delete=models.CASCADE, null=True, related_name='daily_stats'
+    )
+    day = models.DateField()
+    applications = models.PositiveIntegerField(default=0)
+    accepted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    # Time from application to decision summed over the day's decisions, for the average time-to-decision.
+    decision_seconds = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'day'], name='unique_job_daily_stats'),
+            models.UniqueConstraint(fields=['archived_job', 'day'], name='unique_archived_job_daily_stats'),
+            models.CheckConstraint(
+                condition=models.Q(job__isnull=False, archived_job__isnull=True)
+                | models.Q(job__isnull=True, archived_job__isnull=False),
+                name='daily_stats_one_job',
+            ),
+        ]
+
+
+class ArchivedJobListing(models.Model):
+    """
+    An expired job listing moved out of `JobListing` by `archive_expired_jobs`, under the same id.
+    Staff and the owning employer still read it through the job endpoints.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    job_title = models.CharField(max_length=200)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    job_description = models.TextField()
+    job_location = models.CharField(max_length=100)
+    salary = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField()
+    is_active = models.BooleanField()
+    pending_count = models.PositiveIntegerField()
+    accepted_count = models.PositiveIntegerField()
+    rejected_count = models.PositiveIntegerField()
+    expires_at = models.DateTimeField()
+    location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class ArchivedJobApplication(models.Model):
+    """An application of an `ArchivedJobListing`, moved out of `JobApplication` under the same id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJobListing, on_delete=models.CASCADE, related_name='applications')
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE)
+    resume = models.FileField(storage=get_resume_storage)
+    # Keeps the stored resume file alive.
+    resume_blob = models.ForeignKey(ResumeBlob, null=True, blank=True, on_delete=models.PROTECT)
+    cover_letter = models.TextField(blank=True, null=True)
+    applied_at = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=JobApplication.STATUS_CHOICES)
+    decided_at = models.DateTimeField(null=True, blank=True)
+
+
+class JobChange(models.Model):
+    """
+    A created, updated or deleted listing, logged for the recommender of every process to replay
+    (`apps.jobs.recommend`); the id orders the log. Not a foreign key: deleted listings are logged too.
+    """
+
+    job_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
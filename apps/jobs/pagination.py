@@ -0,0 +1,241 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a `(timestamp, id)` pair, newest first.
+    - The cursor holds the key of the last (or first) row served, so every page is an indexed range scan.
+    - No COUNT query is issued; rows inserted while a client pages never shift the following pages.
+    - `?page_size=` overrides `KEYSET_PAGE_SIZE`, capped by `KEYSET_MAX_PAGE_SIZE`.
+    """
+
+    timestamp_field = "created_at"
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, key, reverse = self.seek(queryset, request)
+        return self.set_page(list(queryset[: self.page_size + 1]), key, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset, key, reverse = self.seek(queryset, request)
+        return self.set_page([row async for row in queryset[: self.page_size + 1]], key, reverse)
+
+    def seek(self, queryset, request):
+        """Orders and filters `queryset` to the rows following the request's cursor."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        key, reverse = self.decode_cursor(request)
+
+        field = self.timestamp_field
+        if reverse:
+            queryset = queryset.order_by(field, "id")
+        else:
+            queryset = queryset.order_by(f"-{field}", "-id")
+        if key is not None:
+            timestamp, pk = key
+            if reverse:
+                queryset = queryset.filter(Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "id__gt": pk}))
+            else:
+                queryset = queryset.filter(Q(**{f"{field}__lt": timestamp}) | Q(**{field: timestamp, "id__lt": pk}))
+        return queryset, key, reverse
+
+    def set_page(self, results, key, reverse):
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        if reverse:
+            self.has_next = key is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = key is not None
+        return results
+
+    def get_page_size(self, request):
+        """`?page_size=` when it is a positive integer, capped by `KEYSET_MAX_PAGE_SIZE`; `KEYSET_PAGE_SIZE` otherwise."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            page_size = 0
+        if page_size <= 0:
+            return getattr(settings, "KEYSET_PAGE_SIZE", 20)
+        return min(page_size, getattr(settings, "KEYSET_MAX_PAGE_SIZE", 100))
+
+    def get_key(self, instance):
+        return getattr(instance, self.timestamp_field).isoformat(), instance.id
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_key(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_key(self.page[0]), reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            timestamp = parse_datetime(cursor["k"][0])
+            pk = int(cursor["k"][1])
+            reverse = bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError, IndexError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if timestamp is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (timestamp, pk), reverse
+
+    def encode_cursor(self, key, reverse):
+        cursor = {"k": list(key)}
+        if reverse:
+            cursor["r"] = 1
+        encoded = b64encode(json.dumps(cursor, separators=(",", ":")).encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetOrPageNumberPagination(PageNumberPagination):
+    """
+    Keeps the `?page=` API while offering keyset pagination.
+    - Keyset mode is used when the request carries `?cursor=`, asks for `?pagination=cursor`,
+      or when `DEFAULT_PAGINATION_MODE` is `"cursor"` and no `?page=` is given.
+    - Otherwise the regular page-number pagination (with its COUNT) is used, newest first unless
+      the view orders the rows.
+    """
+
+    keyset_class = KeysetPagination
+    mode_query_param = "pagination"
+
+    def use_keyset(self, request):
+        params = request.query_params
+        if self.keyset_class.cursor_query_param in params:
+            return True
+        mode = params.get(self.mode_query_param)
+        if mode:
+            return mode == "cursor"
+        if self.page_query_param in params:
+            return False
+        return getattr(settings, "DEFAULT_PAGINATION_MODE", "page") == "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        queryset = self.order(queryset)
+        # Counted already by the aggregate of a conditional GET (`apps.conditional`).
+        count = getattr(view, "condition_count", None)
+        if count is None:
+            return super().paginate_queryset(queryset, request, view)
+        return list(self.paginate_counted(queryset, request, count))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset` for async views, evaluating the page (and its COUNT) with the async ORM."""
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        queryset = self.order(queryset)
+        count = getattr(view, "condition_count", None)
+        if count is None:
+            count = await queryset.acount()
+        page = self.paginate_counted(queryset, request, count)
+        page.object_list = [row async for row in page.object_list]
+        return list(page)
+
+    def order(self, queryset):
+        """
+        Orders an unordered `queryset` newest first, as keyset mode does, so that its pages are
+        stable and never overlap.
+        """
+        if queryset.ordered:
+            return queryset
+        return queryset.order_by(f"-{self.keyset_class.timestamp_field}", "-id")
+
+    def paginate_counted(self, queryset, request, count):
+        """
+        Page-number pagination of `queryset` with its row count known ahead, so the paginator never
+        counts; the page's rows are only fetched once the page is iterated.
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = count
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
+
+
+class JobListingKeysetPagination(KeysetPagination):
+    timestamp_field = "created_at"
+
+
+class JobApplicationKeysetPagination(KeysetPagination):
+    timestamp_field = "applied_at"
+
+
+class JobListingPagination(KeysetOrPageNumberPagination):
+    keyset_class = JobListingKeysetPagination
+
+
+class JobApplicationPagination(KeysetOrPageNumberPagination):
+    keyset_class = JobApplicationKeysetPagination
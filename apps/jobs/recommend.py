@@ -0,0 +1,284 @@
+"""
+Job recommendations from a TF-IDF matrix of job titles and descriptions.
+
+Every process holds one `JobRecommender`: a SciPy CSR matrix with one row of term
+weights per listing. Listing writes are appended to a change log in the database, the
+`JobChange` table (see `record_job_changes`); before answering, a process replays the
+entries it has not seen, so only changed listings are re-tokenized.
+
+The first build loads every listing; `warm_up` runs it in the background when a server
+process starts (`JOB_RECOMMENDER_WARM_UP`), rather than in the first request.
+"""
+import math
+import threading
+from collections import Counter
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+from django.db.models import Max
+from django.utils import timezone
+from scipy import sparse
+
+from apps.jobs.extraction import tokenize
+from apps.jobs.models import JobApplication, JobChange, JobListing
+
+# Entries older than this are pruned by the builds; a process that has not synced since rebuilds.
+CHANGE_RETENTION = timedelta(days=1)
+# Past this many pending changes a full rebuild is cheaper than replaying them.
+MAX_REPLAYED_CHANGES = 5000
+# Title terms count this many times more than description terms.
+TITLE_WEIGHT = 2
+BUILD_CHUNK_SIZE = 2000
+# Row norms are recomputed with fresh IDF weights once the number of listings changes by this share.
+NORM_DRIFT = 0.05
+
+
+def record_job_changes(job_ids):
+    """Logs created, updated or deleted listings for every process's recommender to replay, with one INSERT."""
+    JobChange.objects.bulk_create(JobChange(job_id=job_id) for job_id in job_ids)
+
+
+def prune_job_changes(last):
+    """Deletes the log entries older than `CHANGE_RETENTION` before entry `last`, which is kept."""
+    JobChange.objects.filter(created_at__lt=timezone.now() - CHANGE_RETENTION, id__lt=last).delete()
+
+
+def job_terms(title, description):
+    counts = Counter(tokenize(description))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+class JobRecommender:
+    """
+    Sublinear term frequencies (`1 + log tf`) of every listing, active or not, so the
+    profile of a candidate can include jobs that have closed since they applied.
+    - IDF weights are applied at query time from the live document frequencies, so adding
+      or removing a listing only touches its own row.
+    - Replaced and deleted listings leave a dead row behind until the next rebuild.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sequence = None
+        self.synced_at = None
+        self.reset()
+
+    def reset(self):
+        self.vocabulary = {}
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        # CSR arrays with spare capacity; `matrix` is a view over their filled part.
+        self.data = np.zeros(0, dtype=np.float32)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.row_jobs = np.zeros(0, dtype=np.int64)
+        self.active = np.zeros(0, dtype=bool)
+        self.job_rows = {}
+        self.document_frequency = np.zeros(0, dtype=np.int64)
+        self.pending = []
+        self.dead_rows = 0
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.norm_idf = None
+        self.norm_size = 0
+
+    def __len__(self):
+        return len(self.job_rows)
+
+    # Building and updating
+
+    def build(self):
+        """Loads every listing; changes logged while it runs are replayed by the next `sync`."""
+        started_at = timezone.now()
+        sequence = JobChange.objects.aggregate(last=Max("id"))["last"] or 0
+        prune_job_changes(sequence)
+        self.reset()
+        listings = JobListing.objects.values_list("id", "job_title", "job_description", "is_active")
+        for job_id, title, description, is_active in listings.iterator(chunk_size=BUILD_CHUNK_SIZE):
+            self.add_row(job_id, title, description, is_active)
+        self.flush()
+        self.sequence = sequence
+        self.synced_at = started_at
+
+    def sync(self):
+        """
+        Catches up with the change log with one query, from the last entry it replayed on. Rebuilds
+        when that entry is gone (the log was reset), entries may have been pruned since the last
+        sync, or too many changes are pending.
+        """
+        now = timezone.now()
+        if self.sequence is None or now - self.synced_at > CHANGE_RETENTION:
+            self.build()
+            return
+        changes = list(
+            JobChange.objects.filter(id__gte=self.sequence).order_by("id")
+            .values_list("id", "job_id")[:MAX_REPLAYED_CHANGES + 2]
+        )
+        if self.sequence and (not changes or changes[0][0] != self.sequence):
+            self.build()
+            return
+        job_ids = {job_id for change_id, job_id in changes if change_id > self.sequence}
+        if len(job_ids) > MAX_REPLAYED_CHANGES:
+            self.build()
+            return
+        if job_ids:
+            self.apply_changes(job_ids)
+            self.sequence = changes[-1][0]
+        self.synced_at = now
+
+    def apply_changes(self, job_ids):
+        for job_id in job_ids:
+            self.remove_row(job_id)
+        listings = JobListing.objects.filter(id__in=job_ids).values_list(
+            "id", "job_title", "job_description", "is_active"
+        )
+        for job_id, title, description, is_active in listings:
+            self.add_row(job_id, title, description, is_active)
+        self.flush()
+        if self.dead_rows > max(1000, len(self) // 5):
+            self.build()
+
+    def add_row(self, job_id, title, description, is_active):
+        counts = job_terms(title, description)
+        columns = np.fromiter(
+            (self.vocabulary.setdefault(term, len(self.vocabulary)) for term in counts), dtype=np.int32, count=len(counts)
+        )
+        weights = np.fromiter((1 + math.log(tf) for tf in counts.values()), dtype=np.float32, count=len(counts))
+        self.job_rows[job_id] = len(self.row_jobs) + len(self.pending)
+        self.pending.append((job_id, is_active, columns, weights))
+
+    def remove_row(self, job_id):
+        row = self.job_rows.pop(job_id, None)
+        if row is None:
+            return
+        if row >= len(self.row_jobs):
+            # Still pending: write it out first so the bookkeeping stays positional.
+            self.flush()
+        self.active[row] = False
+        self.document_frequency[self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]]] -= 1
+        self.dead_rows += 1
+
+    def flush(self):
+        """Appends the pending rows to the CSR arrays, growing them geometrically."""
+        n_columns = len(self.vocabulary)
+        self.document_frequency = np.pad(self.document_frequency, (0, n_columns - len(self.document_frequency)))
+        n_rows, nnz = self.matrix.shape[0], self.matrix.nnz
+        if self.pending:
+            lengths = [len(columns) for _, _, columns, _ in self.pending]
+            indices = np.concatenate([columns for _, _, columns, _ in self.pending])
+            data = np.concatenate([weights for _, _, _, weights in self.pending])
+            self.data = self.reserve(self.data, nnz + len(data))
+            self.indices = self.reserve(self.indices, nnz + len(indices))
+            self.indptr = self.reserve(self.indptr, n_rows + len(lengths) + 1)
+            self.data[nnz:nnz + len(data)] = data
+            self.indices[nnz:nnz + len(indices)] = indices
+            np.cumsum(lengths, out=self.indptr[n_rows + 1:n_rows + len(lengths) + 1])
+            self.indptr[n_rows + 1:n_rows + len(lengths) + 1] += nnz
+            self.row_jobs = np.concatenate([self.row_jobs, [job_id for job_id, _, _, _ in self.pending]])
+            self.active = np.concatenate([self.active, [is_active for _, is_active, _, _ in self.pending]])
+            self.document_frequency += np.bincount(indices, minlength=n_columns)
+            n_rows, nnz = n_rows + len(lengths), nnz + len(data)
+            self.pending = []
+        self.matrix = sparse.csr_matrix(
+            (self.data[:nnz], self.indices[:nnz], self.indptr[:n_rows + 1]), shape=(n_rows, n_columns)
+        )
+
+    @staticmethod
+    def reserve(array, size):
+        if size <= len(array):
+            return array
+        grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    # Scoring
+
+    def idf(self):
+        return (np.log((1 + len(self)) / (1 + self.document_frequency)) + 1).astype(np.float32)
+
+    def row_norms(self, idf):
+        """
+        TF-IDF norms of every row. They are computed with the IDF of the last full pass and only
+        extended for appended rows, until the number of listings drifts by `NORM_DRIFT`.
+        """
+        if self.norm_idf is None or abs(len(self) - self.norm_size) > NORM_DRIFT * self.norm_size:
+            self.norm_idf, self.norm_size = idf, len(self)
+            self.norms = self.compute_norms(self.matrix, idf)
+        elif len(self.norms) < self.matrix.shape[0]:
+            n_columns = len(self.norm_idf)
+            tail = self.matrix[len(self.norms):, :n_columns]
+            self.norms = np.concatenate([self.norms, self.compute_norms(tail, self.norm_idf)])
+        return self.norms
+
+    @staticmethod
+    def compute_norms(matrix, idf):
+        # Squares the stored weights in a matrix sharing the index arrays, not a copy of the matrix.
+        squares = sparse.csr_matrix((matrix.data * matrix.data, matrix.indices, matrix.indptr), shape=matrix.shape)
+        norms = np.sqrt(squares @ (idf * idf)).astype(np.float32)
+        norms[norms == 0] = 1
+        return norms
+
+    def recommend(self, applied_job_ids, limit):
+        """
+        Scores every listing against the candidate's profile, the sum of the TF-IDF rows of the
+        jobs they applied to, with one sparse matrix-vector product.
+        - **Returns**: up to `limit` `(job_id, score)` of active jobs not applied to, best first.
+        """
+        rows = [self.job_rows[job_id] for job_id in applied_job_ids if job_id in self.job_rows]
+        if not rows:
+            return []
+        idf = self.idf()
+        norms = self.row_norms(idf)
+        profile_rows = self.matrix[rows].multiply(idf).multiply(1 / norms[rows][:, None])
+        profile = np.asarray(profile_rows.sum(axis=0)).ravel() * idf
+        scores = (self.matrix @ profile) / norms
+        scores[~self.active] = -np.inf
+        scores[rows] = -np.inf
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(self.row_jobs[row]), float(scores[row])) for row in candidates]
+
+
+_recommender = JobRecommender()
+
+
+def get_recommender():
+    return _recommender
+
+
+def warm_up():
+    """
+    Builds this process's recommender in a background thread, so no request pays for the first
+    build; requests arriving meanwhile wait for it, as they would have built it themselves.
+    """
+    if not getattr(settings, "JOB_RECOMMENDER_WARM_UP", True):
+        return
+
+    def build():
+        try:
+            recommender = get_recommender()
+            with recommender.lock:
+                recommender.sync()
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=build, name="recommender-warm-up", daemon=True).start()
+
+
+def recommend_jobs(candidate, limit=10):
+    """
+    Returns up to `limit` `(job_id, score)` recommendations for a candidate, from the jobs they
+    applied to; empty when they have no applications yet.
+    """
+    applied = list(JobApplication.objects.filter(candidate=candidate).values_list("job_id", flat=True))
+    if not applied:
+        return []
+    recommender = get_recommender()
+    with recommender.lock:
+        recommender.sync()
+        return recommender.recommend(applied, limit)
@@ -0,0 +1,95 @@
+import logging
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from apps.jobs.extraction import extract_resume, term_frequencies, tokenize
+from apps.jobs.models import ResumeBlob, ResumeTerm
+from apps.jobs.storage import resume_storage
+
+logger = logging.getLogger(__name__)
+
+# BM25 term frequency saturation and document length normalisation.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def index_blob(blob, text):
+    """Stores a resume's text and replaces its postings in the inverted index."""
+    frequencies = term_frequencies(text)
+    with transaction.atomic():
+        ResumeTerm.objects.filter(blob=blob).delete()
+        ResumeTerm.objects.bulk_create(
+            ResumeTerm(term=term, blob=blob, tf=tf) for term, tf in frequencies.items()
+        )
+        blob.text = text
+        blob.term_count = sum(frequencies.values())
+        blob.text_status = "done"
+        blob.save(update_fields=["text", "term_count", "text_status"])
+
+
+def index_pending_resumes(batch_size=50, executor=None):
+    """
+    Extracts and indexes up to `batch_size` resumes that have not been processed yet.
+    - Extraction runs through `executor.map` (e.g. a `ProcessPoolExecutor`), or in this process
+      without one; only the main process writes to the database.
+    - Every stored file is processed once, whatever the number of applications sharing it, and a
+      new application with an already indexed resume is searchable straight away.
+    - **Returns**: a dict with the number of `indexed` and `failed` resumes.
+    """
+    blobs = list(ResumeBlob.objects.filter(text_status="pending").order_by("id")[:batch_size])
+    stats = {"indexed": 0, "failed": 0}
+    if not blobs:
+        return stats
+    paths = [resume_storage.path(blob.file.name) for blob in blobs]
+    results = (executor.map if executor is not None else map)(extract_resume, paths)
+    for blob, (text, error) in zip(blobs, results):
+        if error is None:
+            index_blob(blob, text)
+            stats["indexed"] += 1
+        else:
+            logger.warning("Could not extract text from resume %s: %s", blob.file.name, error)
+            ResumeBlob.objects.filter(pk=blob.pk).update(text_status="failed")
+            stats["failed"] += 1
+    return stats
+
+
+def rank_applications(applications, query):
+    """
+    Ranks `applications` whose resume matches any term of `query`, with BM25 over the
+    applications' own resumes (document frequency and average length are taken per job).
+    - Resumes not indexed yet are left out.
+    - **Returns**: a list of `(application_id, score)`, best match first.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    corpus = applications.filter(resume_blob__text_status="done").aggregate(
+        count=Count("id"), average_length=Avg("resume_blob__term_count")
+    )
+    postings = applications.filter(resume_blob__terms__term__in=terms).values_list(
+        "id", "resume_blob__terms__term", "resume_blob__terms__tf", "resume_blob__term_count"
+    )
+    matches = defaultdict(list)
+    document_frequency = defaultdict(int)
+    for application_id, term, tf, length in postings:
+        matches[application_id].append((term, tf, length))
+        document_frequency[term] += 1
+
+    count = corpus["count"]
+    average_length = corpus["average_length"] or 1
+    idf = {
+        term: math.log(1 + (count - df + 0.5) / (df + 0.5))
+        for term, df in document_frequency.items()
+    }
+    scores = []
+    for application_id, hits in matches.items():
+        score = 0.0
+        for term, tf, length in hits:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            score += idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+        scores.append((application_id, score))
+    scores.sort(key=lambda item: (-item[1], item[0]))
+    return scores
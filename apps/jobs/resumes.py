@@ -0,0 +1,166 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.jobs.models import JobApplication, ResumeBlob, ResumeUpload
+from apps.jobs.storage import HASH_CHUNK_SIZE, hash_file, resume_storage
+from apps.metrics import RESUME_UPLOAD_BYTES, RESUME_UPLOAD_SECONDS
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadOffsetMismatch(UploadError):
+    """The chunk does not start where the upload stands; the client should resume from `upload.offset`."""
+
+
+class UploadTooLarge(UploadError):
+    pass
+
+
+class UploadIncomplete(UploadError):
+    pass
+
+
+def get_or_create_blob(digest, size, name):
+    return ResumeBlob.objects.get_or_create(sha256=digest, defaults={"size": size, "file": name})
+
+
+def store_resume(uploaded_file):
+    """
+    Stores a file uploaded in a single request, reusing the blob when the content is already stored.
+    - **Returns**: the `ResumeBlob`.
+    """
+    name = resume_storage.save(uploaded_file.name, uploaded_file)
+    blob, _ = get_or_create_blob(resume_storage.digest(name), uploaded_file.size, name)
+    return blob
+
+
+def write_chunk(upload, offset, stream):
+    """
+    Writes a request body at `offset` of the upload's partial file. The body is streamed in
+    fixed-size pieces to a file of its own, so the chunk is never held in memory, and is only
+    copied into the partial file once its offset is claimed.
+    - A chunk starting anywhere but at the current offset raises `UploadOffsetMismatch`; resending
+      a chunk after a lost response is therefore safe.
+    - Of two concurrent copies of a chunk, only the one claiming the offset first writes it; the
+      other raises `UploadOffsetMismatch`.
+    - Raises `UploadTooLarge` when the body goes past the declared size.
+    """
+    if upload.status != "in_progress":
+        raise UploadError("The upload is already complete.")
+    if offset != upload.offset:
+        raise UploadOffsetMismatch()
+
+    path = resume_storage.path(upload.partial_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    remaining = upload.size - offset
+    written = 0
+    start = time.perf_counter()
+    with tempfile.TemporaryFile(dir=os.path.dirname(path)) as chunk_file:
+        while stream is not None:
+            chunk = stream.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > remaining:
+                raise UploadTooLarge()
+            chunk_file.write(chunk)
+        elapsed = time.perf_counter() - start
+
+        with transaction.atomic():
+            # Conditional on the offset: the claim holds the row until the chunk is copied and the
+            # transaction commits, so a completion never sees the new offset before its bytes.
+            updated = ResumeUpload.objects.filter(pk=upload.pk, offset=offset, status="in_progress").update(
+                offset=F("offset") + written,
+                receive_seconds=F("receive_seconds") + elapsed,
+            )
+            if not updated:
+                upload.refresh_from_db(fields=["offset", "status"])
+                raise UploadOffsetMismatch()
+            chunk_file.seek(0)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as fh:
+                fh.seek(offset)
+                shutil.copyfileobj(chunk_file, fh, HASH_CHUNK_SIZE)
+    upload.offset = offset + written
+    upload.receive_seconds += elapsed
+    RESUME_UPLOAD_BYTES.inc(written)
+    RESUME_UPLOAD_SECONDS.inc(elapsed)
+    return upload
+
+
+def complete_upload(upload):
+    """
+    Hashes the finished partial file and moves it into the content-addressed store, or discards
+    it when a blob with the same content already exists.
+    - Idempotent: the completion is claimed with a conditional UPDATE, so of concurrent calls only
+      one stores the file, and the others return the upload it completed.
+    - Raises `UploadIncomplete` until every byte has been received.
+    """
+    if upload.status == "complete":
+        return upload
+    if upload.offset != upload.size:
+        raise UploadIncomplete()
+
+    completed_at = timezone.now()
+    with transaction.atomic():
+        # Held until the blob is saved: a concurrent call waits on the row, then finds it complete.
+        claimed = ResumeUpload.objects.filter(pk=upload.pk, status="in_progress", offset=F("size")).update(
+            status="complete", completed_at=completed_at
+        )
+        if not claimed:
+            upload.refresh_from_db()
+            if upload.status != "complete":
+                raise UploadIncomplete()
+            return upload
+        path = resume_storage.path(upload.partial_name)
+        digest, size = hash_file(path)
+        name = resume_storage.adopt(path, upload.filename, digest=digest)
+        blob, created = get_or_create_blob(digest, size, name)
+        upload.blob = blob
+        upload.deduplicated = not created
+        upload.save(update_fields=["blob", "deduplicated"])
+    upload.status = "complete"
+    upload.completed_at = completed_at
+    return upload
+
+
+def get_throughput(size, seconds):
+    return round(size / seconds) if seconds else None
+
+
+def get_resume_stats():
+    """
+    Reports how much disk the content-addressed store saves and how fast chunked uploads arrive.
+    - `referenced_bytes` is what one file per application would take, `stored_bytes` what is on disk.
+    """
+    blobs = ResumeBlob.objects.aggregate(count=Count("id"), stored_bytes=Coalesce(Sum("size"), 0))
+    applications = JobApplication.objects.filter(resume_blob__isnull=False).aggregate(
+        count=Count("id"), referenced_bytes=Coalesce(Sum("resume_blob__size"), 0)
+    )
+    uploads = ResumeUpload.objects.filter(status="complete").aggregate(
+        count=Count("id"),
+        deduplicated=Count("id", filter=Q(deduplicated=True)),
+        bytes=Coalesce(Sum("size"), 0),
+        seconds=Coalesce(Sum("receive_seconds"), 0.0),
+    )
+    return {
+        "blobs": blobs["count"],
+        "stored_bytes": blobs["stored_bytes"],
+        "applications": applications["count"],
+        "referenced_bytes": applications["referenced_bytes"],
+        "saved_bytes": max(applications["referenced_bytes"] - blobs["stored_bytes"], 0),
+        "uploads": {
+            "completed": uploads["count"],
+            "deduplicated": uploads["deduplicated"],
+            "bytes": uploads["bytes"],
+            "throughput_bytes_per_second": get_throughput(uploads["bytes"], uploads["seconds"]),
+        },
+    }
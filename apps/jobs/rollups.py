@@ -0,0 +1,149 @@
+"""
+Daily application rollups of job listings (`ApplicationDailyStats`): applications received per day,
+and accepted/rejected decisions with their time-to-decision per day of the decision.
+
+An application contributes one application to its `applied_at` day and, once decided, one decision to
+its `decided_at` day. Signals add the difference between an application's contribution before and
+after each write; bulk writes that bypass signals call `apply_daily_changes` themselves.
+`rebuild_daily_stats` recomputes the rows from the applications.
+
+The rows of an archived listing (`archived_job`) are frozen along with its applications, and still
+count in the analytics.
+"""
+import operator
+from collections import Counter, defaultdict
+from datetime import timedelta
+from functools import reduce
+
+from django.db import transaction
+from django.db.models import Case, Count, DurationField, ExpressionWrapper, F, Q, Sum, When
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from apps.jobs.models import ApplicationDailyStats, JobApplication
+
+DECISIONS = ("accepted", "rejected")
+STAT_FIELDS = ("applications", *DECISIONS, "decision_seconds")
+
+
+def add_contribution(changes, job_id, applied_at, status, decided_at, sign=1):
+    """Adds (or with `sign=-1` removes) what one application in `status` counts for to `changes`."""
+    changes[job_id, timezone.localdate(applied_at)]["applications"] += sign
+    if status in DECISIONS and decided_at is not None:
+        decided = changes[job_id, timezone.localdate(decided_at)]
+        decided[status] += sign
+        decided["decision_seconds"] += sign * (decided_at - applied_at).total_seconds()
+
+
+def apply_daily_changes(changes):
+    """
+    Adds `changes` (`{(job_id, day): {field: delta}}`) to the rollup rows with `F()` updates, in two
+    queries however many rows change: an INSERT of the rows that may not exist yet, then one UPDATE.
+    """
+    changes = {key: {field: delta for field, delta in deltas.items() if delta} for key, deltas in changes.items()}
+    changes = {key: deltas for key, deltas in changes.items() if deltas}
+    if not changes:
+        return
+    # Rows with only removals are not created: the row went with its listing, or the rollups were
+    # never built for it. Ignoring conflicts, the existing rows and those a concurrent writer created
+    # meanwhile are kept.
+    missing = [
+        ApplicationDailyStats(job_id=job_id, day=day)
+        for (job_id, day), deltas in changes.items()
+        if any(delta > 0 for delta in deltas.values())
+    ]
+    if missing:
+        ApplicationDailyStats.objects.bulk_create(missing, ignore_conflicts=True)
+    updates = {}
+    for field in STAT_FIELDS:
+        whens = [
+            When(job_id=job_id, day=day, then=F(field) + deltas[field])
+            for (job_id, day), deltas in changes.items()
+            if field in deltas
+        ]
+        if whens:
+            updates[field] = Case(*whens, default=F(field), output_field=ApplicationDailyStats._meta.get_field(field))
+    rows = reduce(operator.or_, (Q(job_id=job_id, day=day) for job_id, day in changes))
+    ApplicationDailyStats.objects.filter(rows).update(**updates)
+
+
+def rebuild_daily_stats(since=None):
+    """
+    Recomputes the rollup rows from the applications with two grouped queries, for every day from
+    `since` (a date) on, or for all days.
+    - **Returns**: the number of rows written.
+    """
+    applications = JobApplication.objects.all()
+    decisions = JobApplication.objects.filter(status__in=DECISIONS, decided_at__isnull=False)
+    stats = ApplicationDailyStats.objects.filter(job__isnull=False)
+    if since is not None:
+        applications = applications.filter(applied_at__date__gte=since)
+        decisions = decisions.filter(decided_at__date__gte=since)
+        stats = stats.filter(day__gte=since)
+
+    rows = defaultdict(Counter)
+    received = applications.values_list("job_id", TruncDate("applied_at")).annotate(count=Count("id"))
+    for job_id, day, count in received.order_by():
+        rows[job_id, day]["applications"] = count
+    wait = ExpressionWrapper(F("decided_at") - F("applied_at"), output_field=DurationField())
+    decided = decisions.values_list("job_id", TruncDate("decided_at"), "status").annotate(
+        count=Count("id"), wait=Sum(wait)
+    )
+    for job_id, day, status, count, total_wait in decided.order_by():
+        rows[job_id, day][status] = count
+        rows[job_id, day]["decision_seconds"] += (total_wait or timedelta()).total_seconds()
+
+    with transaction.atomic():
+        stats.delete()
+        ApplicationDailyStats.objects.bulk_create(
+            (ApplicationDailyStats(job_id=job_id, day=day, **counts) for (job_id, day), counts in rows.items()),
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+def summarize(applications, accepted, rejected, decision_seconds):
+    decisions = accepted + rejected
+    return {
+        "applications": applications,
+        "accepted": accepted,
+        "rejected": rejected,
+        "acceptance_rate": round(accepted / decisions, 4) if decisions else None,
+        "avg_decision_hours": round(decision_seconds / decisions / 3600, 2) if decisions else None,
+    }
+
+
+def get_employer_analytics(company_id, start, end, job_id=None):
+    """
+    Applications per day and listing, acceptance rate and average time-to-decision of a company's
+    listings, live or archived, between `start` and `end` (dates, inclusive), read from the rollups
+    in one query.
+    - **Returns**: the overall `totals`, and per listing its totals and `days` (days without activity are left out).
+    """
+    stats = ApplicationDailyStats.objects.filter(
+        Q(job__company_id=company_id) | Q(archived_job__company_id=company_id), day__range=(start, end)
+    ).annotate(
+        listing_id=Coalesce("job_id", "archived_job_id"),
+        listing_title=Coalesce("job__job_title", "archived_job__job_title"),
+    )
+    if job_id is not None:
+        stats = stats.filter(Q(job_id=job_id) | Q(archived_job_id=job_id))
+    rows = stats.order_by("listing_id", "day").values_list("listing_id", "listing_title", "day", *STAT_FIELDS)
+
+    jobs = {}
+    totals = Counter()
+    for job_id, job_title, day, *values in rows:
+        counts = dict(zip(STAT_FIELDS, values))
+        job = jobs.setdefault(job_id, {"job": job_id, "job_title": job_title, "totals": Counter(), "days": []})
+        job["totals"].update(counts)
+        totals.update(counts)
+        job["days"].append({"day": day, **{field: counts[field] for field in ("applications", *DECISIONS)}})
+    for job in jobs.values():
+        job_totals, days = job.pop("totals"), job.pop("days")
+        job.update(summarize(*(job_totals[field] for field in STAT_FIELDS)), days=days)
+    return {
+        "start": start,
+        "end": end,
+        "totals": summarize(*(totals[field] for field in STAT_FIELDS)),
+        "jobs": list(jobs.values()),
+    }
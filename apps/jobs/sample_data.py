@@ -0,0 +1,29 @@
+"""
+Synthetic text for the sample data of `generate_data` and the scripts in `benchmarks/`.
+
+Imports nothing from Django, so the benchmarks can use it before `django.setup()`.
+"""
+import random
+from itertools import accumulate
+
+WORDS = (
+    "python django react angular java spring oracle plsql golang rust devops "
+    "kubernetes docker aws azure data analyst engineer senior junior lead "
+    "backend frontend fullstack mobile android ios tester manager support "
+    "sales marketing finance accountant designer writer remote hybrid"
+).split()
+
+LOCATIONS = ["Kochi", "Trissur", "Kollam", "Bangalore", "Chennai", "Mumbai", "Pune", "Delhi"]
+
+# Synthetic Zipf vocabulary: a few hundred filler terms are common, the skill
+# words sit in the mid range and the long tail is rare, like real postings.
+VOCABULARY = [f"term{i}" for i in range(200)] + WORDS + [f"term{i}" for i in range(200, 20000)]
+ZIPF_CUM_WEIGHTS = list(accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def sentence(rng, length):
+    return " ".join(rng.choices(VOCABULARY, cum_weights=ZIPF_CUM_WEIGHTS, k=length))
+
+
+def make_rng(seed=42):
+    return random.Random(seed)
@@ -0,0 +1,176 @@
+import operator
+import re
+from functools import reduce
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+
+from apps.company.models import Company
+from apps.jobs.models import JobListing
+
+DEFAULT_SEARCH_BACKEND = "apps.jobs.search.SQLiteFTSBackend"
+
+SEARCH_FIELDS = [
+    "job_title",
+    "job_description",
+    "company__company_name",
+    "job_location",
+]
+
+_backends = {}
+
+
+class BaseSearchBackend:
+    """
+    Interface every job search backend implements.
+    - The index is keyed by `JobListing.id` and holds the title, description, company name and location.
+    - `search` receives an already role-scoped queryset and returns it filtered and ranked.
+    """
+
+    vendor = None
+
+    def setup(self):
+        """Creates the index structures if they do not exist yet."""
+
+    def index_jobs(self, jobs):
+        """Adds or replaces the index entries of the given job listings."""
+
+    def remove_jobs(self, job_ids):
+        """Drops the index entries of the given job listing ids."""
+
+    def reindex_company(self, company):
+        """Refreshes the company name stored for every listing of `company`."""
+
+    def rebuild(self):
+        """Rebuilds the whole index from the `JobListing` and `Company` tables."""
+
+    def search(self, queryset, terms):
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Unindexed fallback, equivalent to DRF's `SearchFilter`.
+    - Every term must match at least one field with `icontains`.
+    - No ranking, results keep the queryset ordering.
+    """
+
+    def search(self, queryset, terms):
+        conditions = (
+            reduce(operator.or_, (Q(**{f"{field}__icontains": term}) for field in SEARCH_FIELDS))
+            for term in terms
+        )
+        return queryset.filter(reduce(operator.and_, conditions))
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 virtual table whose rowid is the `JobListing` id.
+    - Every term is matched as a prefix (`"term"*`), all terms must match.
+    - Results are ordered by bm25, weighting title > company > location > description.
+    """
+
+    vendor = "sqlite"
+    table = "jobs_joblisting_fts"
+    weights = (10.0, 1.0, 5.0, 3.0)
+
+    def setup(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                "job_title, job_description, company_name, job_location, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+            )
+
+    def index_jobs(self, jobs):
+        rows = [
+            (job.id, job.job_title, job.job_description, job.company.company_name, job.job_location)
+            for job in jobs
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {self.table} "
+                "(rowid, job_title, job_description, company_name, job_location) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove_jobs(self, job_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(pk,) for pk in job_ids])
+
+    def reindex_company(self, company):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self.table} SET company_name = %s WHERE rowid IN "
+                f"(SELECT id FROM {JobListing._meta.db_table} WHERE company_id = %s)",
+                [company.company_name, company.id],
+            )
+
+    def rebuild(self):
+        self.setup()
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} "
+                "(rowid, job_title, job_description, company_name, job_location) "
+                "SELECT j.id, j.job_title, j.job_description, c.company_name, j.job_location "
+                f"FROM {JobListing._meta.db_table} j "
+                f"INNER JOIN {Company._meta.db_table} c ON c.id = j.company_id"
+            )
+
+    @staticmethod
+    def build_match(terms):
+        """
+        Turns user input into an FTS5 query; tokens are quoted so operators in the input are not interpreted.
+        """
+        tokens = [token for term in terms for token in re.findall(r"\w+", term)]
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def search(self, queryset, terms):
+        match = self.build_match(terms)
+        if not match:
+            return queryset.none()
+        weights = ", ".join(str(weight) for weight in self.weights)
+        return queryset.extra(
+            select={"search_rank": f"bm25({self.table}, {weights})"},
+            tables=[self.table],
+            where=[
+                f"{self.table}.rowid = {JobListing._meta.db_table}.id",
+                f"{self.table} MATCH %s",
+            ],
+            params=[match],
+            order_by=["search_rank"],
+        )
+
+
+def get_search_backend():
+    """
+    Returns the backend configured by `JOB_SEARCH_BACKEND`.
+    Backends bound to another database vendor fall back to `DatabaseSearchBackend`.
+    """
+    path = getattr(settings, "JOB_SEARCH_BACKEND", DEFAULT_SEARCH_BACKEND)
+    if path not in _backends:
+        backend = import_string(path)()
+        if backend.vendor and backend.vendor != connection.vendor:
+            backend = DatabaseSearchBackend()
+        _backends[path] = backend
+    return _backends[path]
+
+
+class JobSearchFilter(SearchFilter):
+    """
+    `SearchFilter` replacement that answers `?search=` from the configured search backend.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        return get_search_backend().search(queryset, search_terms)
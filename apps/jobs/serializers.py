@@ -1,19 +1,149 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 
 from apps.company.serializers import CompanyCreateSerializer
-from apps.jobs.models import JobListing, JobApplication
+from apps.jobs.models import ArchivedJobListing, JobListing, JobApplication, ResumeUpload
+from apps.jobs.resumes import get_throughput, store_resume
+from apps.locations.serializers import LocationField
+from apps.sparse_fields import SparseFieldsetSerializerMixin
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     company = CompanyCreateSerializer(read_only=True)
+    location = LocationField(source='location_id')
+    applicant_counts = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = JobListing
-        fields = '__all__'
+        exclude = JobListing.COUNTER_FIELDS
+        read_only_fields = ['expires_at']
+        field_columns = {'applicant_counts': JobListing.COUNTER_FIELDS, 'distance_km': ()}
+
+    def get_applicant_counts(self, job):
+        return {'pending': job.pending_count, 'accepted': job.accepted_count, 'rejected': job.rejected_count}
+
+    def get_distance_km(self, job):
+        distance = getattr(job, 'distance_km', None)
+        return None if distance is None else round(distance, 2)
+
+    def to_representation(self, instance):
+        """
+        The applicant counts are only shown to the employer who owns the job, and the distance
+        only by `?near=` searches.
+        """
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is None or user.is_staff or user.roles != 'employer':
+            data.pop('applicant_counts', None)
+        if data.get('distance_km', 0) is None:
+            data.pop('distance_km')
+        return data
+
+
+class ArchivedJobSerializer(JobSerializer):
+    """An archived listing, shaped like a live one plus its `archived_at`."""
+
+    class Meta:
+        model = ArchivedJobListing
+        exclude = JobListing.COUNTER_FIELDS
 
 
 class JobApplicationSerializer(serializers.ModelSerializer):
+    resume_upload = serializers.UUIDField(write_only=True, required=False)
+
     class Meta:
         model = JobApplication
-        fields = ['id', 'job', 'resume', 'cover_letter', 'applied_at', 'status']
+        fields = ['id', 'job', 'resume', 'resume_upload', 'cover_letter', 'applied_at', 'status']
         read_only_fields = ['applied_at', 'status']
+        extra_kwargs = {'resume': {'required': False}}
+
+    def validate(self, attrs):
+        """
+        Resolves the resume to a stored blob: either a completed chunked upload of the candidate
+        (`resume_upload`), or a file sent with the request, which is stored deduplicated.
+        """
+        upload_id = attrs.pop('resume_upload', None)
+        if upload_id is not None:
+            request = self.context.get('request')
+            upload = ResumeUpload.objects.select_related('blob').filter(
+                pk=upload_id, candidate=request.user, status='complete'
+            ).first()
+            if upload is None:
+                raise serializers.ValidationError({'resume_upload': ['No completed upload with this id.']})
+            blob = upload.blob
+        elif attrs.get('resume') is not None:
+            blob = store_resume(attrs['resume'])
+        elif self.instance is None:
+            raise serializers.ValidationError({'resume': ['Send a resume file or a completed resume_upload id.']})
+        else:
+            return attrs
+        attrs['resume'] = blob.file.name
+        attrs['resume_blob'] = blob
+        return attrs
+
+
+class ResumeUploadSerializer(serializers.ModelSerializer):
+    sha256 = serializers.CharField(source='blob.sha256', read_only=True, default=None)
+    throughput_bytes_per_second = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ResumeUpload
+        fields = [
+            'id', 'filename', 'size', 'offset', 'status', 'sha256', 'deduplicated',
+            'throughput_bytes_per_second', 'created_at', 'completed_at',
+        ]
+        read_only_fields = ['offset', 'status', 'deduplicated', 'created_at', 'completed_at']
+
+    def get_throughput_bytes_per_second(self, upload):
+        return get_throughput(upload.offset, upload.receive_seconds)
+
+    def validate_size(self, value):
+        max_size = getattr(settings, 'RESUME_MAX_UPLOAD_SIZE', 10 * 1024 * 1024)
+        if value < 1 or value > max_size:
+            raise serializers.ValidationError(f'Size must be between 1 and {max_size} bytes.')
+        return value
+
+
+class BulkStatusChangeSerializer(serializers.Serializer):
+    """Applications to move to `status`: listed by `ids`, or all of `job`'s, optionally only those in `current_status`."""
+
+    status = serializers.ChoiceField(choices=JobApplication.STATUS_CHOICES)
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    job = serializers.IntegerField(required=False)
+    current_status = serializers.ChoiceField(choices=JobApplication.STATUS_CHOICES, required=False)
+
+    def validate_ids(self, value):
+        max_ids = getattr(settings, 'BULK_STATUS_CHANGE_MAX_IDS', 1000)
+        if len(value) > max_ids:
+            raise serializers.ValidationError(f'At most {max_ids} applications per request.')
+        return list(dict.fromkeys(value))
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('job' in attrs):
+            raise serializers.ValidationError('Send either `ids` or `job`.')
+        if 'current_status' in attrs and 'job' not in attrs:
+            raise serializers.ValidationError({'current_status': ['Only applies with `job`.']})
+        return attrs
+
+
+class EmployerAnalyticsQuerySerializer(serializers.Serializer):
+    """Date range (inclusive, default the last 30 days) and optional listing of the employer analytics."""
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    job = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.localdate())
+        attrs.setdefault('start', attrs['end'] - timedelta(days=29))
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'start': ['Must not be after `end`.']})
+        max_days = getattr(settings, 'EMPLOYER_ANALYTICS_MAX_DAYS', 366)
+        if (attrs['end'] - attrs['start']).days >= max_days:
+            raise serializers.ValidationError(f'At most {max_days} days per request.')
+        return attrs
@@ -0,0 +1,115 @@
+from collections import Counter, defaultdict
+
+from django.db import connection
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.company.models import Company
+from apps.jobs.cache import invalidate_company_jobs
+from apps.jobs.counters import apply_count_changes, invalidate_company_counts
+from apps.jobs.models import JobApplication, JobListing
+from apps.jobs.recommend import record_job_changes
+from apps.jobs.rollups import DECISIONS, add_contribution, apply_daily_changes
+from apps.jobs.search import get_search_backend
+from apps.user.models import User
+
+
+@receiver(post_save, sender=JobListing)
+def index_job_listing(sender, instance, **kwargs):
+    get_search_backend().index_jobs([instance])
+    record_job_changes([instance.id])
+    invalidate_company_jobs(instance.company_id)
+
+
+@receiver(post_delete, sender=JobListing)
+def unindex_job_listing(sender, instance, **kwargs):
+    get_search_backend().remove_jobs([instance.id])
+    record_job_changes([instance.id])
+    invalidate_company_jobs(instance.company_id)
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_jobs(sender, instance, created, **kwargs):
+    if not created:
+        get_search_backend().reindex_company(instance)
+    invalidate_company_jobs(instance.id)
+
+
+@receiver(post_delete, sender=Company)
+def invalidate_deleted_company(sender, instance, **kwargs):
+    invalidate_company_jobs(instance.id)
+
+
+@receiver(pre_save, sender=JobApplication)
+def read_stored_status(sender, instance, update_fields=None, **kwargs):
+    """
+    Stashes the stored status and decision time for the counters and rollups, and stamps `decided_at`
+    when the status changes (saves limited by `update_fields` must include it to keep it).
+    """
+    instance._stored_status = instance._stored_decided_at = None
+    if instance._state.adding:
+        if instance.status in DECISIONS and instance.decided_at is None:
+            instance.decided_at = timezone.now()
+        return
+    if update_fields is not None and "status" not in update_fields:
+        return
+    stored = JobApplication.objects.filter(pk=instance.pk)
+    if connection.in_atomic_block:
+        # Holds the row until the save commits, so two concurrent changes can't both move the counters from it.
+        stored = stored.select_for_update()
+    instance._stored_status, instance._stored_decided_at = stored.values_list("status", "decided_at").first() or (
+        None, None
+    )
+    if instance._stored_status not in (None, instance.status):
+        instance.decided_at = timezone.now() if instance.status in DECISIONS else None
+
+
+@receiver(post_save, sender=JobApplication)
+def count_saved_application(sender, instance, created, **kwargs):
+    daily_changes = defaultdict(Counter)
+    if created:
+        changes = {instance.status: 1}
+    elif instance._stored_status not in (None, instance.status):
+        changes = {instance._stored_status: -1, instance.status: 1}
+        add_contribution(
+            daily_changes, instance.job_id, instance.applied_at, instance._stored_status, instance._stored_decided_at, -1
+        )
+    else:
+        return
+    add_contribution(daily_changes, instance.job_id, instance.applied_at, instance.status, instance.decided_at)
+    apply_count_changes({instance.job_id: changes})
+    apply_daily_changes(daily_changes)
+    invalidate_company_counts(instance.job.company_id)
+
+
+def deleted_with_listing(application, origin):
+    """
+    Whether a delete starting from `origin` (a model instance or a queryset) also deletes the
+    application's listing: it started from the listing, its company or the company's owner, rather
+    than from the candidate.
+    """
+    model = getattr(origin, "model", type(origin))
+    if model in (JobListing, Company):
+        return True
+    if model is User:
+        if isinstance(origin, User):
+            return origin.pk != application.candidate_id
+        return not origin.filter(pk=application.candidate_id).exists()
+    return False
+
+
+@receiver(post_delete, sender=JobApplication)
+def count_deleted_application(sender, instance, origin=None, **kwargs):
+    # Applications deleted along with their listing take its counters and rollups with them.
+    if deleted_with_listing(instance, origin):
+        return
+    daily_changes = defaultdict(Counter)
+    add_contribution(daily_changes, instance.job_id, instance.applied_at, instance.status, instance.decided_at, -1)
+    apply_count_changes({instance.job_id: {instance.status: -1}})
+    apply_daily_changes(daily_changes)
+    invalidate_company_counts(instance.job.company_id)
+
+
+def setup_search_index(sender, **kwargs):
+    get_search_backend().setup()
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+BLOB_NAME_RE = re.compile(r"^resumes/[0-9a-f]{2}/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(\.\w+)?$")
+
+
+def hash_file(path):
+    """Returns the `(sha256 hexdigest, size)` of a file, read in fixed-size chunks."""
+    sha = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            sha.update(chunk)
+            size += len(chunk)
+    return sha.hexdigest(), size
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its content
+    (`resumes/ab/cd/abcd...ef.pdf`), so identical uploads are written to disk once.
+    - `save()` streams the content to a temporary file while hashing it, then renames it into
+      place, or drops it when that content is already stored.
+    - Stored files can be shared by many applications, so `delete()` leaves them on disk.
+    """
+
+    def blob_name(self, digest, name):
+        extension = os.path.splitext(name)[1].lower()
+        if not re.fullmatch(r"\.\w{1,10}", extension):
+            extension = ""
+        return f"resumes/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def digest(self, name):
+        """Returns the content hash a stored name was derived from, or None."""
+        match = BLOB_NAME_RE.match(name)
+        return match.group("digest") if match else None
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from the content in `_save`, equal names mean equal files.
+        return name
+
+    def _save(self, name, content):
+        os.makedirs(self.location, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.location, prefix=".upload-")
+        sha = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    sha.update(chunk)
+                    fh.write(chunk)
+            return self.adopt(temp_path, name, digest=sha.hexdigest())
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def adopt(self, path, name, digest=None):
+        """
+        Moves the file at `path` into the store, without copying it when it is on the same file system.
+        - `name` only provides the extension; `digest` is computed when not given.
+        - **Returns**: the stored name.
+        """
+        if digest is None:
+            digest, _ = hash_file(path)
+        stored_name = self.blob_name(digest, name)
+        target = self.path(stored_name)
+        if os.path.exists(target):
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+            # A rename when both paths share a file system, a copy otherwise.
+            shutil.move(path, target)
+        return stored_name
+
+    def delete(self, name):
+        pass
+
+
+resume_storage = ContentAddressedStorage()
+
+
+def get_resume_storage():
+    return resume_storage
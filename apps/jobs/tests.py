@@ -1,9 +1,60 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.core.paginator import UnorderedObjectListWarning
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection
+from django.db.models import Count
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from apps.company.models import Company
-from apps.jobs.models import JobListing
+from apps.db_retry import retry_on_locked
+from apps.jobs.archive import archive_expired
+from apps.jobs.async_views import AsyncJobApplicationListView, AsyncJobDetailView, AsyncJobListView
+from apps.jobs.counters import reconcile_counts
+from apps.jobs.models import (
+    ApplicationDailyStats,
+    ArchivedJobApplication,
+    ArchivedJobListing,
+    JobListing,
+    JobApplication,
+    JobChange,
+    ResumeBlob,
+    ResumeTerm,
+    ResumeUpload,
+)
+from apps.jobs.recommend import JobRecommender, get_recommender
+from apps.jobs.rollups import rebuild_daily_stats
+from apps.jobs.resume_search import index_pending_resumes
+from apps.jobs.resumes import UploadOffsetMismatch, complete_upload, write_chunk
+from apps.jobs.storage import resume_storage
+from apps.jobs.views import EmployerJobApplicationViewSet, JobApplicationViewSet, JobViewSet, ResumeUploadViewSet
+from apps.notifications.models import OutboundEmail
+from apps.notifications.outbox import enqueue_mail
+from apps.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, QueryBudgetTestMixin
+from apps.user.authentication import issue_tokens
 from apps.user.models import User
 
 
@@ -137,3 +188,2071 @@ class JobViewSetDeleteTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class JobSearchTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.python_job = JobListing.objects.create(
+            company=self.company,
+            job_title="python developer",
+            job_description="django and postgres",
+            job_location="Kochi",
+            salary="60000"
+        )
+        self.oracle_job = JobListing.objects.create(
+            company=self.company,
+            job_title="oracle developer",
+            job_description="plsql, mentions python once",
+            job_location="Kollam",
+            salary="50000"
+        )
+        self.client.force_authenticate(user=self.candidate)
+        self.url = reverse('job-list')
+
+    def search(self, term):
+        response = self.client.get(self.url, {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in response.data['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(self.search('python'), [self.python_job.id, self.oracle_job.id])
+
+    def test_search_prefix_match(self):
+        self.assertEqual(self.search('orac'), [self.oracle_job.id])
+        self.assertEqual(self.search('dev kol'), [self.oracle_job.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.python_job.job_title = "rust developer"
+        self.python_job.save()
+        self.assertEqual(self.search('rust'), [self.python_job.id])
+
+        self.company.company_name = "Uber"
+        self.company.save()
+        self.assertEqual(len(self.search('uber')), 2)
+
+        self.oracle_job.delete()
+        self.assertEqual(self.search('developer'), [self.python_job.id])
+
+    def test_search_operators_are_not_interpreted(self):
+        self.assertEqual(self.search('"kochi ^*('), [self.python_job.id])
+
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.jobs = [self.create_job(i) for i in range(5)]
+        self.client.force_authenticate(user=self.candidate)
+        self.url = reverse('job-list')
+
+    def create_job(self, number):
+        return JobListing.objects.create(
+            company=self.company,
+            job_title=f"developer {number}",
+            job_description="kwdwkdlkdl",
+            job_location="Kochi",
+            salary="60000"
+        )
+
+    def test_cursor_pages_are_stable_under_inserts(self):
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+        seen = [job['id'] for job in response.data['results']]
+
+        self.create_job(99)
+        next_url = response.data['next']
+        while next_url:
+            response = self.client.get(next_url)
+            seen += [job['id'] for job in response.data['results']]
+            next_url = response.data['next']
+
+        self.assertEqual(seen, [job.id for job in reversed(self.jobs)])
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(back.data['previous'])
+
+    def test_cursor_mode_skips_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'pagination': 'cursor'})
+        # The conditional GET validators (COUNT and MAX(updated_at)) are one aggregate; the page itself is not counted.
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql'] and 'MAX(' not in query['sql']])
+
+    def test_page_number_mode_is_default(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 5)
+        # Newest first, as in cursor mode.
+        self.assertEqual([job['id'] for job in response.data['results']], [job.id for job in self.jobs[:1:-1]])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(KEYSET_PAGE_SIZE=2, KEYSET_MAX_PAGE_SIZE=4)
+    def test_page_size_param(self):
+        for page_size, expected in (('3', 3), ('10', 4), ('0', 2), ('-1', 2), ('many', 2)):
+            response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': page_size})
+            self.assertEqual(len(response.data['results']), expected, page_size)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class JobApplicationEmailTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company,
+            job_title="oracle developer",
+            job_description="kwdwkdlkdl",
+            job_location="Kollam",
+            salary="60000"
+        )
+
+    def apply(self):
+        self.client.force_authenticate(user=self.candidate)
+        resume = SimpleUploadedFile("resume.txt", b"python django")
+        return self.client.post(reverse('applications-list'), {'job': self.job.id, 'resume': resume})
+
+    def test_apply_queues_confirmation_email(self):
+        response = self.apply()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.recipients, ['testcandidate@example.com'])
+        self.assertEqual(email.from_email, 'testuser@example.com')
+
+    def test_duplicate_application_rejected_by_constraint(self):
+        self.assertEqual(self.apply().status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.apply()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'message': 'You have already applied to this job.'})
+        self.assertFalse([query for query in queries if 'EXISTS' in query['sql'].upper()])
+        self.assertEqual(JobApplication.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    def test_change_status_queues_email(self):
+        self.apply()
+        application = JobApplication.objects.get()
+        self.client.force_authenticate(user=self.employer)
+        url = reverse('employer-change-status', args=[application.id])
+        response = self.client.patch(url, {'status': 'accepted'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.filter(subject='Status Changed').count(), 1)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class DatabaseLockedRetryTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company,
+            job_title="oracle developer",
+            job_description="kwdwkdlkdl",
+            job_location="Kollam",
+            salary="60000"
+        )
+        sleep = mock.patch('apps.db_retry.time.sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def locked_enqueue_mail(self, failures):
+        """enqueue_mail failing `failures` times as if another connection held the write lock."""
+        calls = []
+
+        def enqueue(*args):
+            calls.append(args)
+            if len(calls) <= failures:
+                raise OperationalError("database is locked")
+            return enqueue_mail(*args)
+
+        return mock.patch('apps.jobs.views.enqueue_mail', side_effect=enqueue), calls
+
+    def test_apply_retries_while_locked(self):
+        patch, calls = self.locked_enqueue_mail(failures=2)
+        self.client.force_authenticate(user=self.candidate)
+        resume = SimpleUploadedFile("resume.txt", b"python django")
+        with patch:
+            response = self.client.post(reverse('applications-list'), {'job': self.job.id, 'resume': resume})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.sleep.call_count, 2)
+        # The attempts that failed were rolled back.
+        self.assertEqual(JobApplication.objects.get().id, response.data['id'])
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    @override_settings(DATABASE_LOCKED_RETRIES=2)
+    def test_change_status_gives_up_with_503(self):
+        application = JobApplication.objects.create(job=self.job, candidate=self.candidate, resume='resume.txt')
+        patch, calls = self.locked_enqueue_mail(failures=10)
+        self.client.force_authenticate(user=self.employer)
+        with patch:
+            response = self.client.patch(
+                reverse('employer-change-status', args=[application.id]), {'status': 'accepted'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data['detail'].code, 'database_busy')
+        self.assertEqual(len(calls), 3)
+        application.refresh_from_db()
+        self.assertEqual(application.status, 'pending')
+
+    def test_other_database_errors_are_not_retried(self):
+        func = mock.Mock(side_effect=OperationalError("no such table: jobs_joblisting"))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)
+        func.assert_called_once()
+
+
+class JobResponseCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.other_candidate = User.objects.create_user(
+            username='othercandidate',
+            password='testpassword123',
+            email='othercandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company,
+            job_title="oracle developer",
+            job_description="kwdwkdlkdl",
+            job_location="Kollam",
+            salary="60000"
+        )
+        self.url = reverse('job-list')
+
+    def test_candidates_share_cached_list(self):
+        self.client.force_authenticate(user=self.candidate)
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+
+        self.client.force_authenticate(user=self.other_candidate)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['results'][0]['job_title'], 'oracle developer')
+
+        self.assertEqual(self.client.get(self.url, {'search': 'oracle'})['X-Cache'], 'MISS')
+
+    def test_job_and_company_writes_invalidate(self):
+        self.client.force_authenticate(user=self.candidate)
+        detail_url = reverse('job-detail', args=[self.job.id])
+        self.client.get(detail_url)
+
+        self.job.job_title = "python developer"
+        self.job.save()
+        response = self.client.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['job_title'], 'python developer')
+
+        self.company.company_name = "Uber"
+        self.company.save()
+        response = self.client.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['company']['company_name'], 'Uber')
+
+    def test_employer_scope_is_separate(self):
+        self.job.is_active = False
+        self.job.save()
+        self.client.force_authenticate(user=self.candidate)
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 1)
+
+    def test_cache_stats_for_staff(self):
+        self.client.force_authenticate(user=self.candidate)
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        admin = User.objects.create_superuser(username='admin', password='adminpassword', email='admin@example.com')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(reverse('job-cache-stats'))
+        self.assertEqual(response.data, {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+        self.client.force_authenticate(user=self.candidate)
+        self.assertEqual(self.client.get(reverse('job-cache-stats')).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola", company_location="Trissur", description="Commpany", owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company, job_title="oracle developer", job_description="x", job_location="Kollam", salary="60000"
+        )
+        self.url = reverse('job-list')
+        self.detail_url = reverse('job-detail', args=[self.job.id])
+        self.client.force_authenticate(user=self.candidate)
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        cache.clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_cache_hit_revalidates_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_job_and_company_writes_change_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.job.job_title = "python developer"
+        self.job.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        self.company.company_name = "Uber"
+        self.company.save()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['company']['company_name'], 'Uber')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_job_changes_the_etag(self):
+        other = JobListing.objects.create(
+            company=self.company, job_title="java developer", job_description="x", job_location="Kochi", salary="1"
+        )
+        etag = self.client.get(self.url)['ETag']
+        other.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_if_modified_since_on_detail(self):
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        cache.clear()
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        JobListing.objects.filter(pk=self.job.pk).update(updated_at=timezone.now() + timedelta(seconds=5))
+        cache.clear()
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_job_is_not_found(self):
+        response = self.client.get(reverse('job-detail', args=[self.job.id + 1]), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SparseFieldsetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola", company_location="Trissur", description="Commpany", owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company, job_title="oracle developer", job_description="x" * 1000, job_location="Kollam", salary="60000"
+        )
+        self.url = reverse('job-list')
+        self.client.force_authenticate(user=self.employer)
+
+    def page_query(self, queries):
+        return [query['sql'] for query in queries if 'jobs_joblisting"."job_title' in query['sql']][0]
+
+    def test_fields_prune_response_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'job_title,salary,company.company_name'})
+        self.assertEqual(response.data['results'], [
+            {'company': {'company_name': 'Ola'}, 'job_title': 'oracle developer', 'salary': '60000.00'}
+        ])
+        sql = self.page_query(queries)
+        self.assertNotIn('job_description', sql)
+        self.assertNotIn('company_company"."description', sql)
+
+    def test_omit_skips_company_join(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'omit': 'job_description,company', 'pagination': 'cursor'})
+        result = response.data['results'][0]
+        self.assertNotIn('job_description', result)
+        self.assertNotIn('company', result)
+        self.assertEqual(result['applicant_counts'], {'pending': 0, 'accepted': 0, 'rejected': 0})
+        sql = self.page_query(queries)
+        self.assertNotIn('job_description', sql)
+        self.assertNotIn('JOIN', sql)
+
+    def test_detail_fields(self):
+        response = self.client.get(reverse('job-detail', args=[self.job.id]), {'fields': 'id,job_title'})
+        self.assertEqual(response.data, {'id': self.job.id, 'job_title': 'oracle developer'})
+
+    def test_invalid_fields(self):
+        response = self.client.get(self.url, {'fields': 'job_title,company.nope,salary.amount'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'fields': ['Unknown field: company.nope.']})
+        response = self.client.get(self.url, {'fields': 'salary.amount'})
+        self.assertEqual(response.data, {'fields': ['salary has no nested fields.']})
+        response = self.client.get(self.url, {'fields': 'job_title', 'omit': 'salary'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JobRadiusSearchTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola", company_location="Cochin", description="Commpany", owner=self.employer
+        )
+        self.jobs = {
+            location: JobListing.objects.create(
+                company=self.company, job_title="python developer", job_description="x", job_location=location, salary=salary
+            )
+            for location, salary in [
+                ("Ernakulam, Kerala", "20000"), ("Thrissur", "60000"), ("Kollam", "40000"), ("Bengaluru", "90000"), ("Anywhere", "1")
+            ]
+        }
+        self.url = reverse('job-list')
+        self.client.force_authenticate(user=self.candidate)
+
+    def test_locations_are_normalized(self):
+        job = self.jobs["Ernakulam, Kerala"]
+        self.assertEqual((job.location.name, job.latitude, job.longitude), ("Kochi", 9.9312, 76.2673))
+        self.assertIsNone(self.jobs["Anywhere"].location)
+        response = self.client.get(reverse('job-detail', args=[job.id]))
+        self.assertEqual(response.data['location'], {'id': job.location_id, 'name': 'Kochi', 'region': 'Kerala', 'country': 'IN'})
+        self.assertEqual(response.data['company']['location']['name'], 'Kochi')
+        self.assertNotIn('distance_km', response.data)
+
+        job.job_location = "Bombay"
+        job.save()
+        job.refresh_from_db()
+        self.assertEqual(job.location.name, "Mumbai")
+
+    def test_near_place_nearest_first(self):
+        response = self.client.get(self.url, {'near': 'Kochi', 'radius_km': 150})
+        results = response.data['results']
+        self.assertEqual([job['job_location'] for job in results], ["Ernakulam, Kerala", "Thrissur", "Kollam"])
+        self.assertEqual(results[0]['distance_km'], 0)
+        self.assertAlmostEqual(results[1]['distance_km'], 66.6, delta=0.5)
+
+        response = self.client.get(self.url, {'near': 'Kochi'})
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get(self.url, {'near': 'Kochi', 'radius_km': 150, 'ordering': '-salary'})
+        self.assertEqual([job['job_location'] for job in response.data['results']], ["Thrissur", "Kollam", "Ernakulam, Kerala"])
+
+    def test_near_coordinates(self):
+        response = self.client.get(self.url, {'near': '12.97,77.59', 'radius_km': 10, 'fields': 'job_location,distance_km'})
+        self.assertEqual(response.data['results'], [{'job_location': 'Bengaluru', 'distance_km': 0.53}])
+
+    def test_invalid_near(self):
+        response = self.client.get(self.url, {'near': 'Atlantis'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'near': ['Unknown location.']})
+        response = self.client.get(self.url, {'near': '95,10'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'near': 'Kochi', 'radius_km': 5000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('radius_km', response.data)
+
+    def test_locate_listings_command(self):
+        JobListing.objects.update(location=None, latitude=None, longitude=None)
+        out = io.StringIO()
+        call_command('locate_listings', stdout=out)
+        self.assertIn('Relocated 0 companies and 4 listings.', out.getvalue())
+        self.assertEqual(JobListing.objects.get(pk=self.jobs["Kollam"].pk).location.name, "Kollam")
+
+
+class JobQueryBudgetTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.jobs = [
+            JobListing.objects.create(
+                company=self.company,
+                job_title=f"developer {i}",
+                job_description="kwdwkdlkdl",
+                job_location="Kollam",
+                salary="60000"
+            )
+            for i in range(10)
+        ]
+        for job in self.jobs:
+            JobApplication.objects.create(job=job, candidate=self.candidate, resume='resume.txt')
+
+    def test_job_list_within_budget_for_every_role(self):
+        for user in (self.employer, self.candidate):
+            cache.clear()
+            self.client.force_authenticate(user=user)
+            with self.assertWithinQueryBudget(JobViewSet, 'list'):
+                response = self.client.get(reverse('job-list'), {'page_size': 10, 'pagination': 'cursor'})
+            self.assertEqual(len(response.data['results']), 10)
+
+    def test_employer_endpoints_within_budget(self):
+        self.client.force_authenticate(user=self.employer)
+        application = JobApplication.objects.first()
+        with self.assertWithinQueryBudget(EmployerJobApplicationViewSet, 'change_status'):
+            self.client.patch(
+                reverse('employer-change-status', args=[application.id]), {'status': 'rejected'}, format='json'
+            )
+        with self.assertWithinQueryBudget(EmployerJobApplicationViewSet, 'list_applications'):
+            self.client.get(reverse('employer-list-applications', args=[self.jobs[0].id]))
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_MODE='raise')
+    def test_middleware_raises_over_budget(self):
+        request = RequestFactory().get('/jobs/applications/')
+        view = JobApplicationViewSet.as_view({'get': 'list'})
+
+        def over_budget(request):
+            for _ in range(JobApplicationViewSet.query_budgets['list'] + 1):
+                User.objects.exists()
+            return HttpResponse()
+
+        middleware = QueryBudgetMiddleware(over_budget)
+        middleware.process_view(request, view, (), {})
+        with self.assertRaises(QueryBudgetExceeded):
+            middleware(request)
+
+
+class MetricsTest(APITestCase):
+    def setUp(self):
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.client.force_authenticate(user=self.candidate)
+
+    def test_server_timing_and_route_metrics(self):
+        response = self.client.get(reverse('job-list'))
+        self.assertRegex(response['Server-Timing'], r'app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"')
+
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('jobportal_http_requests_total{method="GET",route="job-list",status="200"}', body)
+        self.assertIn('jobportal_db_queries_per_request_count{route="job-list"}', body)
+        self.assertIn('jobportal_response_cache_misses_total', body)
+        self.assertNotIn('route="metrics"', body)
+
+    def test_multiprocess_mode_aggregates_workers(self):
+        directory = tempfile.mkdtemp()
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory}
+        worker = "from apps.metrics import REQUESTS; REQUESTS.labels('job-list', 'GET', '200').inc()"
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', worker], env=env, check=True, cwd=settings.BASE_DIR)
+
+        with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+            body = self.client.get('/metrics').content.decode()
+        self.assertIn('jobportal_http_requests_total{method="GET",route="job-list",status="200"} 2.0', body)
+
+
+class BulkStatusChangeTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.other_employer = User.objects.create_user(
+            username='otheremployer',
+            password='testpassword123',
+            email='otheremployer@example.com',
+            roles='employer'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola", company_location="Trissur", description="Commpany", owner=self.employer
+        )
+        other_company = Company.objects.create(
+            company_name="Uber", company_location="Kochi", description="Commpany", owner=self.other_employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company, job_title="oracle developer", job_description="x", job_location="Kollam", salary="1"
+        )
+        other_job = JobListing.objects.create(
+            company=other_company, job_title="java developer", job_description="x", job_location="Kochi", salary="1"
+        )
+        self.applications = []
+        for i in range(6):
+            candidate = User.objects.create_user(
+                username=f'candidate{i}', password='testpassword123', email=f'candidate{i}@example.com', roles='candidate'
+            )
+            self.applications.append(JobApplication.objects.create(
+                job=self.job, candidate=candidate, resume='resume.txt', status='accepted' if i == 5 else 'pending'
+            ))
+        self.other_application = JobApplication.objects.create(job=other_job, candidate=candidate, resume='resume.txt')
+        self.client.force_authenticate(user=self.employer)
+
+    def bulk_change(self, data):
+        return self.client.post(reverse('employer-bulk-change-status'), data, format='json')
+
+    def statuses(self):
+        return [application.status for application in JobApplication.objects.filter(job=self.job).order_by('id')]
+
+    def test_change_listed_applications_in_one_update(self):
+        ids = [application.id for application in self.applications[:3]]
+        with self.assertWithinQueryBudget(EmployerJobApplicationViewSet, 'bulk_change_status'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk_change({'status': 'rejected', 'ids': ids + ids[:1]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(self.statuses(), ['rejected'] * 3 + ['pending', 'pending', 'accepted'])
+        # The applications, then the job's applicant counters and today's rollup.
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 3)
+        emails = OutboundEmail.objects.order_by('id')
+        self.assertEqual([email.recipients for email in emails], [[f'candidate{i}@example.com'] for i in range(3)])
+        self.assertTrue(all(email.from_email == 'testuser@example.com' for email in emails))
+
+    def test_counters_and_rollups_of_many_jobs_and_days_in_constant_queries(self):
+        job = JobListing.objects.create(
+            company=self.company, job_title="java developer", job_description="x", job_location="Kochi", salary="1"
+        )
+        applications = self.applications[:4] + [
+            JobApplication.objects.create(job=job, candidate=application.candidate, resume='resume.txt')
+            for application in self.applications[:2]
+        ]
+        JobApplication.objects.filter(pk__in=[a.id for a in applications[::2]]).update(
+            applied_at=timezone.now() - timedelta(days=1)
+        )
+        rebuild_daily_stats()
+        with self.assertWithinQueryBudget(EmployerJobApplicationViewSet, 'bulk_change_status'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk_change({'status': 'accepted', 'ids': [a.id for a in applications]})
+        self.assertEqual(response.data['updated'], 6)
+        # The applications, then the applicant counters of both jobs and the rollups of every day at once.
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 3)
+        self.assertEqual(reconcile_counts(dry_run=True), [])
+        rollups = list(ApplicationDailyStats.objects.order_by('job_id', 'day').values_list(
+            'job_id', 'day', 'applications', 'accepted', 'rejected'
+        ))
+        rebuild_daily_stats()
+        self.assertEqual(list(ApplicationDailyStats.objects.order_by('job_id', 'day').values_list(
+            'job_id', 'day', 'applications', 'accepted', 'rejected'
+        )), rollups)
+
+    def test_change_pending_applications_of_a_job(self):
+        response = self.bulk_change({'status': 'rejected', 'job': self.job.id, 'current_status': 'pending'})
+        self.assertEqual(response.data['updated'], 5)
+        self.assertEqual(self.statuses(), ['rejected'] * 5 + ['accepted'])
+        self.assertEqual(OutboundEmail.objects.count(), 5)
+
+    def test_applications_already_in_status_are_not_notified(self):
+        response = self.bulk_change({'status': 'accepted', 'job': self.job.id})
+        self.assertEqual(response.data['updated'], 5)
+        self.assertEqual(OutboundEmail.objects.count(), 5)
+        response = self.bulk_change({'status': 'accepted', 'job': self.job.id})
+        self.assertEqual(response.data['updated'], 0)
+        self.assertEqual(OutboundEmail.objects.count(), 5)
+
+    def test_other_employers_applications_are_rejected(self):
+        ids = [self.applications[0].id, self.other_application.id]
+        response = self.bulk_change({'status': 'rejected', 'ids': ids})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.bulk_change({'status': 'rejected', 'job': self.other_application.job_id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(JobApplication.objects.filter(status='rejected').count(), 0)
+        self.assertEqual(OutboundEmail.objects.count(), 0)
+
+    def test_missing_applications_or_job(self):
+        response = self.bulk_change({'status': 'rejected', 'ids': [self.applications[0].id, 999999]})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.bulk_change({'status': 'rejected', 'job': 999999})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(JobApplication.objects.filter(status='rejected').count(), 0)
+
+    @override_settings(BULK_STATUS_CHANGE_MAX_IDS=2)
+    def test_invalid_requests(self):
+        for data in (
+            {'status': 'rejected'},
+            {'status': 'rejected', 'ids': [1], 'job': self.job.id},
+            {'status': 'hired', 'ids': [1]},
+            {'status': 'rejected', 'ids': [1], 'current_status': 'pending'},
+            {'status': 'rejected', 'ids': [1, 2, 3]},
+        ):
+            self.assertEqual(self.bulk_change(data).status_code, status.HTTP_400_BAD_REQUEST, data)
+
+
+class ApplicationCounterTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola", company_location="Trissur", description="Commpany", owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company, job_title="oracle developer", job_description="x", job_location="Kollam", salary="1"
+        )
+        self.candidates = [
+            User.objects.create_user(
+                username=f'candidate{i}', password='testpassword123', email=f'candidate{i}@example.com', roles='candidate'
+            )
+            for i in range(3)
+        ]
+
+    def apply(self, candidate, status='pending'):
+        return JobApplication.objects.create(job=self.job, candidate=candidate, resume='resume.txt', status=status)
+
+    def counts(self):
+        self.job.refresh_from_db()
+        return self.job.pending_count, self.job.accepted_count, self.job.rejected_count
+
+    def test_counters_follow_applications(self):
+        first = self.apply(self.candidates[0])
+        second = self.apply(self.candidates[1], status='accepted')
+        self.assertEqual(self.counts(), (1, 1, 0))
+        first.status = 'rejected'
+        first.save()
+        # Saving without a status change, or without the status field, leaves the counters alone.
+        first.save()
+        second.cover_letter = 'updated'
+        second.save(update_fields=['cover_letter'])
+        self.assertEqual(self.counts(), (0, 1, 1))
+        second.delete()
+        self.assertEqual(self.counts(), (0, 0, 1))
+
+    def test_saving_a_stale_listing_keeps_the_counters(self):
+        stale = JobListing.objects.get(pk=self.job.pk)
+        self.apply(self.candidates[0])
+        stale.job_title = 'senior oracle developer'
+        stale.save()
+        self.assertEqual(self.counts(), (1, 0, 0))
+        self.assertEqual(self.job.job_title, 'senior oracle developer')
+
+    def test_only_the_owning_employer_sees_the_counts(self):
+        url = reverse('job-detail', args=[self.job.id])
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(url)
+        self.assertEqual(response.data['applicant_counts'], {'pending': 0, 'accepted': 0, 'rejected': 0})
+        application = self.apply(self.candidates[0])
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['applicant_counts'], {'pending': 1, 'accepted': 0, 'rejected': 0})
+        self.client.patch(reverse('employer-change-status', args=[application.id]), {'status': 'accepted'}, format='json')
+        self.assertEqual(self.client.get(url).data['applicant_counts'], {'pending': 0, 'accepted': 1, 'rejected': 0})
+        self.client.force_authenticate(user=self.candidates[0])
+        response = self.client.get(url)
+        self.assertNotIn('applicant_counts', response.data)
+        self.assertNotIn('pending_count', response.data)
+
+    def test_bulk_change_moves_the_counters(self):
+        for candidate in self.candidates:
+            self.apply(candidate)
+        self.client.force_authenticate(user=self.employer)
+        self.client.post(
+            reverse('employer-bulk-change-status'), {'status': 'rejected', 'job': self.job.id}, format='json'
+        )
+        self.assertEqual(self.counts(), (0, 0, 3))
+
+    def test_reconcile_fixes_drifted_counters(self):
+        for candidate in self.candidates:
+            self.apply(candidate)
+        JobListing.objects.filter(pk=self.job.pk).update(pending_count=7, accepted_count=1)
+        out = io.StringIO()
+        call_command('reconcile_application_counts', '--dry-run', stdout=out)
+        self.assertIn('Found 1 listings', out.getvalue())
+        self.assertEqual(self.counts(), (7, 1, 0))
+        call_command('reconcile_application_counts', stdout=io.StringIO())
+        self.assertEqual(self.counts(), (3, 0, 0))
+
+
+class EmployerAnalyticsTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola", company_location="Trissur", description="Commpany", owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company, job_title="oracle developer", job_description="x", job_location="Kollam", salary="1"
+        )
+        self.candidates = [
+            User.objects.create_user(
+                username=f'candidate{i}', password='testpassword123', email=f'candidate{i}@example.com', roles='candidate'
+            )
+            for i in range(4)
+        ]
+        self.url = reverse('employer-analytics')
+        self.client.force_authenticate(user=self.employer)
+
+    def apply(self, candidate):
+        return JobApplication.objects.create(job=self.job, candidate=candidate, resume='resume.txt')
+
+    def rollups(self):
+        return list(ApplicationDailyStats.objects.order_by('job', 'day').values(
+            'job', 'day', 'applications', 'accepted', 'rejected', 'decision_seconds'
+        ))
+
+    def test_rollups_follow_applications(self):
+        applications = [self.apply(candidate) for candidate in self.candidates]
+        accepted = applications[0]
+        accepted.status = 'accepted'
+        accepted.save()
+        self.assertIsNotNone(accepted.decided_at)
+        applications[1].status = 'rejected'
+        applications[1].save()
+        applications[1].status = 'pending'
+        applications[1].save()
+        self.assertIsNone(applications[1].decided_at)
+        applications[3].delete()
+        [row] = self.rollups()
+        self.assertEqual((row['applications'], row['accepted'], row['rejected']), (3, 1, 0))
+
+    def test_rebuild_matches_the_incremental_rollups(self):
+        applications = [self.apply(candidate) for candidate in self.candidates]
+        # Spread the applications and decisions over three days.
+        now = timezone.now()
+        for days, application in enumerate(applications):
+            JobApplication.objects.filter(pk=application.pk).update(applied_at=now - timedelta(days=days))
+        call_command('rebuild_application_stats', stdout=io.StringIO())
+        applications[2].refresh_from_db()
+        applications[2].status = 'accepted'
+        applications[2].save()
+        self.client.post(
+            reverse('employer-bulk-change-status'),
+            {'status': 'rejected', 'ids': [applications[1].id, applications[3].id]},
+            format='json',
+        )
+        incremental = self.rollups()
+        call_command('rebuild_application_stats', stdout=io.StringIO())
+        rebuilt = self.rollups()
+        self.assertEqual(len(incremental), 4)
+        for before, after in zip(incremental, rebuilt):
+            self.assertAlmostEqual(before.pop('decision_seconds'), after.pop('decision_seconds'), places=3)
+            self.assertEqual(before, after)
+
+    def test_analytics_read_the_rollups_only(self):
+        for candidate in self.candidates:
+            self.apply(candidate)
+        self.client.post(
+            reverse('employer-bulk-change-status'), {'status': 'accepted', 'job': self.job.id}, format='json'
+        )
+        yesterday = timezone.localdate() - timedelta(days=1)
+        ApplicationDailyStats.objects.create(job=self.job, day=yesterday, applications=2, rejected=1, decision_seconds=7200)
+        ApplicationDailyStats.objects.create(job=self.job, day=yesterday - timedelta(days=60), applications=50)
+        with self.assertWithinQueryBudget(EmployerJobApplicationViewSet, 'analytics'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['totals']['applications'], 6)
+        self.assertEqual(response.data['totals']['accepted'], 4)
+        self.assertEqual(response.data['totals']['acceptance_rate'], 0.8)
+        [job] = response.data['jobs']
+        self.assertEqual([day['day'] for day in job['days']], [yesterday, timezone.localdate()])
+        self.assertEqual(job['days'][0]['rejected'], 1)
+
+        response = self.client.get(self.url, {'start': yesterday, 'end': yesterday})
+        self.assertEqual(response.data['totals']['avg_decision_hours'], 2.0)
+        other = JobListing.objects.create(
+            company=self.company, job_title="java developer", job_description="x", job_location="Kochi", salary="1"
+        )
+        self.assertEqual(self.client.get(self.url, {'job': other.id}).data['jobs'], [])
+
+    def test_deleting_a_candidate_company_or_owner_with_applications(self):
+        applications = [self.apply(candidate) for candidate in self.candidates]
+        applications[0].status = 'accepted'
+        applications[0].save()
+        self.candidates[1].delete()
+        [row] = self.rollups()
+        self.assertEqual(row['applications'], 3)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.pending_count, 2)
+
+        response = self.client.delete(reverse('company-detail', args=[self.company.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(JobApplication.objects.exists())
+        self.assertEqual(self.rollups(), [])
+
+        company = Company.objects.create(company_name="Uber", company_location="Kochi", description="x", owner=self.employer)
+        self.job = JobListing.objects.create(
+            company=company, job_title="go developer", job_description="x", job_location="Kochi", salary="1"
+        )
+        self.apply(self.candidates[0])
+        self.employer.delete()
+        self.assertFalse(ApplicationDailyStats.objects.exists())
+
+    def test_analytics_are_unchanged_after_archiving(self):
+        applications = [self.apply(candidate) for candidate in self.candidates]
+        applications[0].status = 'accepted'
+        applications[0].save()
+        before = self.client.get(self.url).data
+        JobListing.objects.filter(pk=self.job.pk).update(expires_at=timezone.now() - timedelta(days=400))
+        call_command('archive_expired_jobs', stdout=io.StringIO())
+        self.assertFalse(JobListing.objects.exists())
+        # Rebuilding from the live applications leaves the archived rollups alone.
+        call_command('rebuild_application_stats', stdout=io.StringIO())
+        with self.assertWithinQueryBudget(EmployerJobApplicationViewSet, 'analytics'):
+            after = self.client.get(self.url).data
+        self.assertEqual(after, before)
+        self.assertEqual(after['jobs'][0]['job_title'], 'oracle developer')
+        self.assertEqual(self.client.get(self.url, {'job': self.job.id}).data['totals'], before['totals'])
+
+    def test_invalid_range(self):
+        response = self.client.get(self.url, {'start': '2024-02-01', 'end': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'start': '2020-01-01', 'end': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(JOB_ARCHIVE_GRACE_DAYS=30)
+class JobExpiryArchiveTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.other_employer = User.objects.create_user(
+            username='otheruser',
+            password='testpassword123',
+            email='otheruser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.staff = User.objects.create_user(
+            username='staff', password='testpassword123', email='staff@example.com', roles='employer', is_staff=True
+        )
+        self.company = Company.objects.create(
+            company_name="Ola", company_location="Trissur", description="Commpany", owner=self.employer
+        )
+        Company.objects.create(company_name="Uber", company_location="Kochi", description="Commpany", owner=self.other_employer)
+        self.live, self.expired, *self.stale = [
+            JobListing.objects.create(
+                company=self.company, job_title=f"python developer {i}", job_description="x", job_location="Kochi", salary="1"
+            )
+            for i in range(4)
+        ]
+        now = timezone.now()
+        JobListing.objects.filter(pk=self.expired.pk).update(expires_at=now - timedelta(days=1))
+        JobListing.objects.filter(pk__in=[job.pk for job in self.stale]).update(expires_at=now - timedelta(days=31))
+        self.application = JobApplication.objects.create(
+            job=self.stale[0], candidate=self.candidate, resume='resume.txt', status='accepted'
+        )
+
+    def archive(self, *args):
+        out = io.StringIO()
+        call_command('archive_expired_jobs', *args, stdout=out)
+        return out.getvalue()
+
+    def test_new_listings_expire_after_the_ttl(self):
+        with override_settings(JOB_LISTING_TTL_DAYS=10):
+            job = JobListing.objects.create(
+                company=self.company, job_title="new", job_description="x", job_location="Kochi", salary="1"
+            )
+        self.assertAlmostEqual((job.expires_at - timezone.now()).total_seconds(), 10 * 86400, delta=60)
+
+    def test_candidates_do_not_see_or_apply_to_expired_listings(self):
+        self.client.force_authenticate(user=self.candidate)
+        response = self.client.get(reverse('job-list'))
+        self.assertEqual([job['id'] for job in response.data['results']], [self.live.id])
+        response = self.client.get(reverse('job-detail', args=[self.expired.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.post(reverse('applications-list'), {'job': self.expired.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.employer)
+        self.assertEqual(self.client.get(reverse('job-list')).data['count'], 4)
+
+    def test_archive_moves_listings_past_the_grace_period_in_resumable_batches(self):
+        output = self.archive('--batch-size', '1', '--max-batches', '1')
+        self.assertIn('Archived 1 listings and 1 applications', output)
+        self.assertEqual(ArchivedJobListing.objects.count(), 1)
+        output = self.archive('--batch-size', '1')
+        self.assertIn('Archived 1 listings and 0 applications', output)
+        self.assertIn('Archived 0 listings', self.archive())
+        self.assertEqual(
+            set(JobListing.objects.values_list('id', flat=True)), {self.live.id, self.expired.id}
+        )
+        self.assertFalse(JobApplication.objects.exists())
+        archived = ArchivedJobApplication.objects.get()
+        self.assertEqual((archived.id, archived.job_id, archived.status), (self.application.id, self.stale[0].id, 'accepted'))
+        self.assertEqual(ArchivedJobListing.objects.get(pk=self.stale[0].pk).accepted_count, 1)
+
+    def test_staff_and_owner_read_archived_listings_through_the_job_endpoints(self):
+        self.archive()
+        url = reverse('job-detail', args=[self.stale[0].id])
+        for user in (self.employer, self.staff):
+            self.client.force_authenticate(user=user)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['job_title'], 'python developer 2')
+            self.assertIn('archived_at', response.data)
+        self.assertEqual(response.data['company']['company_name'], 'Ola')
+        self.client.force_authenticate(user=self.employer)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            response = self.client.get(reverse('employer-list-applications', args=[self.stale[0].id]))
+        self.assertEqual([application['id'] for application in response.data['results']], [self.application.id])
+        for user in (self.other_employer, self.candidate):
+            self.client.force_authenticate(user=user)
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_staff_and_owner_list_archived_listings(self):
+        self.archive()
+        archived_ids = [job.id for job in reversed(self.stale)]
+        for user in (self.employer, self.staff):
+            self.client.force_authenticate(user=user)
+            response = self.client.get(reverse('job-list'), {'archived': 'true'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([job['id'] for job in response.data['results']], archived_ids)
+            self.assertIn('archived_at', response.data['results'][0])
+            self.assertNotIn(self.stale[0].id, [job['id'] for job in self.client.get(reverse('job-list')).data['results']])
+        response = self.client.get(reverse('job-list'), {'archived': 'true', 'pagination': 'cursor', 'fields': 'id'})
+        self.assertEqual(response.data['results'], [{'id': job_id} for job_id in archived_ids])
+        self.client.force_authenticate(user=self.other_employer)
+        self.assertEqual(self.client.get(reverse('job-list'), {'archived': 'true'}).data['results'], [])
+        self.client.force_authenticate(user=self.candidate)
+        response = self.client.get(reverse('job-list'), {'archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class GenerateDataTest(APITestCase):
+    def generate(self, **options):
+        call_command(
+            'generate_data', employers=3, candidates=20, listings=60, applications=200, stdout=io.StringIO(), **options
+        )
+
+    def test_generates_skewed_dataset(self):
+        self.generate()
+        self.assertEqual(User.objects.filter(roles='employer').count(), 3)
+        self.assertEqual(User.objects.filter(roles='candidate').count(), 20)
+        self.assertEqual(Company.objects.count(), 3)
+        self.assertEqual(JobListing.objects.count(), 60)
+        self.assertEqual(JobApplication.objects.count(), 200)
+        busiest = JobListing.objects.annotate(applicants=Count('jobapplication')).order_by('-applicants').first()
+        self.assertGreater(busiest.applicants, 200 / 60 * 3)
+        self.assertEqual(busiest.pending_count + busiest.accepted_count + busiest.rejected_count, busiest.applicants)
+        self.assertGreater(JobListing.objects.values('created_at').distinct().count(), 50)
+
+    def test_generated_data_is_usable_through_the_api(self):
+        self.generate()
+        response = self.client.post(
+            reverse('user-login'), {'username': 'gen-candidate-0', 'password': 'password123'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        word = JobListing.objects.first().job_title.split()[0]
+        self.client.force_authenticate(user=User.objects.get(username='gen-candidate-0'))
+        response = self.client.get(reverse('job-list'), {'search': word})
+        self.assertGreater(response.data['count'], 0)
+
+    def test_refuses_existing_prefix(self):
+        self.generate()
+        with self.assertRaises(CommandError):
+            self.generate()
+        self.generate(prefix='more')
+        self.assertEqual(JobListing.objects.count(), 120)
+
+
+class IndexUsageTest(APITestCase):
+    """The hot query shapes are answered from the indexes declared on the models."""
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in index_names), plan)
+
+    def test_job_listing_indexes(self):
+        jobs = JobListing.objects.all()
+        self.assertUsesIndex(
+            jobs.filter(is_active=True).order_by('-created_at', '-id')[:20], 'job_active_created_idx'
+        )
+        self.assertUsesIndex(
+            jobs.filter(company_id=1).order_by('-created_at', '-id')[:20], 'job_company_created_idx'
+        )
+        self.assertUsesIndex(jobs.filter(is_active=True, job_location='Kochi'), 'job_active_location_idx')
+        self.assertUsesIndex(jobs.filter(is_active=True, salary__gte=50000), 'job_active_salary_idx')
+
+    def test_application_indexes(self):
+        applications = JobApplication.objects.all()
+        # SQLite backs the unique constraint with an automatic index.
+        self.assertUsesIndex(
+            applications.filter(job_id=1, candidate_id=1),
+            'unique_job_application',
+            'sqlite_autoindex_jobs_jobapplication',
+        )
+        self.assertUsesIndex(
+            applications.filter(candidate_id=1).order_by('-applied_at', '-id')[:20], 'application_candidate_idx'
+        )
+        self.assertUsesIndex(applications.filter(job_id=1, status='pending'), 'application_job_status_idx')
+
+    def test_company_name_index(self):
+        self.assertUsesIndex(Company.objects.filter(company_name='Ola'), 'company_name_idx')
+
+
+class JobBulkImportTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('job-bulk-import')
+
+    @override_settings(BULK_IMPORT_BATCH_SIZE=2)
+    def test_ndjson_import_reports_row_errors(self):
+        body = "\n".join([
+            '{"job_title": "developer", "job_description": "django", "job_location": "Kochi", "salary": "24000"}',
+            '{"job_title": "tester", "job_description": "selenium", "job_location": "Kollam", "salary": "abc"}',
+            '',
+            'not json',
+            '{"job_title": "devops", "job_description": "kubernetes", "job_location": "Kochi", "salary": "50000"}',
+        ])
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['failed'], 2)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 4])
+        self.assertIn('salary', response.data['errors'][0]['errors'])
+        self.assertEqual(set(JobListing.objects.values_list('company', flat=True)), {self.company.id})
+
+        response = self.client.get(reverse('job-list'), {'search': 'kubernetes'})
+        self.assertEqual(response.data['count'], 1)
+
+    def test_csv_import(self):
+        body = (
+            "job_title,job_description,job_location,salary,is_active\n"
+            "developer,\"django, drf\",Kochi,24000,true\n"
+            "tester,selenium,Kollam,30000,false\n"
+            ",missing title,Kochi,1000,\n"
+        )
+        response = self.client.post(self.url, body, content_type='text/csv')
+
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['errors'][0]['row'], 3)
+        self.assertFalse(JobListing.objects.get(job_title='tester').is_active)
+        self.assertEqual(JobListing.objects.get(job_title='developer').job_description, 'django, drf')
+
+    def test_error_report_is_capped(self):
+        body = "\n".join(["[]"] * 5)
+        with override_settings(BULK_IMPORT_MAX_ERRORS=3):
+            response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.data['failed'], 5)
+        self.assertEqual(len(response.data['errors']), 3)
+        self.assertTrue(response.data['errors_truncated'])
+
+    def test_unsupported_content_type(self):
+        response = self.client.post(self.url, {'job_title': 'developer'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+
+class ApplicantExportTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company,
+            job_title="oracle developer",
+            job_description="kwdwkdlkdl",
+            job_location="Kollam",
+            salary="60000"
+        )
+        candidates = User.objects.bulk_create(
+            User(username=f'candidate{i}', email=f'candidate{i}@example.com', roles='candidate')
+            for i in range(5)
+        )
+        for candidate in candidates:
+            JobApplication.objects.create(
+                job=self.job, candidate=candidate, resume='resume.txt', cover_letter='hello, world'
+            )
+        self.client.force_authenticate(user=self.employer)
+        self.url = reverse('employer-list-applications', args=[self.job.id])
+
+    def test_paginated_json_is_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_pages_are_ordered_newest_first_without_overlap(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            first = self.client.get(self.url)
+            second = self.client.get(first.data['next'])
+        ids = [application['id'] for application in first.data['results'] + second.data['results']]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(
+            ids, list(JobApplication.objects.filter(job=self.job).order_by('-applied_at', '-id').values_list('id', flat=True))
+        )
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_ndjson_export_streams_every_application(self):
+        response = self.client.get(self.url, {'export': 'ndjson'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['status'], 'pending')
+        self.assertEqual(rows[0]['cover_letter'], 'hello, world')
+
+    def test_csv_export(self):
+        response = self.client.get(self.url, {'export': 'csv'})
+        self.assertIn(f'job-{self.job.id}-applicants.csv', response['Content-Disposition'])
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], ['id', 'job', 'resume', 'cover_letter', 'applied_at', 'status'])
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][3], 'hello, world')
+
+    def test_unknown_export_format(self):
+        response = self.client.get(self.url, {'export': 'xlsx'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ResumeUploadTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.jobs = [
+            JobListing.objects.create(
+                company=self.company,
+                job_title=f"developer {i}",
+                job_description="kwdwkdlkdl",
+                job_location="Kollam",
+                salary="60000"
+            )
+            for i in range(3)
+        ]
+        self.content = b"python django " * 1000
+        self.client.force_authenticate(user=self.candidate)
+
+    def start(self, content=None):
+        content = self.content if content is None else content
+        response = self.client.post(
+            reverse('resume-upload-list'), {'filename': 'resume.pdf', 'size': len(content)}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def send(self, upload_id, chunk, offset):
+        return self.client.generic(
+            'PATCH',
+            reverse('resume-upload-detail', args=[upload_id]),
+            chunk,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def upload(self, content=None):
+        content = self.content if content is None else content
+        upload_id = self.start(content)
+        half = len(content) // 2
+        self.assertEqual(self.send(upload_id, content[:half], 0).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.send(upload_id, content[half:], half).status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('resume-upload-complete', args=[upload_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_chunked_upload_is_stored_by_content_hash(self):
+        response = self.upload()
+        digest = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(response.data['status'], 'complete')
+        self.assertEqual(response.data['sha256'], digest)
+        self.assertFalse(response.data['deduplicated'])
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.file.name, f'resumes/{digest[:2]}/{digest[2:4]}/{digest}.pdf')
+        with blob.file.open('rb') as fh:
+            self.assertEqual(fh.read(), self.content)
+
+    def test_apply_references_completed_upload(self):
+        upload_id = self.upload().data['id']
+        response = self.client.post(
+            reverse('applications-list'), {'job': self.jobs[0].id, 'resume_upload': upload_id}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        application = JobApplication.objects.get()
+        self.assertEqual(application.resume_blob, ResumeBlob.objects.get())
+        self.assertEqual(application.resume.name, application.resume_blob.file.name)
+
+    def test_offset_mismatch_and_oversized_chunk(self):
+        upload_id = self.start()
+        self.send(upload_id, self.content[:100], 0)
+        response = self.send(upload_id, self.content[:100], 0)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response['Upload-Offset'], '100')
+        response = self.send(upload_id, self.content, 100)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        response = self.client.post(reverse('resume-upload-complete', args=[upload_id]))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_identical_resumes_are_stored_once(self):
+        self.upload()
+        self.assertTrue(self.upload().data['deduplicated'])
+        for job in self.jobs:
+            resume = SimpleUploadedFile("cv.pdf", self.content)
+            response = self.client.post(reverse('applications-list'), {'job': job.id, 'resume': resume})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ResumeBlob.objects.count(), 1)
+        self.assertEqual(len(os.listdir(os.path.dirname(ResumeBlob.objects.get().file.path))), 1)
+
+        staff = User.objects.create_user(username='admin', password='testpassword123', roles='employer', is_staff=True)
+        self.client.force_authenticate(user=staff)
+        with self.assertWithinQueryBudget(ResumeUploadViewSet, 'stats'):
+            response = self.client.get(reverse('resume-upload-stats'))
+        self.assertEqual(response.data['stored_bytes'], len(self.content))
+        self.assertEqual(response.data['saved_bytes'], 2 * len(self.content))
+        self.assertEqual(response.data['uploads']['deduplicated'], 1)
+        self.assertIsNotNone(response.data['uploads']['throughput_bytes_per_second'])
+
+    def test_cannot_reference_another_candidates_upload(self):
+        upload_id = self.upload().data['id']
+        other = User.objects.create_user(username='other', password='testpassword123', roles='candidate')
+        self.client.force_authenticate(user=other)
+        response = self.client.post(
+            reverse('applications-list'), {'job': self.jobs[0].id, 'resume_upload': upload_id}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('resume_upload', response.data)
+
+    def test_concurrent_chunks_and_completions(self):
+        upload_id = self.start()
+        first, second = ResumeUpload.objects.get(pk=upload_id), ResumeUpload.objects.get(pk=upload_id)
+        write_chunk(first, 0, io.BytesIO(self.content[:100]))
+        # Sent on the stale offset by a concurrent request: refused without touching the file.
+        with self.assertRaises(UploadOffsetMismatch):
+            write_chunk(second, 0, io.BytesIO(b'x' * 100))
+        self.assertEqual(second.offset, 100)
+        self.send(upload_id, self.content[100:], 100)
+        with open(resume_storage.path(first.partial_name), 'rb') as fh:
+            self.assertEqual(fh.read(), self.content)
+
+        first, second = ResumeUpload.objects.get(pk=upload_id), ResumeUpload.objects.get(pk=upload_id)
+        complete_upload(first)
+        self.assertEqual(complete_upload(second).blob, first.blob)
+        response = self.client.post(reverse('resume-upload-complete', args=[upload_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['sha256'], hashlib.sha256(self.content).hexdigest())
+
+    def test_upload_endpoints_within_budget(self):
+        with self.assertWithinQueryBudget(ResumeUploadViewSet, 'create'):
+            upload_id = self.start()
+        with self.assertWithinQueryBudget(ResumeUploadViewSet, 'partial_update'):
+            self.send(upload_id, self.content, 0)
+        with self.assertWithinQueryBudget(ResumeUploadViewSet, 'complete'):
+            self.client.post(reverse('resume-upload-complete', args=[upload_id]))
+        with self.assertWithinQueryBudget(JobApplicationViewSet, 'create'):
+            response = self.client.post(
+                reverse('applications-list'), {'job': self.jobs[0].id, 'resume_upload': upload_id}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with self.assertWithinQueryBudget(JobApplicationViewSet, 'create'):
+            response = self.client.post(
+                reverse('applications-list'),
+                {'job': self.jobs[1].id, 'resume': SimpleUploadedFile("other.pdf", b"another resume")},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+def make_pdf(text):
+    """A one-page PDF showing `text` in Helvetica."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+        b" /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+def make_docx(*paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    path = tempfile.mktemp(suffix=".docx")
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    with open(path, "rb") as fh:
+        content = fh.read()
+    os.remove(path)
+    return content
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ApplicantSearchTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.job = JobListing.objects.create(
+            company=self.company,
+            job_title="python developer",
+            job_description="kwdwkdlkdl",
+            job_location="Kollam",
+            salary="60000"
+        )
+        self.url = reverse('employer-list-applications', args=[self.job.id])
+
+    def apply(self, username, filename, content, job=None):
+        candidate = User.objects.create_user(
+            username=username, password='testpassword123', email=f'{username}@example.com', roles='candidate'
+        )
+        self.client.force_authenticate(user=candidate)
+        resume = SimpleUploadedFile(filename, content)
+        response = self.client.post(reverse('applications-list'), {'job': (job or self.job).id, 'resume': resume})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def search(self, query):
+        self.client.force_authenticate(user=self.employer)
+        with self.assertWithinQueryBudget(EmployerJobApplicationViewSet, 'list_applications'):
+            response = self.client.get(self.url, {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_text_is_extracted_from_pdf_docx_and_txt(self):
+        self.apply('pdf', 'cv.pdf', make_pdf('Senior Django developer'))
+        self.apply('docx', 'cv.docx', make_docx('Kotlin engineer', 'Android apps'))
+        self.apply('txt', 'cv.txt', b'Go and Rust programmer')
+        self.assertEqual(index_pending_resumes(), {'indexed': 3, 'failed': 0})
+        texts = sorted(ResumeBlob.objects.values_list('text', flat=True))
+        self.assertEqual(texts, ['Go and Rust programmer', 'Kotlin engineer\nAndroid apps', 'Senior Django developer'])
+        self.assertEqual(self.search('django')['count'], 1)
+        self.assertEqual(self.search('android')['count'], 1)
+
+    def test_results_are_ranked(self):
+        weak = self.apply('weak', 'a.txt', b'java developer, some django')
+        strong = self.apply('strong', 'b.txt', b'django django rest framework, django channels')
+        self.apply('none', 'c.txt', b'java spring')
+        index_pending_resumes()
+        data = self.search('Django REST')
+        self.assertEqual([row['id'] for row in data['results'][:2]], [strong, weak])
+        self.assertEqual(data['count'], 2)
+        self.assertGreater(data['results'][0]['score'], data['results'][1]['score'])
+
+    def test_indexing_is_incremental_and_once_per_file(self):
+        self.apply('first', 'a.txt', b'django developer')
+        self.assertEqual(index_pending_resumes(), {'indexed': 1, 'failed': 0})
+        # Same file for another job, and a new file: only the new one needs extracting.
+        other_job = JobListing.objects.create(
+            company=self.company, job_title="web", job_description="x", job_location="Kollam", salary="1"
+        )
+        self.apply('second', 'copy.txt', b'django developer', job=other_job)
+        self.apply('third', 'b.txt', b'flask developer')
+        self.assertEqual(index_pending_resumes(), {'indexed': 1, 'failed': 0})
+        self.assertEqual(ResumeTerm.objects.filter(term='developer').count(), 2)
+        self.assertEqual(self.search('developer')['count'], 2)
+
+    def test_unreadable_resume_is_marked_failed(self):
+        self.apply('broken', 'cv.docx', b'not a zip file')
+        with self.assertLogs('apps.jobs.resume_search', level='WARNING'):
+            self.assertEqual(index_pending_resumes(), {'indexed': 0, 'failed': 1})
+        self.assertEqual(ResumeBlob.objects.get().text_status, 'failed')
+
+    def test_command_extracts_in_process_pool(self):
+        self.apply('pool', 'cv.txt', b'django developer')
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(index_pending_resumes(executor=executor), {'indexed': 1, 'failed': 0})
+        self.apply('command', 'other.txt', b'flask developer')
+        call_command('extract_resume_text', workers=0, stdout=mock.MagicMock())
+        self.assertFalse(ResumeBlob.objects.filter(text_status='pending').exists())
+
+
+class JobRecommendationTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.applied = self.create_job("python django developer", "rest apis with django and postgres")
+        self.django = self.create_job("senior django engineer", "django rest framework and celery")
+        self.python = self.create_job("python data engineer", "pandas and airflow")
+        self.java = self.create_job("java programmer", "spring boot microservices")
+        self.closed = self.create_job("django lead", "django rest apis", is_active=False)
+        JobApplication.objects.create(job=self.applied, candidate=self.candidate, resume='resume.txt')
+        # Built ahead like `warm_up` does: the change log of the previous test was rolled back.
+        get_recommender().build()
+        self.client.force_authenticate(user=self.candidate)
+        self.url = reverse('job-recommended')
+
+    def create_job(self, title, description, is_active=True):
+        return JobListing.objects.create(
+            company=self.company,
+            job_title=title,
+            job_description=description,
+            job_location="Kollam",
+            salary="60000",
+            is_active=is_active,
+        )
+
+    def recommended_ids(self):
+        with self.assertWithinQueryBudget(JobViewSet, 'recommended'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in response.data['results']]
+
+    def test_recommends_similar_active_jobs(self):
+        ids = self.recommended_ids()
+        self.assertEqual(ids[0], self.django.id)
+        self.assertIn(self.python.id, ids)
+        self.assertNotIn(self.applied.id, ids)
+        self.assertNotIn(self.closed.id, ids)
+        self.assertNotIn(self.java.id, ids)
+
+    def test_matrix_updates_incrementally(self):
+        self.recommended_ids()
+        with mock.patch.object(JobRecommender, 'build') as build:
+            new = self.create_job("django developer", "python django rest apis")
+            self.assertEqual(self.recommended_ids()[0], new.id)
+            self.django.is_active = False
+            self.django.save()
+            self.assertNotIn(self.django.id, self.recommended_ids())
+            new.delete()
+            self.assertNotIn(new.id, self.recommended_ids())
+        build.assert_not_called()
+
+    def test_other_processes_replay_the_change_log(self):
+        other = JobRecommender()
+        other.build()
+        self.assertEqual(other.sequence, JobChange.objects.latest('id').id)
+        with mock.patch.object(JobRecommender, 'build') as build:
+            new = self.create_job("django developer", "python django rest apis")
+            other.sync()
+        build.assert_not_called()
+        self.assertEqual(other.recommend([self.applied.id], 10)[0][0], new.id)
+        # Entries pruned past a process's last sync make it rebuild rather than miss them.
+        other.synced_at -= timedelta(days=2)
+        with mock.patch.object(JobRecommender, 'build') as build:
+            other.sync()
+        build.assert_called_once()
+
+    def test_bulk_import_updates_matrix(self):
+        self.recommended_ids()
+        self.client.force_authenticate(user=self.employer)
+        body = json.dumps({
+            "job_title": "django backend developer",
+            "job_description": "python django rest apis postgres",
+            "job_location": "Kochi",
+            "salary": "1",
+        })
+        self.client.generic('POST', reverse('job-bulk-import'), body, content_type='application/x-ndjson')
+        self.client.force_authenticate(user=self.candidate)
+        imported = JobListing.objects.get(job_title="django backend developer")
+        self.assertEqual(self.recommended_ids()[0], imported.id)
+
+    def test_candidate_without_applications_gets_newest_jobs(self):
+        JobApplication.objects.all().delete()
+        response = self.client.get(self.url, {'limit': 2})
+        self.assertEqual([job['id'] for job in response.data['results']], [self.java.id, self.python.id])
+        self.assertIsNone(response.data['results'][0]['score'])
+
+    def test_employer_cannot_get_recommendations(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class JobFacetedSearchTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.other_employer = User.objects.create_user(
+            username='otheruser',
+            password='testpassword123',
+            email='otheruser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.other_company = Company.objects.create(
+            company_name="Uber",
+            company_location="Kochi",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.other_employer
+        )
+        for company, location, salary in [
+            (self.company, "Kollam", "20000"),
+            (self.company, "Kollam", "60000"),
+            (self.company, "Kochi", "60000"),
+            (self.other_company, "Kochi", "150000"),
+            (self.other_company, "Kochi", "300000"),
+        ]:
+            JobListing.objects.create(
+                company=company,
+                job_title="python developer",
+                job_description="kwdwkdlkdl",
+                job_location=location,
+                salary=salary
+            )
+        self.client.force_authenticate(user=self.candidate)
+        self.url = reverse('job-list')
+
+    def test_salary_range_and_ordering(self):
+        response = self.client.get(self.url, {'salary_min': 50000, 'salary_max': 150000, 'ordering': '-salary'})
+        self.assertEqual([job['salary'] for job in response.data['results']], ['150000.00', '60000.00', '60000.00'])
+
+    def test_created_at_range(self):
+        JobListing.objects.filter(salary=20000).update(created_at='2020-01-01T00:00:00Z')
+        response = self.client.get(self.url, {'created_before': '2021-01-01T00:00:00Z'})
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get(self.url, {'created_after': '2021-01-01T00:00:00Z'})
+        self.assertEqual(response.data['count'], 4)
+
+    def test_facets_are_counted_over_all_matching_jobs(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'facets': 'true', 'salary_min': 50000})
+        facets = response.data['facets']
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(facets['location'], [{'value': 'Kochi', 'count': 3}, {'value': 'Kollam', 'count': 1}])
+        self.assertEqual(
+            facets['salary'],
+            [
+                {'min': 50000, 'max': 100000, 'count': 2},
+                {'min': 100000, 'max': 200000, 'count': 1},
+                {'min': 200000, 'max': None, 'count': 1},
+            ],
+        )
+        self.assertEqual(
+            facets['company'],
+            [
+                {'id': self.company.id, 'name': 'Ola', 'count': 2},
+                {'id': self.other_company.id, 'name': 'Uber', 'count': 2},
+            ],
+        )
+
+    def test_facets_cached_per_filter_signature(self):
+        self.client.get(self.url, {'facets': 'true'})
+        # Another page and ordering of the same filters reuses the facets: only the page queries run.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'facets': 'true', 'page': 2, 'ordering': 'salary'})
+        self.assertEqual(
+            response.data['facets']['location'], [{'value': 'Kochi', 'count': 3}, {'value': 'Kollam', 'count': 2}]
+        )
+        job = JobListing.objects.filter(job_location='Kollam').first()
+        self.client.force_authenticate(user=self.employer)
+        self.client.patch(reverse('job-detail', args=[job.id]), {'job_location': 'Kochi'}, format='json')
+        self.client.force_authenticate(user=self.candidate)
+        response = self.client.get(self.url, {'facets': 'true'})
+        self.assertEqual(
+            response.data['facets']['location'], [{'value': 'Kochi', 'count': 4}, {'value': 'Kollam', 'count': 1}]
+        )
+
+    def test_facets_within_list_budget(self):
+        for user in (self.employer, self.candidate):
+            cache.clear()
+            self.client.force_authenticate(user=user)
+            with self.assertWithinQueryBudget(JobViewSet, 'list'):
+                response = self.client.get(self.url, {'facets': 'true', 'search': 'python'})
+            self.assertIn('facets', response.data)
+
+
+# One test process: its cache is shared, so the token claims are trusted.
+@override_settings(ROOT_URLCONF=settings.ASGI_URLCONF, AUTH_SHARED_CACHE=True)
+class AsyncReadPathTest(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.other_employer = User.objects.create_user(
+            username='otheruser',
+            password='testpassword123',
+            email='otheruser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.other_company = Company.objects.create(
+            company_name="Uber",
+            company_location="Kochi",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.other_employer
+        )
+        self.jobs = [
+            JobListing.objects.create(
+                company=company,
+                job_title="python developer",
+                job_description="kwdwkdlkdl",
+                job_location=location,
+                salary=salary
+            )
+            for company, location, salary in [
+                (self.company, "Kollam", "20000"),
+                (self.company, "Kochi", "60000"),
+                (self.other_company, "Kochi", "150000"),
+                (self.other_company, "Kochi", "300000"),
+            ]
+        ]
+        self.tokens = {user.id: issue_tokens(user).access_token for user in (self.employer, self.candidate)}
+
+    def async_request(self, method, path, user=None, headers=None, **kwargs):
+        headers = dict(headers or {})
+        if user is not None:
+            headers['Authorization'] = f'Bearer {self.tokens[user.id]}'
+        return async_to_sync(getattr(self.async_client, method))(path, headers=headers, **kwargs)
+
+    def test_list_archived_listings(self):
+        JobListing.objects.filter(pk=self.jobs[0].pk).update(expires_at=timezone.now() - timedelta(days=365))
+        list(archive_expired())
+        response = self.async_request('get', '/jobs/jobs/', self.employer, data={'archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [job] = response.json()['results']
+        self.assertEqual(job['id'], self.jobs[0].id)
+        self.assertIn('archived_at', job)
+        response = self.async_request('get', '/jobs/jobs/', self.candidate, data={'archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_detail_falls_back_to_archived_listing(self):
+        JobListing.objects.filter(pk=self.jobs[0].pk).update(expires_at=timezone.now() - timedelta(days=365))
+        list(archive_expired())
+        response = self.async_request('get', f'/jobs/jobs/{self.jobs[0].id}/', self.employer)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('archived_at', response.json())
+        response = self.async_request('get', f'/jobs/jobs/{self.jobs[0].id}/', self.candidate)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_matches_sync_view_and_shares_its_cache(self):
+        params = {'salary_min': 50000, 'ordering': '-salary', 'facets': 'true'}
+        response = self.async_request('get', '/jobs/jobs/', self.candidate, data=params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([job['salary'] for job in response.json()['results']], ['300000.00', '150000.00', '60000.00'])
+        self.assertEqual(response.json()['facets']['location'], [{'value': 'Kochi', 'count': 3}])
+
+        with override_settings(ROOT_URLCONF='job_portal.urls'):
+            self.client.force_authenticate(user=self.candidate)
+            sync_response = self.client.get('/jobs/jobs/', params)
+        self.assertEqual(sync_response['X-Cache'], 'HIT')
+        self.assertEqual(sync_response.json(), response.json())
+
+    def test_list_paginates_by_page_and_cursor(self):
+        response = self.async_request('get', '/jobs/jobs/', self.candidate, data={'page': 2})
+        self.assertEqual(response.json()['count'], 4)
+        self.assertEqual(len(response.json()['results']), 1)
+        response = self.async_request('get', '/jobs/jobs/', self.candidate, data={'pagination': 'cursor', 'page_size': 3})
+        self.assertEqual([job['id'] for job in response.json()['results']], [job.id for job in self.jobs[:0:-1]])
+        self.assertIsNotNone(response.json()['next'])
+        response = self.async_request('get', '/jobs/jobs/', self.candidate, data={'page': 9})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_detail_is_scoped_to_the_employer(self):
+        response = self.async_request('get', f'/jobs/jobs/{self.jobs[0].id}/', self.employer)
+        self.assertEqual(response.json()['company']['company_name'], 'Ola')
+        response = self.async_request('get', f'/jobs/jobs/{self.jobs[2].id}/', self.employer)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_errors_match_drf(self):
+        response = self.async_request('get', '/jobs/jobs/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+        response = self.async_request('get', '/jobs/applications/', self.employer)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json(), {'detail': 'You must be an candidate to access this resource.'})
+        response = self.async_request('get', '/jobs/jobs/', self.candidate, data={'company': 999})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_writes_fall_through_to_the_sync_views(self):
+        response = self.async_request(
+            'post', '/jobs/jobs/', self.employer, content_type='application/json',
+            data={"job_title": "developer", "job_description": "x", "job_location": "Kochi", "salary": "24000"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.async_request(
+            'patch', f'/jobs/jobs/{self.jobs[0].id}/', self.employer, content_type='application/json',
+            data={"salary": "25000"},
+        )
+        self.assertEqual(response.json()['salary'], '25000.00')
+
+    def test_candidate_applications(self):
+        for job, application_status in [(self.jobs[0], 'pending'), (self.jobs[1], 'accepted')]:
+            JobApplication.objects.create(
+                job=job, candidate=self.candidate, cover_letter="x", status=application_status
+            )
+        with self.assertWithinQueryBudget(AsyncJobApplicationListView, 'list'), warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            response = self.async_request('get', '/jobs/applications/', self.candidate, data={'status': 'accepted'})
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['results'][0]['job'], self.jobs[1].id)
+
+        etag = response['ETag']
+        response = self.async_request(
+            'get', '/jobs/applications/', self.candidate, data={'status': 'accepted'}, headers={'If-None-Match': etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        with override_settings(ROOT_URLCONF='job_portal.urls'), warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            self.client.force_authenticate(user=self.candidate)
+            sync_response = self.client.get('/jobs/applications/', {'status': 'accepted'})
+        self.assertEqual(sync_response['ETag'], etag)
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.async_request('get', f'/jobs/jobs/{self.jobs[0].id}/', self.candidate)
+        etag = response['ETag']
+        cache.clear()
+        response = self.async_request('get', f'/jobs/jobs/{self.jobs[0].id}/', self.candidate, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.async_request('get', '/jobs/jobs/', self.candidate)
+        with override_settings(ROOT_URLCONF='job_portal.urls'):
+            self.client.force_authenticate(user=self.candidate)
+            cache.clear()
+            sync_response = self.client.get('/jobs/jobs/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(sync_response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_fields_match_sync_view(self):
+        params = {'fields': 'job_title,company.company_name', 'ordering': 'salary'}
+        response = self.async_request('get', '/jobs/jobs/', self.candidate, data=params)
+        self.assertEqual(response.json()['results'][0], {'company': {'company_name': 'Ola'}, 'job_title': 'python developer'})
+        cache.clear()
+        with override_settings(ROOT_URLCONF='job_portal.urls'):
+            self.client.force_authenticate(user=self.candidate)
+            sync_response = self.client.get('/jobs/jobs/', params)
+        self.assertEqual(sync_response.json(), response.json())
+
+    def test_within_query_budgets(self):
+        for user in (self.employer, self.candidate):
+            cache.clear()
+            with self.assertWithinQueryBudget(AsyncJobListView, 'list'):
+                self.async_request('get', '/jobs/jobs/', user, data={'search': 'python', 'facets': 'true'})
+            with self.assertWithinQueryBudget(AsyncJobDetailView, 'retrieve'):
+                self.async_request('get', f'/jobs/jobs/{self.jobs[1].id}/', user)
@@ -2,11 +2,12 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.jobs.views import JobViewSet, JobApplicationViewSet, EmployerJobApplicationViewSet
+from apps.jobs.views import JobViewSet, JobApplicationViewSet, EmployerJobApplicationViewSet, ResumeUploadViewSet
 
 router = DefaultRouter()
 router.register(r'jobs', JobViewSet, basename='job')
 router.register(r'applications', JobApplicationViewSet, basename='applications')
+router.register(r'resume-uploads', ResumeUploadViewSet, basename='resume-upload')
 router.register(r'employer', EmployerJobApplicationViewSet, basename='employer')
 
 urlpatterns = [
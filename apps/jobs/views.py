@@ -1,31 +1,110 @@
+from collections import Counter, defaultdict
+
 from django.conf import settings
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, status, filters, request
+from rest_framework import mixins, viewsets, status, filters, request
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.company.models import Company
-from apps.jobs.models import JobListing, JobApplication
-from apps.jobs.serializers import JobSerializer, JobApplicationSerializer
+from apps.conditional import ConditionalGetMixin
+from apps.db_retry import retry_on_locked
+from apps.jobs.bulk_import import UnsupportedImportFormat, import_jobs, iter_rows
+from apps.jobs.cache import ScopedResponseCacheMixin, get_cache_stats
+from apps.jobs.counters import apply_count_changes, invalidate_company_counts
+from apps.jobs.export import EXPORT_FORMATS, stream_applications
+from apps.jobs.facets import get_facets
+from apps.jobs.filters import JobApplicationFilter, JobListingFilter
+from apps.jobs.archive import get_visible_archived_jobs
+from apps.jobs.models import ArchivedJobApplication, ArchivedJobListing, JobListing, JobApplication, ResumeUpload
+from apps.jobs.pagination import JobApplicationPagination, JobListingPagination
+from apps.jobs.recommend import recommend_jobs
+from apps.jobs.rollups import DECISIONS, add_contribution, apply_daily_changes, get_employer_analytics
+from apps.jobs.resume_search import rank_applications
+from apps.jobs.resumes import (
+    UploadError,
+    UploadIncomplete,
+    UploadOffsetMismatch,
+    UploadTooLarge,
+    complete_upload,
+    get_resume_stats,
+    write_chunk,
+)
+from apps.jobs.search import JobSearchFilter
+from apps.jobs.serializers import (
+    ArchivedJobSerializer,
+    BulkStatusChangeSerializer,
+    EmployerAnalyticsQuerySerializer,
+    JobApplicationSerializer,
+    JobSerializer,
+    ResumeUploadSerializer,
+)
+from apps.notifications.outbox import enqueue_mail, enqueue_mass_mail
 from apps.permissions import IsEmployer, IsCandidate, IsStaff
+from apps.sparse_fields import SparseFieldsetMixin
+from apps.user.authentication import get_company_id
+
+
+def get_visible_jobs(user):
+    """
+    - Filters job listings based on the user's role.
+    - **Role-based access**:
+        - Employers see only their job listings.
+        - Candidates see only active job listings that have not expired.
+    - **Returns**:
+        - Queryset of jobs based on role-specific filtering.
+    """
+    jobs = JobListing.objects.select_related("company")
+
+    if user.is_staff:
+        return jobs
+
+    if user.roles == "employer":
+        company_id = get_company_id(user)
+        if company_id is None:
+            raise Http404("User does not have an associated company")
+        jobs = jobs.filter(company_id=company_id)
+    elif user.roles == "candidate":
+        jobs = jobs.open()
+    return jobs
 
 
-class JobViewSet(viewsets.ModelViewSet):
-    queryset = JobListing.objects.all()
+class JobViewSet(ScopedResponseCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = JobListing.objects.select_related("company")
     serializer_class = JobSerializer
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    pagination_class = JobListingPagination
+    filter_backends = [JobSearchFilter, DjangoFilterBackend]
     search_fields = [
         "job_title",
         "job_description",
         "company__company_name",
         "job_location",
     ]
-    filterset_fields = ["salary", "job_location", "is_active"]
+    filterset_class = JobListingFilter
+    # Jobs nest their company.
+    last_modified_fields = ("updated_at", "company__updated_at")
+    # Keyset cursors are built from it.
+    sparse_fieldset_columns = ("created_at",)
 
     permission_classes = [IsAuthenticated, IsEmployer | IsCandidate | IsStaff]
+    query_budgets = {
+        "list": 7,
+        "retrieve": 4,
+        "create": 5,
+        "partial_update": 5,
+        "destroy": 5,
+        "cache_stats": 1,
+        "recommended": 4,
+    }
+    recommendation_limit = 10
+    max_recommendation_limit = 50
 
     def create(self, request):
         """
@@ -40,41 +119,152 @@ class JobViewSet(viewsets.ModelViewSet):
                 {"message": "You must be an employer to access this resource."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        serializer = JobSerializer(data=request.data)
+        serializer = JobSerializer(data=request.data, context=self.get_serializer_context())
         serializer.is_valid(raise_exception=True)
-        user = request.user
-        try:
-            owner_company = Company.objects.get(owner=user)
-        except Company.DoesNotExist:
+        company_id = get_company_id(request.user)
+        if company_id is None:
             return Response(
                 {"message": "User does not have an associated company"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        serializer.save(company=owner_company)
+        serializer.save(company_id=company_id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    def get_queryset(self):
+    def list(self, request, *args, **kwargs):
         """
-          - Filters job listings based on the user's role.
-        - **Role-based access**:
-            - Employers see only their job listings.
-            - Candidates see only active job listings.
+        Lists the jobs visible to the user, with the filters of `JobListingFilter` and `?search=`.
+        - `?facets=true` adds a `facets` block: job counts per location, salary bucket and company
+          over every matching job, not just the page.
+        - `?archived=true` lists the archived listings instead (`list_archived`).
         - **Returns**:
-            - Queryset of jobs based on role-specific filtering.
+            - 200 OK with a page of jobs.
         """
+        if request.query_params.get("archived") in ("1", "true"):
+            return self.list_archived(request)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and request.query_params.get("facets") in ("1", "true"):
+            queryset = self.filter_queryset(self.get_queryset())
+            response.data["facets"] = get_facets(queryset, request, self.get_cache_scope(request))
+        return response
 
-        jobs = JobListing.objects.all()
+    def list_archived(self, request):
+        """
+        Lists the archived listings of the employer's company (every company's for staff), newest
+        first, each with its `archived_at`; the filters, search and facets of live listings do not apply.
+        - **Returns**:
+            - 200 OK with a page of archived jobs.
+            - 403 Forbidden if the user is a candidate.
+        """
+        if not request.user.is_staff and request.user.roles != "employer":
+            return Response(
+                {"message": "You must be an employer or admin to access this resource."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        jobs = get_visible_archived_jobs(request.user).order_by("-created_at", "-id")
+        page = self.paginate_queryset(jobs)
+        serializer = ArchivedJobSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
 
-        if self.request.user.is_staff:
-            return jobs
+    def get_queryset(self):
+        return self.narrow_queryset(get_visible_jobs(self.request.user))
 
-        if self.request.user.roles == "employer":
+    def get_object(self):
+        """
+        Returns the job listing visible to the user; on `retrieve`, staff and the owning employer
+        also get archived listings.
+        """
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action != "retrieve":
+                raise
+            return get_object_or_404(get_visible_archived_jobs(self.request.user), pk=self.kwargs["pk"])
 
-            owner_company = get_object_or_404(Company, owner=self.request.user)
-            jobs = jobs.filter(company=owner_company)
-        elif self.request.user.roles == "candidate":
-            jobs = jobs.filter(is_active=True)
-        return jobs
+    def get_serializer(self, *args, **kwargs):
+        if args and isinstance(args[0], ArchivedJobListing):
+            # Shaped like a live listing, plus its `archived_at`.
+            return ArchivedJobSerializer(*args, context=self.get_serializer_context(), **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    @action(detail=False, methods=["post"], url_path="bulk-import")
+    def bulk_import(self, request):
+        """
+        Imports job listings for the employer's company from a streamed NDJSON or CSV body.
+        - `request`: body with `Content-Type: application/x-ndjson` (one job object per line) or
+          `text/csv` (header row: job_title, job_description, job_location, salary, is_active).
+        - Rows are validated with `JobSerializer` and inserted in batches; invalid rows are skipped.
+        - **Returns**:
+            - 200 OK with the number of `created` and `failed` rows and the per-row `errors`.
+            - 403 Forbidden if the user is not an employer.
+            - 404 Not Found if the user does not have an associated company.
+            - 415 Unsupported Media Type for other content types.
+        """
+        if request.user.roles != "employer":
+            return Response(
+                {"message": "You must be an employer to access this resource."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        company_id = get_company_id(request.user)
+        if company_id is None:
+            return Response(
+                {"message": "User does not have an associated company"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            rows = iter_rows(request.stream, request.content_type)
+        except UnsupportedImportFormat:
+            return Response(
+                {"message": "Upload NDJSON (application/x-ndjson) or CSV (text/csv)."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        # The search index stores the company name with each listing.
+        owner_company = Company.objects.only("id", "company_name").get(pk=company_id)
+        report = import_jobs(rows, owner_company)
+        return Response(report, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache-stats",
+        permission_classes=[IsAuthenticated, IsStaff],
+    )
+    def cache_stats(self, request):
+        """
+        Returns the hit/miss counters of the job list/detail response cache.
+        - **Returns**:
+            - 200 OK with `hits`, `misses` and `hit_ratio`.
+            - 403 Forbidden if the user is not an admin.
+        """
+        return Response(get_cache_stats(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsCandidate])
+    def recommended(self, request):
+        """
+        Recommends active jobs similar to the ones the candidate applied to.
+        - `?limit=`: number of jobs, 10 by default and at most 50.
+        - Candidates without applications get the newest active jobs.
+        - **Returns**:
+            - 200 OK with `results`, each job with its similarity `score` (null for the newest-jobs fallback).
+            - 403 Forbidden if the user is not a candidate.
+        """
+        try:
+            limit = min(int(request.query_params["limit"]), self.max_recommendation_limit)
+        except (KeyError, ValueError):
+            limit = self.recommendation_limit
+        limit = max(limit, 1)
+        jobs = JobListing.objects.select_related("company").open()
+        recommendations = recommend_jobs(request.user, limit)
+        if recommendations:
+            found = jobs.in_bulk([job_id for job_id, _ in recommendations])
+            ranked = [(found[job_id], score) for job_id, score in recommendations if job_id in found]
+        else:
+            ranked = [(job, None) for job in jobs.order_by("-created_at", "-id")[:limit]]
+        serializer = JobSerializer()
+        results = [
+            {**serializer.to_representation(job), "score": None if score is None else round(score, 4)}
+            for job, score in ranked
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
 
     def partial_update(self, request, pk=None):
         """
@@ -92,8 +282,12 @@ class JobViewSet(viewsets.ModelViewSet):
                 {"message": "You must be an employer to access this resource."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        job_listing = get_object_or_404(JobListing, pk=pk, company__owner=request.user)
-        serializer = JobSerializer(job_listing, data=request.data, partial=True)
+        job_listing = get_object_or_404(
+            JobListing.objects.select_related("company"), pk=pk, company_id=get_company_id(request.user)
+        )
+        serializer = JobSerializer(
+            job_listing, data=request.data, partial=True, context=self.get_serializer_context()
+        )
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -121,7 +315,7 @@ class JobViewSet(viewsets.ModelViewSet):
             )
         if request.user.roles == "employer":
             job_listing = get_object_or_404(
-                JobListing, pk=pk, company__owner=request.user
+                JobListing, pk=pk, company_id=get_company_id(request.user)
             )
             job_listing.delete()
         elif request.user.is_staff:
@@ -132,14 +326,19 @@ class JobViewSet(viewsets.ModelViewSet):
         )
 
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = JobApplication.objects.all()
     serializer_class = JobApplicationSerializer
+    pagination_class = JobApplicationPagination
     permission_classes = [IsAuthenticated, IsCandidate]
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
-    filterset_fields = [
-        "status",
-    ]
+    filterset_class = JobApplicationFilter
+    query_budgets = {
+        "list": 3,
+        "create": 14,
+        "partial_update": 4,
+        "destroy": 4,
+    }
 
     def create(self, request, *args, **kwargs):
         """
@@ -148,7 +347,9 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         **Returns**:
         - Success: 201 Created with the serialized job application.
         - Failure: 400 Bad Request if data is invalid, or 403 if user is not a candidate.
-        - Sends a confirmation email to the candidate after successful job application.
+        - 404 Not Found if the job does not exist or has expired.
+        - 503 Service Unavailable if the database stays locked through the retries.
+        - Queues a confirmation email to the candidate in the same transaction as the application.
         """
         # if request.user.roles != 'candidate':
         #     return Response({'message': 'Only candidates can apply for jobs.'}, status=status.HTTP_403_FORBIDDEN)
@@ -158,23 +359,34 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
             return Response(
                 {"message": "Job ID is required."}, status=status.HTTP_400_BAD_REQUEST
             )
-        job = get_object_or_404(JobListing, pk=job_id)
+        job = get_object_or_404(
+            JobListing.objects.select_related("company__owner").filter(expires_at__gt=timezone.now()), pk=job_id
+        )
 
-        if JobApplication.objects.filter(job=job, candidate=request.user).exists():
-            return Response(
-                {"message": "You have already applied to this job."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(candidate=request.user, job=job)
         subject = "Your application was send successfully."
         message = (
             f"Dear {request.user.username},\n\n Applied for the job {job.job_title} "
         )
         from_email = job.company.owner.email
         recipient_list = [request.user.email]
-        send_mail(subject, message, from_email, recipient_list)
+
+        def save_application():
+            # Forget the application of an attempt that was rolled back.
+            serializer.instance = None
+            with transaction.atomic():
+                serializer.save(candidate=request.user, job=job)
+                enqueue_mail(subject, message, from_email, recipient_list)
+
+        try:
+            # The unique (job, candidate) constraint rejects duplicates, no exists() check needed.
+            retry_on_locked(save_application)
+        except IntegrityError:
+            return Response(
+                {"message": "You have already applied to this job."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def get_queryset(self):
@@ -198,7 +410,7 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
             JobApplication, job=job_obj, candidate=self.request.user
         )
         serializer = JobApplicationSerializer(
-            job_application_obj, data=request.data, partial=True
+            job_application_obj, data=request.data, partial=True, context=self.get_serializer_context()
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -222,10 +434,105 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         )
 
 
-class EmployerJobApplicationViewSet(viewsets.ModelViewSet):
+class ResumeUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Resumable, chunked resume uploads. The completed upload's id is then passed as
+    `resume_upload` when applying, instead of sending the file again.
+    """
+
+    serializer_class = ResumeUploadSerializer
+    permission_classes = [IsAuthenticated, IsCandidate]
+    offset_header = "Upload-Offset"
+    query_budgets = {
+        "create": 2,
+        "retrieve": 2,
+        "partial_update": 4,
+        "complete": 9,
+        "stats": 4,
+    }
+
+    def get_queryset(self):
+        return ResumeUpload.objects.select_related("blob").filter(candidate=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(candidate=self.request.user)
+
+    def upload_response(self, upload, status_code=status.HTTP_200_OK):
+        return Response(
+            self.get_serializer(upload).data,
+            status=status_code,
+            headers={self.offset_header: str(upload.offset)},
+        )
+
+    def partial_update(self, request, pk=None):
+        """
+        Appends a chunk to the upload.
+        - `request`: raw body (any content type) with an `Upload-Offset` header giving the byte
+          position the chunk starts at; it must equal the upload's current `offset`.
+        - **Returns**:
+            - 200 OK with the upload and its new `offset`.
+            - 400 Bad Request if the header is missing or the upload is already complete.
+            - 409 Conflict if the offset does not match; the body carries the offset to resume from.
+            - 413 Request Entity Too Large if the chunk goes past the declared `size`.
+        """
+        upload = self.get_object()
+        try:
+            offset = int(request.headers[self.offset_header])
+        except (KeyError, ValueError):
+            return Response(
+                {"message": f"The {self.offset_header} header is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            write_chunk(upload, offset, request.stream)
+        except UploadOffsetMismatch:
+            return self.upload_response(upload, status.HTTP_409_CONFLICT)
+        except UploadTooLarge:
+            return Response(
+                {"message": f"The upload is limited to its declared size of {upload.size} bytes."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        except UploadError as exc:
+            return Response({"message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self.upload_response(upload)
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request, pk=None):
+        """
+        Finishes the upload: the file is hashed and stored once per distinct content.
+        - **Returns**:
+            - 200 OK with the upload, its `sha256` and whether it was `deduplicated`.
+            - 409 Conflict if bytes are still missing.
+        """
+        upload = self.get_object()
+        try:
+            complete_upload(upload)
+        except UploadIncomplete:
+            return self.upload_response(upload, status.HTTP_409_CONFLICT)
+        return self.upload_response(upload)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsStaff])
+    def stats(self, request):
+        """
+        Reports the resume store's deduplication savings and the chunked upload throughput.
+        - **Returns**:
+            - 200 OK with `stored_bytes`, `referenced_bytes`, `saved_bytes` and upload `throughput_bytes_per_second`.
+            - 403 Forbidden if the user is not an admin.
+        """
+        return Response(get_resume_stats(), status=status.HTTP_200_OK)
+
+
+class EmployerJobApplicationViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = JobApplication.objects.all()
     serializer_class = JobApplicationSerializer
+    pagination_class = JobApplicationPagination
     permission_classes = [IsAuthenticated, IsEmployer]
+    query_budgets = {
+        "change_status": 11,
+        "bulk_change_status": 9,
+        "list_applications": 5,
+        "analytics": 1,
+    }
 
     @action(detail=True, methods=["patch"], url_path="change-status")
     def change_status(self, request, pk=None):
@@ -237,16 +544,18 @@ class EmployerJobApplicationViewSet(viewsets.ModelViewSet):
             - 200 OK if the status is updated successfully.
             - 400 Bad Request if the status is invalid.
             - 404 Not Found if the job application does not exist.
-        - Sends an email to the candidate notifying them of the status change.
+            - 503 Service Unavailable if the database stays locked through the retries.
+        - Queues an email to the candidate notifying them of the status change.
         """
-        job_application = get_object_or_404(JobApplication, pk=pk)
+        job_application = get_object_or_404(
+            JobApplication.objects.select_related("job__company", "candidate"), pk=pk
+        )
         new_status = request.data.get("status")
         if new_status not in ["pending", "accepted", "rejected"]:
             return Response(
                 {"message": "Invalid entry"}, status=status.HTTP_400_BAD_REQUEST
             )
         job_application.status = new_status
-        job_application.save()
         subject = "Status Changed"
         message = (
             f"Dear {request.user.username}, \n\n Your job status changed for the {job_application.job.job_title}, "
@@ -254,7 +563,13 @@ class EmployerJobApplicationViewSet(viewsets.ModelViewSet):
         )
         from_email = request.user.email
         recipient_list = [job_application.candidate.email]
-        send_mail(subject, message, from_email, recipient_list)
+
+        def save_status():
+            with transaction.atomic():
+                job_application.save()
+                enqueue_mail(subject, message, from_email, recipient_list)
+
+        retry_on_locked(save_status)
         return Response(
             {
                 "message": "Status Updated Successfully",
@@ -263,26 +578,167 @@ class EmployerJobApplicationViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
+    @action(detail=False, methods=["post"], url_path="bulk-change-status")
+    def bulk_change_status(self, request):
+        """
+        Changes the status of many applications to the employer's jobs at once.
+            - `request`: the new `status`, and either the application `ids` or a `job` id, optionally
+              narrowed to the applications in `current_status` (e.g. all pending applications of a job).
+        - **Returns**:
+            - 200 OK with the number of applications `updated`; those already in `status` are left alone.
+            - 400 Bad Request if the data is invalid.
+            - 403 Forbidden if an application or the job belongs to another employer.
+            - 404 Not Found if an application or the job does not exist.
+            - 503 Service Unavailable if the database stays locked through the retries.
+        - Ownership is checked in one query and the change is one UPDATE, plus one for the jobs' applicant
+          counters and two for their rollups, however many jobs and days change; the candidates' emails are
+          queued in the same transaction with one INSERT.
+        """
+        serializer = BulkStatusChangeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data["status"]
+        ids = serializer.validated_data.get("ids")
+        company_id = get_company_id(request.user)
+        if ids is None:
+            job_id = serializer.validated_data["job"]
+            job_company_id = JobListing.objects.filter(pk=job_id).values_list("company_id", flat=True).first()
+            if job_company_id is None:
+                raise Http404
+            if job_company_id != company_id:
+                raise PermissionDenied("You do not have permission to change applications for this job.")
+            applications = JobApplication.objects.filter(job_id=job_id)
+            if "current_status" in serializer.validated_data:
+                applications = applications.filter(status=serializer.validated_data["current_status"])
+        else:
+            applications = JobApplication.objects.filter(pk__in=ids)
+
+        def save_statuses():
+            with transaction.atomic():
+                rows = list(applications.values_list(
+                    "status", "job_id", "job__company_id", "candidate__username", "candidate__email",
+                    "job__job_title", "job__company__company_name", "applied_at", "decided_at",
+                ))
+                if ids is not None:
+                    if len(rows) != len(ids):
+                        raise Http404
+                    if any(row[2] != company_id for row in rows):
+                        raise PermissionDenied("You do not have permission to change some of these applications.")
+                changed = [row for row in rows if row[0] != new_status]
+                if not changed:
+                    return 0
+                now = timezone.now()
+                decided_at = now if new_status in DECISIONS else None
+                updated = applications.exclude(status=new_status).update(
+                    status=new_status, decided_at=decided_at, updated_at=now
+                )
+                # The UPDATE bypasses the signals that keep the listings' counters and rollups, so move them here.
+                count_changes = defaultdict(Counter)
+                daily_changes = defaultdict(Counter)
+                for old_status, job_id, *_, applied_at, old_decided_at in changed:
+                    count_changes[job_id][old_status] -= 1
+                    count_changes[job_id][new_status] += 1
+                    add_contribution(daily_changes, job_id, applied_at, old_status, old_decided_at, -1)
+                    add_contribution(daily_changes, job_id, applied_at, new_status, decided_at)
+                apply_count_changes(count_changes)
+                apply_daily_changes(daily_changes)
+                invalidate_company_counts(company_id)
+                enqueue_mass_mail(
+                    (
+                        "Status Changed",
+                        f"Dear {username}, \n\n Your job status changed for the {job_title}, at {company_name} ",
+                        request.user.email,
+                        [email],
+                    )
+                    for _, _, _, username, email, job_title, company_name, _, _ in changed
+                )
+                return updated
+
+        updated = retry_on_locked(save_statuses)
+        return Response(
+            {"message": "Status Updated Successfully", "status": new_status, "updated": updated},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"])
+    def analytics(self, request):
+        """
+        Application analytics of the employer's job listings, read from the daily rollups.
+            - `?start=` and `?end=` (YYYY-MM-DD, inclusive): defaults to the last 30 days, at most
+              `EMPLOYER_ANALYTICS_MAX_DAYS` days.
+            - `?job=`: only this listing.
+        - **Returns**:
+            - 200 OK with the `totals` (applications, accepted, rejected, acceptance rate, average hours
+              to a decision) and the same per listing, with its applications and decisions per day.
+            - 400 Bad Request if the range is invalid.
+            - 404 Not Found if the user does not have an associated company.
+        - One query, whatever the number of applications; applications count on the day they arrived,
+          decisions on the day they were made.
+        """
+        serializer = EmployerAnalyticsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        company_id = get_company_id(request.user)
+        if company_id is None:
+            raise Http404("User does not have an associated company")
+        data = serializer.validated_data
+        return Response(
+            get_employer_analytics(company_id, data["start"], data["end"], data.get("job")),
+            status=status.HTTP_200_OK,
+        )
+
     @action(detail=True, methods=["get"], url_path="applicants")
     def list_applications(self, request, pk=None):
         """
         Lists all applications for a specific job listing.
         - **Arguments**:
             - `request`: The HTTP request.
-            - `pk`: The primary key of the job listing.
+            - `pk`: The primary key of the job listing, live or archived.
+            - `?export=ndjson|csv`: streams every application instead of returning a page.
+            - `?q=`: keyword search over the applicants' resumes, best match first, with a `score` per result.
         - **Returns**:
-            - 200 OK with the serialized list of applications.
+            - 200 OK with a page of serialized applications, or the streamed export.
+            - 400 Bad Request if the export format is unknown.
             - 403 Forbidden if the employer does not own the job listing.
             - 404 Not Found if the job listing does not exist.
         """
-        job = get_object_or_404(JobListing, pk=pk)
-        if job.company.owner != request.user:
+        job = JobListing.objects.select_related("company").filter(pk=pk).first()
+        applications = JobApplication.objects.filter(job_id=pk)
+        if job is None:
+            # Archived applications serialize like live ones.
+            job = get_object_or_404(ArchivedJobListing.objects.select_related("company"), pk=pk)
+            applications = ArchivedJobApplication.objects.filter(job_id=pk)
+        if job.company.owner_id != request.user.id:
             return Response(
                 {
                     "detail": "You do not have permission to view applications for this job."
                 },
                 status=status.HTTP_403_FORBIDDEN,
             )
-        applications = JobApplication.objects.filter(job=job)
-        serializer = JobApplicationSerializer(applications, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        export_format = request.query_params.get("export")
+        if export_format:
+            if export_format not in EXPORT_FORMATS:
+                return Response(
+                    {"message": f"Unknown export format, use one of: {', '.join(EXPORT_FORMATS)}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            return stream_applications(
+                applications.order_by("applied_at", "id"), export_format, f"job-{job.id}-applicants"
+            )
+        query = request.query_params.get("q")
+        if query:
+            return self.search_applications(applications, query)
+        # Newest first, the keyset order, so page numbers stay stable.
+        page = self.paginate_queryset(applications.order_by("-applied_at", "-id"))
+        serializer = JobApplicationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def search_applications(self, applications, query):
+        # Ranked results have no stable key to seek on, so they are paged by number.
+        paginator = PageNumberPagination()
+        ranked = paginator.paginate_queryset(rank_applications(applications, query), self.request, view=self)
+        found = applications.in_bulk([application_id for application_id, _ in ranked])
+        serializer = JobApplicationSerializer()
+        results = [
+            {**serializer.to_representation(found[application_id]), "score": round(score, 4)}
+            for application_id, score in ranked
+        ]
+        return paginator.get_paginated_response(results)
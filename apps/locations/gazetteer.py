@@ -0,0 +1,122 @@
+"""
+Normalization of free-text locations ("Cochin, Kerala", "Bengaluru") against the bundled offline
+gazetteer, `data/gazetteer.csv`: one row per place with its coordinates and `|`-separated aliases.
+
+The file is read once per process. A place's id is the primary key of its `Location` row, so
+resolving a location needs no query; `load_gazetteer` writes the rows.
+"""
+import csv
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from django.utils import timezone
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+
+
+class Place(NamedTuple):
+    id: int
+    name: str
+    region: str
+    country: str
+    latitude: float
+    longitude: float
+
+
+def normalize(text):
+    """Lowercase ASCII words: `"  Thrissur (Kerala)"` -> `"thrissur kerala"`."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def read_gazetteer(path=GAZETTEER_PATH):
+    """Yields `(place, aliases)` for every row of the gazetteer, in file order (most populous first)."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            place = Place(
+                int(row["id"]), row["name"], row["region"], row["country"], float(row["latitude"]), float(row["longitude"])
+            )
+            yield place, [alias for alias in row["aliases"].split("|") if alias]
+
+
+@lru_cache(maxsize=None)
+def get_index():
+    """
+    - **Returns**: `{key: place}` for every name and alias, alone and followed by the region or
+      country code ("kochi", "cochin kerala", "kochi in"); a name shared by several places is
+      resolved to the first one listed.
+    """
+    index = {}
+    for place, aliases in read_gazetteer():
+        for name in (place.name, *aliases):
+            key = normalize(name)
+            for qualified in (key, f"{key} {normalize(place.region)}", f"{key} {normalize(place.country)}"):
+                index.setdefault(qualified, place)
+    return index
+
+
+@lru_cache(maxsize=None)
+def get_places():
+    """`{id: place}` of the gazetteer."""
+    return {place.id: place for place in get_index().values()}
+
+
+def resolve_location(text):
+    """
+    - **Returns**: the `Place` a free-text location names, trying the whole text, then the part
+      before its first comma ("Kochi, India"); None for an unknown or empty location.
+    """
+    if not text:
+        return None
+    index = get_index()
+    for candidate in (text, text.split(",")[0]):
+        place = index.get(normalize(candidate))
+        if place is not None:
+            return place
+    return None
+
+
+def load_gazetteer(model):
+    """
+    Creates or updates a `Location` row per place; `model` is `Location`, or its historical version
+    in a migration.
+    - **Returns**: the number of places.
+    """
+    rows = [model(**place._asdict()) for place, _ in read_gazetteer()]
+    model.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["name", "region", "country", "latitude", "longitude"],
+    )
+    return len(rows)
+
+
+def relocate(queryset, text_field, coordinates=False, touch=False, load=(), batch_size=1000):
+    """
+    Resolves `text_field` of every row of `queryset` again, and saves the `location` (with
+    `coordinates`, also `latitude`/`longitude`) of the rows it changed for, `batch_size` at a time.
+    `touch` dates the changed rows (`updated_at`).
+    - **Returns**: the changed rows, with the columns of `load` loaded too.
+    """
+    fields = ["location_id", *(("latitude", "longitude") if coordinates else ()), *(("updated_at",) if touch else ())]
+    now = timezone.now()
+    changed = []
+    for row in queryset.order_by("pk").only("pk", text_field, *fields, *load).iterator(chunk_size=batch_size):
+        place = resolve_location(getattr(row, text_field))
+        values = {"location_id": place and place.id}
+        if coordinates:
+            values.update(latitude=place and place.latitude, longitude=place and place.longitude)
+        if all(getattr(row, field) == value for field, value in values.items()):
+            continue
+        for field, value in values.items():
+            setattr(row, field, value)
+        if touch:
+            row.updated_at = now
+        changed.append(row)
+    queryset.model.objects.bulk_update(changed, fields, batch_size=batch_size)
+    return changed
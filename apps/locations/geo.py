@@ -0,0 +1,65 @@
+"""
+Radius queries over rows with `latitude`/`longitude` columns: a bounding box on the indexed
+columns narrows the rows down, then the exact haversine distance filters and orders them.
+"""
+import math
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    The smallest latitude/longitude box holding every point within `radius_km` of the centre.
+    - **Returns**: `(min_lat, max_lat, min_lon, max_lon)`; the longitudes may wrap past ±180, and are
+      None when the circle covers every longitude (it reaches a pole).
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat, max_lat = latitude - math.degrees(angle), latitude + math.degrees(angle)
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), None, None
+    spread = math.sin(angle) / math.cos(math.radians(latitude))
+    if spread >= 1:
+        return min_lat, max_lat, None, None
+    delta = math.degrees(math.asin(spread))
+    return min_lat, max_lat, longitude - delta, longitude + delta
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometres."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(a), 1))
+
+
+def distance_km(latitude, longitude, lat_field="latitude", lon_field="longitude"):
+    """The haversine distance of each row from a point, as a database expression."""
+    lat1, lon1 = Value(math.radians(latitude)), Value(math.radians(longitude))
+    lat2, lon2 = Radians(F(lat_field)), Radians(F(lon_field))
+    a = Power(Sin((lat2 - lat1) / 2), 2) + Cos(lat1) * Cos(lat2) * Power(Sin((lon2 - lon1) / 2), 2)
+    # Capped at 1: rounding can push it just past the domain of ASIN for antipodal points.
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(a, output_field=FloatField()), Value(1.0)))
+
+
+def in_bounding_box(latitude, longitude, radius_km, lat_field="latitude", lon_field="longitude"):
+    """A `Q` of the rows in the `bounding_box` of the circle, splitting it at the antimeridian."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    box = Q(**{f"{lat_field}__range": (min_lat, max_lat)})
+    if min_lon is None:
+        return box
+    if min_lon < -180:
+        return box & (Q(**{f"{lon_field}__gte": min_lon + 360}) | Q(**{f"{lon_field}__lte": max_lon}))
+    if max_lon > 180:
+        return box & (Q(**{f"{lon_field}__gte": min_lon}) | Q(**{f"{lon_field}__lte": max_lon - 360}))
+    return box & Q(**{f"{lon_field}__range": (min_lon, max_lon)})
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """The rows of `queryset` within `radius_km` of a point, annotated with their `distance_km`."""
+    return (
+        queryset.filter(in_bounding_box(latitude, longitude, radius_km))
+        .annotate(distance_km=distance_km(latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+    )
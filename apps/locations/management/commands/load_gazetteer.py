@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.locations.gazetteer import load_gazetteer
+from apps.locations.models import Location
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads the bundled gazetteer (apps/locations/data/gazetteer.csv) into the location table, "
+        "updating the places already loaded. Run locate_listings afterwards to resolve listings against it again."
+    )
+
+    def handle(self, *args, **options):
+        count = load_gazetteer(Location)
+        self.stdout.write(self.style.SUCCESS(f"Loaded {count} places."))
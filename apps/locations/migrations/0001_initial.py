@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:03
+
+from django.db import migrations, models
+
+from apps.locations.gazetteer import load_gazetteer
+
+
+def load_places(apps, schema_editor):
+    load_gazetteer(apps.get_model('locations', 'Location'))
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('region', models.CharField(max_length=100)),
+                ('country', models.CharField(max_length=2)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['latitude', 'longitude'], name='location_lat_lon_idx')],
+            },
+        ),
+        migrations.RunPython(load_places, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class Location(models.Model):
+    """
+    A place of the bundled gazetteer (`apps.locations.gazetteer`), loaded by the migrations and
+    `load_gazetteer`; its id is the gazetteer's, so free-text locations resolve without a query.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    region = models.CharField(max_length=100)
+    country = models.CharField(max_length=2)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='location_lat_lon_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name}, {self.region}, {self.country}"
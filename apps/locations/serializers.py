@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from apps.locations.gazetteer import get_places
+
+
+class LocationField(serializers.ReadOnlyField):
+    """A location id (`source='location_id'`) shown as its gazetteer place, read without a query."""
+
+    def to_representation(self, value):
+        place = get_places().get(value)
+        if place is None:
+            return None
+        return {'id': place.id, 'name': place.name, 'region': place.region, 'country': place.country}
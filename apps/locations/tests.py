@@ -0,0 +1,72 @@
+from django.test import TestCase
+
+from apps.company.models import Company
+from apps.locations.gazetteer import get_places, normalize, read_gazetteer, resolve_location
+from apps.locations.geo import bounding_box, haversine_km, within_radius
+from apps.locations.models import Location
+from apps.user.models import User
+
+
+class GazetteerTest(TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize("  Thrissur (Kerala)"), "thrissur kerala")
+        self.assertEqual(normalize("München"), "munchen")
+
+    def test_resolves_names_aliases_and_qualifiers(self):
+        kochi = resolve_location("Kochi")
+        self.assertEqual((kochi.name, kochi.region, kochi.country), ("Kochi", "Kerala", "IN"))
+        for text in ("cochin", "Ernakulam, Kerala", "KOCHI, India", "kochi in", "Kochi (Kerala)"):
+            self.assertEqual(resolve_location(text), kochi, text)
+        self.assertEqual(resolve_location("Bengaluru").name, "Bangalore")
+        self.assertEqual(resolve_location("Thrissur").name, "Trissur")
+        for text in ("", None, "Atlantis", ", Kerala"):
+            self.assertIsNone(resolve_location(text))
+
+    def test_migrations_load_every_place(self):
+        self.assertEqual(Location.objects.count(), len(get_places()))
+        kochi = Location.objects.get(name="Kochi")
+        self.assertEqual((kochi.latitude, kochi.longitude), (9.9312, 76.2673))
+
+    def test_company_location_resolved_on_save(self):
+        owner = User.objects.create_user(username='owner', password='testpassword123', email='o@example.com', roles='employer')
+        company = Company.objects.create(company_name="Ola", company_location="Trivandrum", description="x", owner=owner)
+        self.assertEqual(company.location.name, "Thiruvananthapuram")
+        company.company_location = "Mars"
+        company.save(update_fields=["company_location"])
+        company.refresh_from_db()
+        self.assertIsNone(company.location)
+
+
+class RadiusQueryTest(TestCase):
+    def assertMatchesBruteForce(self, latitude, longitude, radius_km):
+        expected = {
+            place.id for place, _ in read_gazetteer()
+            if haversine_km(latitude, longitude, place.latitude, place.longitude) <= radius_km
+        }
+        found = {location.id: location.distance_km for location in within_radius(Location.objects.all(), latitude, longitude, radius_km)}
+        self.assertEqual(set(found), expected)
+        for location in Location.objects.filter(id__in=found):
+            self.assertAlmostEqual(
+                found[location.id], haversine_km(latitude, longitude, location.latitude, location.longitude), places=6
+            )
+
+    def test_matches_brute_force(self):
+        self.assertMatchesBruteForce(9.9312, 76.2673, 100)
+        self.assertMatchesBruteForce(28.6139, 77.2090, 300)
+        self.assertMatchesBruteForce(51.5074, -0.1278, 1000)
+        self.assertMatchesBruteForce(0, 0, 20000)
+
+    def test_wraps_the_antimeridian(self):
+        # Auckland is at 174.8°E: a circle around 179°W reaches it across the antimeridian.
+        min_lat, max_lat, min_lon, max_lon = bounding_box(-36.8, -179.0, 800)
+        self.assertLess(min_lon, -180)
+        self.assertMatchesBruteForce(-36.8, -179.0, 800)
+        self.assertIn("Auckland", within_radius(Location.objects.all(), -36.8, -179.0, 800).values_list("name", flat=True))
+
+    def test_covers_every_longitude_near_a_pole(self):
+        self.assertEqual(bounding_box(85, 10, 1000)[2:], (None, None))
+        self.assertMatchesBruteForce(85, 10, 4000)
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_km(9.9312, 76.2673, 10.5276, 76.2144), 66.6, delta=0.5)
+        self.assertEqual(haversine_km(10, 20, 10, 20), 0)
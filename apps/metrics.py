@@ -0,0 +1,167 @@
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily
+
+from apps.query_budget import count_queries
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUESTS = Counter(
+    "jobportal_http_requests_total",
+    "HTTP requests by route, method and status code.",
+    ["route", "method", "status"],
+)
+LATENCY = Histogram(
+    "jobportal_http_request_duration_seconds",
+    "HTTP request latency by route and method.",
+    ["route", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "jobportal_db_queries_per_request",
+    "SQL queries run per request, by route.",
+    ["route"],
+    buckets=QUERY_BUCKETS,
+)
+DB_TIME = Histogram(
+    "jobportal_db_time_seconds",
+    "Time spent in SQL per request, by route.",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "jobportal_http_response_size_bytes",
+    "Response body size by route.",
+    ["route"],
+    buckets=SIZE_BUCKETS,
+)
+RESUME_UPLOAD_BYTES = Counter(
+    "jobportal_resume_upload_bytes",
+    "Bytes received by chunked resume uploads.",
+)
+RESUME_UPLOAD_SECONDS = Counter(
+    "jobportal_resume_upload_receive_seconds",
+    "Time spent receiving chunked resume upload bodies; rate(bytes) / rate(seconds) is the throughput.",
+)
+
+METRICS_VIEW_NAME = "metrics"
+
+
+def get_route(request):
+    """
+    Labels a request with its URL name (`job-list`, `employer-change-status`, ...), which keeps
+    label cardinality bounded; unresolved paths share the `unmatched` label.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.view_name:
+        return "unmatched"
+    return match.view_name
+
+
+class MetricsMiddleware:
+    """
+    Records per-route request count, latency, SQL query count, SQL time and response size,
+    and reports the request's timings in a `Server-Timing` header.
+    - Place it first in `MIDDLEWARE` so the latency covers the other middleware.
+    - Async-capable, so it keeps the ASGI views async. Their queries run on other threads'
+      connections and are not counted: async requests report latency and size only.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with count_queries() as queries:
+            response = self.get_response(request)
+        return self.observe(request, response, time.perf_counter() - start, queries)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        return self.observe(request, response, time.perf_counter() - start)
+
+    def observe(self, request, response, duration, queries=None):
+        route = get_route(request)
+        if route == METRICS_VIEW_NAME:
+            return response
+
+        REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+        LATENCY.labels(route, request.method).observe(duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route).observe(len(response.content))
+        if queries is None:
+            response["Server-Timing"] = f"app;dur={duration * 1000:.2f}"
+            return response
+
+        DB_QUERIES.labels(route).observe(queries.count)
+        DB_TIME.labels(route).observe(queries.duration)
+        response["Server-Timing"] = (
+            f"app;dur={duration * 1000:.2f}, "
+            f'db;dur={queries.duration * 1000:.2f};desc="{queries.count} queries"'
+        )
+        return response
+
+
+class ResponseCacheCollector:
+    """Exposes the job response cache hit/miss counters, which live in the Django cache."""
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        from apps.jobs.cache import get_cache_stats
+
+        stats = get_cache_stats()
+        for name in ("hits", "misses"):
+            family = CounterMetricFamily(
+                f"jobportal_response_cache_{name}",
+                f"Job list/detail response cache {name}.",
+            )
+            family.add_metric([], stats[name])
+            yield family
+
+
+CACHE_REGISTRY = CollectorRegistry()
+CACHE_REGISTRY.register(ResponseCacheCollector())
+
+
+def get_registry():
+    """
+    Returns the registry holding the request metrics.
+    - With `PROMETHEUS_MULTIPROC_DIR` set (one directory shared by every worker process), the
+      per-process files are aggregated on each scrape.
+    - Otherwise the in-process default registry is used.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the request, SQL and response cache metrics."""
+    output = generate_latest(get_registry()) + generate_latest(CACHE_REGISTRY)
+    return HttpResponse(output, content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Sends the emails queued in the outbox, in batches over one reused mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the outbox instead of exiting.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when the outbox is empty.")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = drain_outbox(batch_size=options["batch_size"])
+            if any(stats.values()):
+                self.stdout.write(
+                    f"sent={stats['sent']} retried={stats['retried']} dead={stats['dead']}"
+                )
+            if stats["sent"] + stats["retried"] + stats["dead"] >= options["batch_size"]:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
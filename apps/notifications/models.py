@@ -0,0 +1,24 @@
+from django.core.mail import EmailMessage
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundEmail(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'pending'),
+        ('sent', 'sent'),
+        ('dead', 'dead'),
+    ]
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True, null=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    def to_message(self, connection=None):
+        return EmailMessage(self.subject, self.body, self.from_email, self.recipients, connection=connection)
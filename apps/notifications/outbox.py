@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from apps.notifications.models import OutboundEmail
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """
+    Queues an email in the outbox instead of sending it over SMTP.
+    - Takes the same arguments as `django.core.mail.send_mail`.
+    - Call it inside the `transaction.atomic()` block of the write it reports on, so the email
+      is only queued if that write commits.
+    """
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        recipients=list(recipient_list),
+    )
+
+
+def enqueue_mass_mail(datatuple):
+    """
+    Queues several emails with one INSERT, like `django.core.mail.send_mass_mail`.
+    - `datatuple`: `(subject, message, from_email, recipient_list)` tuples.
+    - Call it inside the write's `transaction.atomic()` block, as with `enqueue_mail`.
+    """
+    return OutboundEmail.objects.bulk_create(
+        OutboundEmail(subject=subject, body=message, from_email=from_email, recipients=list(recipient_list))
+        for subject, message, from_email, recipient_list in datatuple
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: `OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)`, capped."""
+    base = getattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 30)
+    cap = getattr(settings, "OUTBOX_RETRY_MAX_SECONDS", 3600)
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def record_failure(email, error, now):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= getattr(settings, "OUTBOX_MAX_ATTEMPTS", 5):
+        email.status = "dead"
+    else:
+        email.next_attempt_at = now + retry_delay(email.attempts)
+
+
+def claim_due_emails(batch_size, now):
+    """
+    Leases up to `batch_size` due emails by pushing their `next_attempt_at` forward by
+    `OUTBOX_LEASE_SECONDS`, so the SMTP work happens outside of any DB transaction and an
+    email left behind by a crashed worker becomes due again once its lease expires.
+    """
+    lease = timedelta(seconds=getattr(settings, "OUTBOX_LEASE_SECONDS", 300))
+    with transaction.atomic():
+        due = OutboundEmail.objects.filter(status="pending", next_attempt_at__lte=now).order_by("id")
+        if db_connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        emails = list(due[:batch_size])
+        OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(next_attempt_at=now + lease)
+    return emails
+
+
+def drain_outbox(batch_size=100):
+    """
+    Sends one batch of due outbox emails over a single mail connection.
+    - Failed emails are rescheduled with exponential backoff and dead-lettered
+      (`status="dead"`) after `OUTBOX_MAX_ATTEMPTS` attempts.
+    - **Returns**: a dict with the number of `sent`, `retried` and `dead` emails.
+    """
+    now = timezone.now()
+    stats = {"sent": 0, "retried": 0, "dead": 0}
+    emails = claim_due_emails(batch_size, now)
+    if not emails:
+        return stats
+
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as exc:
+        for email in emails:
+            record_failure(email, exc, now)
+    else:
+        try:
+            for email in emails:
+                try:
+                    mail_connection.send_messages([email.to_message(connection=mail_connection)])
+                except Exception as exc:
+                    record_failure(email, exc, now)
+                else:
+                    email.status = "sent"
+                    email.sent_at = timezone.now()
+                    email.attempts += 1
+        finally:
+            mail_connection.close()
+
+    for email in emails:
+        if email.status == "sent":
+            stats["sent"] += 1
+        elif email.status == "dead":
+            stats["dead"] += 1
+        else:
+            stats["retried"] += 1
+    OutboundEmail.objects.bulk_update(emails, ["status", "attempts", "next_attempt_at", "last_error", "sent_at"])
+    return stats
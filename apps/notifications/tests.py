@@ -0,0 +1,78 @@
+import tempfile
+from io import StringIO
+from datetime import timedelta
+from pathlib import Path
+from smtplib import SMTPException
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.notifications.models import OutboundEmail
+from apps.notifications.outbox import drain_outbox, enqueue_mail
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException("mail server unavailable")
+
+
+class CountingEmailBackend(LocmemEmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return super().open()
+
+
+class OutboxTests(TestCase):
+    def enqueue(self, count=1):
+        for i in range(count):
+            enqueue_mail("Status Changed", f"message {i}", "employer@example.com", ["candidate@example.com"])
+
+    @override_settings(EMAIL_BACKEND='apps.notifications.tests.CountingEmailBackend')
+    def test_drain_sends_batch_over_one_connection(self):
+        self.enqueue(3)
+        CountingEmailBackend.opened = 0
+
+        stats = drain_outbox(batch_size=10)
+
+        self.assertEqual(stats, {"sent": 3, "retried": 0, "dead": 0})
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        self.assertFalse(OutboundEmail.objects.exclude(status='sent').exists())
+
+    @override_settings(
+        EMAIL_BACKEND='apps.notifications.tests.FailingEmailBackend',
+        OUTBOX_MAX_ATTEMPTS=2,
+        OUTBOX_RETRY_BASE_SECONDS=60,
+    )
+    def test_failures_back_off_then_dead_letter(self):
+        self.enqueue()
+
+        self.assertEqual(drain_outbox(), {"sent": 0, "retried": 1, "dead": 0})
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=50))
+        self.assertIn("unavailable", email.last_error)
+        self.assertEqual(drain_outbox(), {"sent": 0, "retried": 0, "dead": 0})
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(drain_outbox(), {"sent": 0, "retried": 0, "dead": 1})
+        self.assertEqual(OutboundEmail.objects.get().status, 'dead')
+
+    def test_send_queued_mail_command_with_file_backend(self):
+        self.enqueue(2)
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.filebased.EmailBackend',
+                EMAIL_FILE_PATH=directory,
+            ):
+                call_command('send_queued_mail', stdout=StringIO())
+            written = list(Path(directory).iterdir())
+            self.assertEqual(len(written), 1)
+            self.assertEqual(written[0].read_text().count('Subject: Status Changed'), 2)
+        self.assertEqual(OutboundEmail.objects.filter(status='sent').count(), 2)
@@ -0,0 +1,114 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_query_budget(view_class, action):
+    """
+    Returns the number of queries `view_class` declares for `action`, or None.
+    - Views declare budgets with a `query_budgets = {"list": 3, ...}` dict, counting every query
+      of the request, authentication included.
+    """
+    return getattr(view_class, "query_budgets", {}).get(action)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+
+
+@contextmanager
+def count_queries():
+    """Counts the queries run on every database alias inside the block, and the time spent in them."""
+    counter = QueryCounter()
+    with wrap_all_connections(counter):
+        yield counter
+
+
+@contextmanager
+def wrap_all_connections(wrapper):
+    aliases = list(connections)
+    for alias in aliases:
+        connections[alias].execute_wrappers.append(wrapper)
+    try:
+        yield
+    finally:
+        for alias in aliases:
+            connections[alias].execute_wrappers.remove(wrapper)
+
+
+class QueryBudgetTestMixin:
+    """
+    Test case helper: `with self.assertWithinQueryBudget(JobViewSet, "list"): ...` fails the
+    test when the block runs more queries than the view declares for that action.
+    """
+
+    @contextmanager
+    def assertWithinQueryBudget(self, view_class, action):
+        budget = get_query_budget(view_class, action)
+        if budget is None:
+            self.fail(f"{view_class.__name__} declares no query budget for {action!r}.")
+        with count_queries() as counter:
+            yield counter
+        if counter.count > budget:
+            self.fail(
+                f"{view_class.__name__}.{action} ran {counter.count} queries, budget is {budget}."
+            )
+
+
+class QueryBudgetMiddleware:
+    """
+    Development middleware that checks every DRF request against its view's query budget.
+    - Only active when `DEBUG` is on.
+    - `QUERY_BUDGET_MODE = "warn"` logs a warning, `"raise"` raises `QueryBudgetExceeded`.
+    - Adds an `X-Query-Count` header to every response.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as counter:
+            response = self.get_response(request)
+        response["X-Query-Count"] = str(counter.count)
+        budget_check = getattr(request, "_query_budget", None)
+        if budget_check is not None:
+            view_name, budget = budget_check
+            if counter.count > budget:
+                message = f"{view_name} ran {counter.count} queries, budget is {budget}."
+                if getattr(settings, "QUERY_BUDGET_MODE", "warn") == "raise":
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None)
+        actions = getattr(view_func, "actions", None) or {}
+        action = actions.get(request.method.lower())
+        if view_class is None or action is None:
+            return None
+        budget = get_query_budget(view_class, action)
+        if budget is not None:
+            request._query_budget = (f"{view_class.__name__}.{action}", budget)
+        return None
@@ -0,0 +1,45 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from apps.replicas.models import Heartbeat
+from apps.replicas.router import get_replicas
+
+
+def copy_sqlite_replicas():
+    """Copies the primary SQLite database over every replica file, with SQLite's online backup."""
+    primary = connections[DEFAULT_DB_ALIAS]
+    primary.ensure_connection()
+    for alias in get_replicas():
+        replica = connections[alias]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("--copy-sqlite needs SQLite for the primary and every replica.")
+        target = sqlite3.connect(replica.settings_dict["NAME"])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes the replication heartbeat on the primary, which replicas are health-checked against. "
+        "With SQLite files standing in for replicas, --copy-sqlite also refreshes them from the primary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep beating instead of exiting.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between beats.")
+        parser.add_argument("--copy-sqlite", action="store_true", help="Copy the primary over the replica files after each beat.")
+
+    def handle(self, *args, **options):
+        while True:
+            Heartbeat.objects.using(DEFAULT_DB_ALIAS).update_or_create(pk=1, defaults={"beat_at": timezone.now()})
+            if options["copy_sqlite"]:
+                copy_sqlite_replicas()
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
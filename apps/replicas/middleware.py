@@ -0,0 +1,63 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from apps.replicas.router import begin_request, end_request, get_replicas, get_routing
+
+STICKY_COOKIE = "db_primary"
+SAFE_METHODS = ("GET", "HEAD")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets `ReplicaRouter` send the reads of safe list/retrieve requests to a replica.
+    - The view's action must be in `REPLICA_READ_ACTIONS`: `view.actions` of DRF viewsets, the
+      `action` attribute of the async views.
+    - A request that writes gets a `db_primary` cookie for `REPLICA_STICKY_SECONDS`; while the
+      client sends it back its reads stay on the primary, so it reads its own writes even when
+      the replicas lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = begin_request(sticky=STICKY_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self.set_sticky_cookie(state, response)
+
+    async def __acall__(self, request):
+        state, token = begin_request(sticky=STICKY_COOKIE in request.COOKIES)
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self.set_sticky_cookie(state, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = get_routing()
+        if state is None or request.method not in SAFE_METHODS or not get_replicas():
+            return None
+        actions = getattr(view_func, "actions", None)
+        if actions is not None:
+            action = actions.get(request.method.lower())
+        else:
+            action = getattr(getattr(view_func, "view_class", None), "action", None)
+        state.use_replicas = action in getattr(settings, "REPLICA_READ_ACTIONS", ("list", "retrieve"))
+        return None
+
+    def set_sticky_cookie(self, state, response):
+        if state.wrote and get_replicas():
+            response.set_cookie(
+                STICKY_COOKIE, "1", max_age=getattr(settings, "REPLICA_STICKY_SECONDS", 10), httponly=True, samesite="Lax"
+            )
+        return response
@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class Heartbeat(models.Model):
+    """
+    Single row the primary updates every second (`python manage.py replica_heartbeat --loop`);
+    a replica's copy of it tells how far behind the primary it is.
+    """
+
+    beat_at = models.DateTimeField()
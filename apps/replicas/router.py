@@ -0,0 +1,150 @@
+"""
+Read replica routing.
+
+`ReplicaRoutingMiddleware` marks the requests whose reads may go to a replica (safe list and
+retrieve requests, see `REPLICA_READ_ACTIONS`) in a context variable; `ReplicaRouter` then
+sends their ORM reads to one healthy replica of `DATABASE_REPLICAS`, and everything else,
+every write included, to `default`.
+"""
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+from apps.replicas.models import Heartbeat
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+def get_replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+class ReadRouting:
+    """Routing state of one request, shared by every thread the request's queries run on."""
+
+    def __init__(self, sticky=False):
+        # Reads go to the primary until the view turns replicas on, and for good once the request writes.
+        self.sticky = sticky
+        self.use_replicas = False
+        self.wrote = False
+        self.replica = None
+
+    def read_alias(self):
+        if self.sticky or self.wrote or not self.use_replicas or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if self.replica is None:
+            # One replica for the whole request, so a page and its COUNT see the same data.
+            healthy = replica_health.healthy_replicas()
+            self.replica = random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+        return self.replica
+
+
+def begin_request(sticky=False):
+    """Starts routing the current request's queries; pass the token to `end_request`."""
+    state = ReadRouting(sticky)
+    return state, _routing.set(state)
+
+
+def end_request(token):
+    _routing.reset(token)
+
+
+def get_routing():
+    return _routing.get()
+
+
+def read_from_replica():
+    """Whether the current request has read from a replica, which may lag behind the primary."""
+    state = _routing.get()
+    return state is not None and state.replica not in (None, DEFAULT_DB_ALIAS) and not state.wrote
+
+
+class ReplicaHealth:
+    """
+    Per-process health of the replicas, rechecked every `REPLICA_HEALTH_CHECK_INTERVAL` seconds.
+    - A replica is healthy when it answers and its heartbeat is at most `REPLICA_MAX_LAG_SECONDS` old.
+    - Without a heartbeat writer running every replica looks lagging, so reads stay on the primary.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.status = {}
+
+    def healthy_replicas(self):
+        interval = getattr(settings, "REPLICA_HEALTH_CHECK_INTERVAL", 5)
+        healthy = []
+        for alias in get_replicas():
+            now = time.monotonic()
+            with self.lock:
+                status = self.status.get(alias)
+                due = status is None or now - status["checked_at"] >= interval
+                if due:
+                    # Recorded before probing, so concurrent requests keep the previous result meanwhile.
+                    self.status[alias] = {"healthy": False, "lag": None, **(status or {}), "checked_at": now}
+            if due:
+                result = self.check(alias)
+                with self.lock:
+                    self.status[alias].update(result)
+            if self.status[alias]["healthy"]:
+                healthy.append(alias)
+        return healthy
+
+    def check(self, alias):
+        try:
+            beat_at = Heartbeat.objects.using(alias).values_list("beat_at", flat=True).first()
+        except DatabaseError:
+            return {"healthy": False, "lag": None}
+        if beat_at is None:
+            return {"healthy": False, "lag": None}
+        lag = max(0.0, (timezone.now() - beat_at).total_seconds())
+        return {"healthy": lag <= getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5), "lag": lag}
+
+    def get_status(self):
+        """Returns `{alias: {"healthy", "lag"}}` as of the last check of each replica."""
+        with self.lock:
+            return {alias: {"healthy": status["healthy"], "lag": status["lag"]} for alias, status in self.status.items()}
+
+    def clear(self):
+        with self.lock:
+            self.status.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of requests routed to replicas to one healthy replica, and all writes to `default`.
+    - A write turns replicas off for the rest of the request (read-your-writes); the middleware then
+      keeps the client on the primary for `REPLICA_STICKY_SECONDS` with a cookie.
+    - Reads inside a transaction on `default` stay on it.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None:
+            return None
+        return state.read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        # Explicit, so an instance read from a replica is still saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replicas():
+            return False
+        return None
@@ -0,0 +1,155 @@
+import os
+import tempfile
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.company.models import Company
+from apps.jobs.cache import get_cache_timeout
+from apps.jobs.models import JobListing
+from apps.replicas.management.commands.replica_heartbeat import copy_sqlite_replicas
+from apps.replicas.models import Heartbeat
+from apps.replicas.router import ReplicaRouter, begin_request, end_request, replica_health
+from apps.user.models import User
+
+
+REPLICAS = ["replica1", "replica2"]
+
+
+class ReplicaRoutingTest(TransactionTestCase):
+    """Runs against SQLite files standing in for replicas, empty until the primary is copied over them."""
+
+    # Keeps the gazetteer places loaded by the migrations across the table flushes.
+    serialized_rollback = True
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for alias in REPLICAS:
+            settings_dict = {**connections[DEFAULT_DB_ALIAS].settings_dict}
+            # Created outside settings.DATABASES, so the test runner neither sets them up nor blocks them.
+            connections[alias] = load_backend(settings_dict["ENGINE"]).DatabaseWrapper(settings_dict, alias)
+
+    @classmethod
+    def tearDownClass(cls):
+        for alias in REPLICAS:
+            del connections[alias]
+        super().tearDownClass()
+
+    def use_replica_files(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for alias in REPLICAS:
+            connections[alias].close()
+            connections[alias].settings_dict["NAME"] = os.path.join(directory.name, f"{alias}.sqlite3")
+            self.addCleanup(connections[alias].close)
+
+    def setUp(self):
+        self.use_replica_files()
+        cache.clear()
+        replica_health.clear()
+        self.addCleanup(replica_health.clear)
+        self.employer = User.objects.create_user(
+            username='testuser',
+            password='testpassword123',
+            email='testuser@example.com',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            password='testpassword123',
+            email='testcandidate@example.com',
+            roles='candidate'
+        )
+        self.company = Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+        self.job = self.create_job("python developer")
+        self.client = APIClient()
+
+    def create_job(self, title):
+        return JobListing.objects.create(
+            company=self.company, job_title=title, job_description="x", job_location="Kochi", salary="1"
+        )
+
+    def list_titles(self, user):
+        cache.clear()
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('job-list'))
+        return [job['job_title'] for job in response.data['results']]
+
+    def test_list_and_retrieve_read_from_replica(self):
+        with self.settings(DATABASE_REPLICAS=REPLICAS):
+            call_command('replica_heartbeat', copy_sqlite=True)
+            # Only on the primary: a replica that has not caught up yet.
+            new_job = self.create_job("java developer")
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary_queries:
+                self.assertEqual(self.list_titles(self.candidate), ["python developer"])
+                response = self.client.get(reverse('job-detail', args=[new_job.id]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(len(primary_queries), 0)
+            self.assertEqual(set(replica_health.get_status()), set(REPLICAS))
+
+            # Other actions, and the writes, go to the primary.
+            response = self.client.get(reverse('job-recommended'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("java developer", [job['job_title'] for job in response.data['results']])
+
+    def test_write_makes_the_client_read_from_the_primary(self):
+        with self.settings(DATABASE_REPLICAS=REPLICAS[:1]):
+            call_command('replica_heartbeat', copy_sqlite=True)
+            self.client.force_authenticate(user=self.employer)
+            response = self.client.patch(
+                reverse('job-detail', args=[self.job.id]), {'job_title': 'rust developer'}, format='json'
+            )
+            self.assertEqual(response.cookies['db_primary']['max-age'], 10)
+            self.assertEqual(self.list_titles(self.employer), ["rust developer"])
+
+            self.client.cookies.clear()
+            self.assertEqual(self.list_titles(self.employer), ["python developer"])
+
+    def test_lagging_or_broken_replica_is_skipped(self):
+        lagging, broken = REPLICAS
+        with self.settings(DATABASE_REPLICAS=REPLICAS):
+            Heartbeat.objects.create(pk=1, beat_at=timezone.now() - timedelta(seconds=60))
+            copy_sqlite_replicas()
+            os.remove(connections[broken].settings_dict["NAME"])
+            os.mkdir(connections[broken].settings_dict["NAME"])
+            self.create_job("java developer")
+            self.assertCountEqual(self.list_titles(self.candidate), ["java developer", "python developer"])
+            health = replica_health.get_status()
+            self.assertFalse(health[lagging]['healthy'])
+            self.assertGreaterEqual(health[lagging]['lag'], 60)
+            self.assertEqual(health[broken], {'healthy': False, 'lag': None})
+
+    def test_writes_go_to_the_primary(self):
+        router = ReplicaRouter()
+        replica = REPLICAS[0]
+        with self.settings(DATABASE_REPLICAS=[replica]):
+            call_command('replica_heartbeat', copy_sqlite=True)
+            state, token = begin_request()
+            try:
+                state.use_replicas = True
+                self.assertEqual(router.db_for_read(JobListing), replica)
+                # Responses read from a replica are cached no longer than it may lag.
+                self.assertEqual(get_cache_timeout(), 5)
+                job = JobListing.objects.get(pk=self.job.pk)
+                job.job_title = "go developer"
+                job.save()
+                self.assertEqual(router.db_for_read(JobListing), DEFAULT_DB_ALIAS)
+                self.assertEqual(get_cache_timeout(), 300)
+            finally:
+                end_request(token)
+        self.assertEqual(JobListing.objects.get(pk=self.job.pk).job_title, "go developer")
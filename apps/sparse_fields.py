@@ -0,0 +1,131 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldset:
+    """
+    The fields a client asked for with `?fields=` (only these) or `?omit=` (all but these), as a tree:
+    `company.company_name` names a field of the nested `company` serializer.
+    """
+
+    def __init__(self, param, names):
+        self.param = param
+        self.include = param == "fields"
+        self.tree = {}
+        for name in names:
+            node = self.tree
+            for part in name.split("."):
+                node = node.setdefault(part, {})
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        - **Returns**: the fieldset of the request, or None without `?fields=`/`?omit=`.
+        - Raises `ValidationError` when both are sent.
+        """
+        sent = [param for param in ("fields", "omit") if param in request.query_params]
+        if not sent:
+            return None
+        if len(sent) > 1:
+            raise ValidationError("Send either `fields` or `omit`.")
+        names = [name.strip() for name in request.query_params[sent[0]].split(",") if name.strip()]
+        return cls(sent[0], names)
+
+    def prune(self, fields, tree=None, prefix=""):
+        """Removes the fields left out from a serializer's `fields`, recursing into nested serializers."""
+        tree = self.tree if tree is None else tree
+        unknown = [f"{prefix}{name}" for name in tree if name not in fields]
+        if unknown:
+            raise ValidationError({self.param: [f"Unknown field: {name}." for name in unknown]})
+        for name in list(fields):
+            subtree = tree.get(name)
+            if subtree:
+                if not hasattr(fields[name], "fields"):
+                    raise ValidationError({self.param: [f"{prefix}{name} has no nested fields."]})
+                self.prune(fields[name].fields, subtree, f"{prefix}{name}.")
+            elif (subtree is None) == self.include:
+                fields.pop(name)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Prunes a model serializer to the `sparse_fieldset` of its context, and names the columns the
+    fields left read (`get_columns`).
+    - `Meta.field_columns` maps fields that are not model fields (e.g. method fields) to the columns they read.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Nested serializers are built without a context: the root prunes them.
+        sparse_fieldset = self._context.get("sparse_fieldset")
+        if sparse_fieldset is not None:
+            sparse_fieldset.prune(self.fields)
+
+    def get_columns(self):
+        """
+        - **Returns**: the model columns (`company__company_name` for nested ones) read by the
+          serializer's fields, or None when a field reads something that is not a known column.
+        """
+        model = self.Meta.model
+        field_columns = getattr(self.Meta, "field_columns", {})
+        columns = []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in field_columns:
+                columns += field_columns[name]
+                continue
+            if isinstance(field, SparseFieldsetSerializerMixin):
+                nested = field.get_columns()
+                if nested is None:
+                    return None
+                columns += [field.source, *(f"{field.source}__{column}" for column in nested)]
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+            columns.append(field.source)
+        return columns
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=` / `?omit=` for the `list` and `retrieve` actions of a view whose `serializer_class`
+    uses `SparseFieldsetSerializerMixin`.
+    - The serializer is pruned to the fields asked for, and the queryset loads only the columns they
+      read (`narrow_queryset`, with `only()`), so the others are never fetched; unknown fields answer 400.
+    - `sparse_fieldset_columns` are always loaded, e.g. the columns a keyset cursor is built from.
+    """
+
+    sparse_fieldset_actions = ("list", "retrieve")
+    sparse_fieldset_columns = ()
+
+    def get_sparse_fieldset(self):
+        if getattr(self, "action", None) not in self.sparse_fieldset_actions:
+            return None
+        if not hasattr(self, "_sparse_fieldset"):
+            self._sparse_fieldset = SparseFieldset.from_request(self.request)
+        return self._sparse_fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["sparse_fieldset"] = self.get_sparse_fieldset()
+        return context
+
+    def narrow_queryset(self, queryset):
+        """`queryset` loading only the columns of the requested fields; `get_queryset` returns it."""
+        if self.get_sparse_fieldset() is None:
+            return queryset
+        columns = self.serializer_class(context=self.get_serializer_context()).get_columns()
+        if columns is None:
+            return queryset
+        columns += self.sparse_fieldset_columns
+        # A relation left out of `only()` cannot be joined by `select_related()` either.
+        related = {column.split("__")[0] for column in columns if "__" in column}
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
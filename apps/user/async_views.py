@@ -0,0 +1,32 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.async_views import AsyncAPIView
+from apps.user.authentication import aissue_tokens, averify_credentials
+from apps.user.serializers import UserLoginSerializer
+
+
+class AsyncLoginView(AsyncAPIView):
+    """Async `POST /user/user/login/`, see `UserViewSet.login`."""
+
+    action = "login"
+    query_budgets = {"login": 2}
+
+    async def post(self, request):
+        serializer = UserLoginSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        user = await averify_credentials(
+            serializer.validated_data["username"], serializer.validated_data["password"]
+        )
+        if user is None:
+            return Response(
+                {"message": "Invalid Login Credentials"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        refresh = await aissue_tokens(user)
+        response_data = {
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+        }
+        return Response({"message": "Success", "data": response_data}, status=status.HTTP_200_OK)
@@ -0,0 +1,294 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import OuterRef, Subquery
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.company.models import Company
+from apps.user.models import User
+
+# Fields of a user carried in the token claims and the in-process cache; the others
+# (password, ...) stay deferred and are loaded on first access.
+USER_FIELDS = ("id", "username", "email", "roles", "is_staff", "is_active")
+VERSION_CLAIM = "auth_version"
+MISSING = object()
+# Cache backends whose entries only the writing process sees.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_is_shared():
+    """
+    Whether the default cache, which holds the auth versions, is shared by every process:
+    `AUTH_SHARED_CACHE`, or when unset, whether its backend is not process-local.
+    """
+    shared = getattr(settings, "AUTH_SHARED_CACHE", None)
+    if shared is None:
+        shared = settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES
+    return shared
+
+
+def version_key(user_id):
+    return f"user:auth-version:{user_id}"
+
+
+def get_auth_version(user_id):
+    """
+    Returns the version of a user's auth record, bumped whenever the user or their company changes.
+    A missing counter starts at the current time, so it never matches a version issued before.
+    """
+    return cache.get_or_set(version_key(user_id), time.time_ns, None)
+
+
+async def aget_auth_version(user_id):
+    return await cache.aget_or_set(version_key(user_id), time.time_ns, None)
+
+
+def bump_auth_version(user_id):
+    try:
+        cache.incr(version_key(user_id))
+    except ValueError:
+        cache.set(version_key(user_id), time.time_ns(), None)
+
+
+def user_record_query(user_id):
+    """
+    Selects the cached fields of a user and the id of the company they own, in one query.
+    - Always on the primary: the record is cached under the auth version a write just bumped,
+      so it must not come from a replica that has not seen that write yet.
+    """
+    owned_company = Company.objects.filter(owner=OuterRef("pk")).values("id")[:1]
+    return (
+        User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id)
+        .annotate(owned_company_id=Subquery(owned_company))
+        .values(*USER_FIELDS, "owned_company_id")
+    )
+
+
+def load_user_record(user_id):
+    return user_record_query(user_id).first()
+
+
+async def aload_user_record(user_id):
+    return await user_record_query(user_id).afirst()
+
+
+def build_user(record, company_id):
+    """
+    Returns a `User` holding only `USER_FIELDS`, without a query; the other fields are deferred,
+    so `save()` on it only writes the loaded fields.
+    """
+    # `from_db` takes the values in the model's field order.
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in USER_FIELDS]
+    user = User.from_db(DEFAULT_DB_ALIAS, field_names, [record[name] for name in field_names])
+    user.company_id = company_id
+    return user
+
+
+def get_company_id(user):
+    """
+    Returns the id of the company an employer owns, or None.
+    - Users authenticated by `ClaimsJWTAuthentication` already carry it; others cost one query,
+      remembered on the user object.
+    """
+    company_id = getattr(user, "company_id", MISSING)
+    if company_id is MISSING:
+        company_id = Company.objects.filter(owner=user).values_list("id", flat=True).first()
+        user.company_id = company_id
+    return company_id
+
+
+async def aget_company_id(user):
+    company_id = getattr(user, "company_id", MISSING)
+    if company_id is MISSING:
+        company_id = await Company.objects.filter(owner=user).values_list("id", flat=True).afirst()
+        user.company_id = company_id
+    return company_id
+
+
+class UserRecordCache:
+    """Thread-safe LRU of user records keyed by user id, each stored with its auth version."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.records = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self.lock:
+            entry = self.records.get(user_id)
+            if entry is None or entry[0] != version:
+                return None
+            self.records.move_to_end(user_id)
+            return entry[1]
+
+    def set(self, user_id, version, record):
+        with self.lock:
+            self.records[user_id] = (version, record)
+            self.records.move_to_end(user_id)
+            while len(self.records) > self.maxsize:
+                self.records.popitem(last=False)
+
+    def discard(self, user_id):
+        with self.lock:
+            self.records.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+
+user_records = UserRecordCache(getattr(settings, "AUTH_USER_CACHE_SIZE", 1024))
+
+
+def set_user_claims(token, user, version, company_id):
+    token[VERSION_CLAIM] = version
+    for field in ("username", "email", "roles", "is_staff"):
+        token[field] = getattr(user, field)
+    token["company_id"] = company_id
+    return token
+
+
+def add_user_claims(token, user):
+    """Signs the user's role, staff flag, company id and current auth version into `token`."""
+    # The version is read first: a change racing with the login then makes the claims stale, not wrong.
+    version = get_auth_version(user.id)
+    return set_user_claims(token, user, version, get_company_id(user))
+
+
+def issue_tokens(user):
+    """Returns a refresh token carrying the user claims; its access token inherits them."""
+    return add_user_claims(RefreshToken.for_user(user), user)
+
+
+async def aissue_tokens(user):
+    version = await aget_auth_version(user.id)
+    company_id = await aget_company_id(user)
+    return set_user_claims(RefreshToken.for_user(user), user, version, company_id)
+
+
+# Password hashing is CPU bound; hashlib releases the GIL while it runs, so a few threads
+# hash in parallel without holding up the event loop.
+password_hashers = ThreadPoolExecutor(
+    max_workers=getattr(settings, "PASSWORD_HASHING_WORKERS", 4), thread_name_prefix="password-hashing"
+)
+
+
+async def averify_credentials(username, password):
+    """
+    Async counterpart of `authenticate()` with the default `ModelBackend`: the user is loaded
+    with the async ORM and the password hashed on `password_hashers`.
+    - Like `ModelBackend`, an unknown username still costs one hash, and an outdated hash is upgraded.
+    - **Returns**: the active user matching the credentials, or None.
+    """
+    loop = asyncio.get_running_loop()
+    user = await User.objects.filter(**{User.USERNAME_FIELD: username}).afirst()
+    if user is None:
+        await loop.run_in_executor(password_hashers, make_password, password)
+        return None
+    is_correct, must_update = await loop.run_in_executor(password_hashers, verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+    if must_update:
+        user.password = await loop.run_in_executor(password_hashers, make_password, password)
+        await user.asave(update_fields=["password"])
+    return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that does not query the database for the user.
+    - Tokens issued while the user's auth version is unchanged are trusted as they are: the user
+      is built from their claims.
+    - Otherwise (the user or their company changed since login, or the token has no claims) the
+      record is read from a per-process LRU, or loaded with one query and cached there.
+    - Every user or company write bumps the version in the shared cache, so stale claims and
+      cache entries of every process are ignored from the next request.
+    - Without a shared cache (`cache_is_shared`) a write in one process would not reach the others,
+      so neither the claims nor the LRU are trusted: every request loads the user with one query.
+    """
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        if not cache_is_shared():
+            return self.user_from_record(self.require_record(load_user_record(user_id)))
+        version = get_auth_version(user_id)
+        if validated_token.get(VERSION_CLAIM) == version:
+            return self.user_from_claims(user_id, validated_token)
+        record = user_records.get(user_id, version)
+        if record is None:
+            record = self.cache_record(user_id, version, load_user_record(user_id))
+        return self.user_from_record(record)
+
+    async def aauthenticate(self, request):
+        """`authenticate()` for async views: the version and any user record are read without blocking."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        if not cache_is_shared():
+            return self.user_from_record(self.require_record(await aload_user_record(user_id)))
+        version = await aget_auth_version(user_id)
+        if validated_token.get(VERSION_CLAIM) == version:
+            return self.user_from_claims(user_id, validated_token)
+        record = user_records.get(user_id, version)
+        if record is None:
+            record = self.cache_record(user_id, version, await aload_user_record(user_id))
+        return self.user_from_record(record)
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+    @staticmethod
+    def user_from_claims(user_id, validated_token):
+        record = {field: validated_token.get(field) for field in USER_FIELDS}
+        record.update(id=user_id, is_active=True)
+        return build_user(record, validated_token.get("company_id"))
+
+    @staticmethod
+    def require_record(record):
+        if record is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        return record
+
+    @classmethod
+    def cache_record(cls, user_id, version, record):
+        user_records.set(user_id, version, cls.require_record(record))
+        return record
+
+    @staticmethod
+    def user_from_record(record):
+        if not record["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return build_user(record, record["owned_company_id"])
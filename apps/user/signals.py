@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.company.models import Company
+from apps.user.authentication import bump_auth_version, user_records
+from apps.user.models import User
+
+
+def invalidate_user(user_id):
+    bump_auth_version(user_id)
+    user_records.discard(user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_changed_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_owner(sender, instance, **kwargs):
+    invalidate_user(instance.owner_id)
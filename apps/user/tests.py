@@ -1,8 +1,20 @@
-from django.test import TestCase
+import threading
 
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.hashers import verify_password
+from django.test import TestCase, override_settings
+
+from django.core.cache import cache
 from django.urls import reverse
+from unittest import mock
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.company.models import Company
+from apps.jobs.models import JobListing
+from .authentication import user_records
 from .models import User
 
 
@@ -109,4 +121,132 @@ class UserLoginTests(APITestCase):
         response = self.client.post(self.url, data, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('password', response.data)
\ No newline at end of file
+        self.assertIn('password', response.data)
+
+
+# One test process: its cache is shared, so the token claims are trusted.
+@override_settings(AUTH_SHARED_CACHE=True)
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_records.clear()
+        self.employer = User.objects.create_user(
+            username='testuser',
+            email='testuser@example.com',
+            password='testpassword123',
+            roles='employer'
+        )
+        self.candidate = User.objects.create_user(
+            username='testcandidate',
+            email='testcandidate@example.com',
+            password='testpassword123',
+            roles='candidate'
+        )
+
+    def login(self, username):
+        response = self.client.post(
+            reverse('user-login'), {'username': username, 'password': 'testpassword123'}, format='json'
+        )
+        access = response.data['data']['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return AccessToken(access)
+
+    def create_company(self):
+        return Company.objects.create(
+            company_name="Ola",
+            company_location="Trissur",
+            description="Commpany jkjkfjkdbasjdjckdjkdjed huwhdiuehduehdu",
+            owner=self.employer
+        )
+
+    def test_login_issues_role_and_company_claims(self):
+        company = self.create_company()
+        token = self.login('testuser')
+        self.assertEqual(token['roles'], 'employer')
+        self.assertFalse(token['is_staff'])
+        self.assertEqual(token['company_id'], company.id)
+
+    def test_token_endpoint_issues_claims(self):
+        response = self.client.post(
+            reverse('token_obtain_pair'), {'username': 'testcandidate', 'password': 'testpassword123'}, format='json'
+        )
+        self.assertEqual(AccessToken(response.data['access'])['roles'], 'candidate')
+
+    def test_hot_endpoints_run_no_auth_queries(self):
+        JobListing.objects.create(
+            company=self.create_company(), job_title="developer", job_description="x", job_location="Kollam", salary="1"
+        )
+        self.login('testcandidate')
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('user-get-user-role'))
+        self.assertEqual(response.data, {'role': 'candidate', 'name': 'testcandidate'})
+        with self.assertNumQueries(2):
+            # COUNT and page only.
+            self.client.get(reverse('job-list'))
+
+    def test_stale_claims_are_reloaded_once(self):
+        self.login('testuser')
+        company = self.create_company()
+        JobListing.objects.create(
+            company=company, job_title="developer", job_description="x", job_location="Kollam", salary="1"
+        )
+        # The token says "no company": the user is loaded once, then served from the in-process cache.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('job-list'))
+        self.assertEqual(response.data['count'], 1)
+        with self.assertNumQueries(0):
+            self.client.get(reverse('job-list'))
+
+    def test_deactivated_user_is_rejected(self):
+        self.login('testcandidate')
+        self.assertEqual(self.client.get(reverse('user-get-user-role')).status_code, status.HTTP_200_OK)
+        self.candidate.is_active = False
+        self.candidate.save()
+        self.assertEqual(self.client.get(reverse('user-get-user-role')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_SHARED_CACHE=None)
+    def test_process_local_cache_loads_the_user_every_request(self):
+        self.login('testcandidate')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(reverse('user-get-user-role')).status_code, status.HTTP_200_OK)
+        # Written by another process: no version bump reaches this one.
+        User.objects.filter(pk=self.candidate.pk).update(is_active=False)
+        self.assertEqual(self.client.get(reverse('user-get-user-role')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(ROOT_URLCONF=settings.ASGI_URLCONF)
+class AsyncLoginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='testuser@example.com',
+            password='testpassword123',
+            roles='candidate'
+        )
+
+    def login(self, data):
+        return async_to_sync(self.async_client.post)(reverse('user-login'), data, content_type='application/json')
+
+    def test_login_hashes_off_the_event_loop(self):
+        threads = []
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return verify_password(*args, **kwargs)
+
+        with mock.patch('apps.user.authentication.verify_password', side_effect=record_thread):
+            response = self.login({'username': 'testuser', 'password': 'testpassword123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.json()['data']['access'])['roles'], 'candidate')
+        self.assertTrue(threads[0].startswith('password-hashing'))
+
+    def test_login_fail(self):
+        response = self.login({'username': 'testuser', 'password': 'wrongpassword'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json(), {'message': 'Invalid Login Credentials'})
+        response = self.login({'username': 'nobody', 'password': 'testpassword123'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.login({'username': 'testuser'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.json())
@@ -4,8 +4,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.user.authentication import issue_tokens
 from apps.user.models import User
 from apps.user.serializers import UserCreateSerializer, UserLoginSerializer
 
@@ -13,6 +13,11 @@ from apps.user.serializers import UserCreateSerializer, UserLoginSerializer
 class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserCreateSerializer
     queryset = User.objects.all()
+    query_budgets = {
+        "register": 3,
+        "login": 2,
+        "get_user_role": 1,
+    }
 
     @action(detail=False, methods=["post"], url_path="register")
     def register(self, request):
@@ -39,7 +44,8 @@ class UserViewSet(viewsets.ModelViewSet):
         Authenticates a user with valid login credentials (username and password).
         `request`: The HTTP request containing user details (username, password).
         **Return**:
-        - 200 OK: Returns JWT access and refresh tokens upon successful login.
+        - 200 OK: Returns JWT access and refresh tokens upon successful login; they carry the user's
+          role, staff flag and company id as claims.
         - 401 Unauthorized: If the login credentials are invalid.
         - 400 Bad Request: If the input data does not pass validation.
         """
@@ -55,7 +61,7 @@ class UserViewSet(viewsets.ModelViewSet):
                     {"message": "Invalid Login Credentials"},
                     status=status.HTTP_401_UNAUTHORIZED,
                 )
-            refresh = RefreshToken.for_user(user)
+            refresh = issue_tokens(user)
             response_data = {
                 "refresh": str(refresh),
                 "access": str(refresh.access_token),
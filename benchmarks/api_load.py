@@ -0,0 +1,444 @@
+"""
+End-to-end API load test: a mixed workload over every route of the user, company and jobs
+URLconfs, against a dataset made by `manage.py generate_data`.
+
+Each request goes through Django's full WSGI stack (middleware, authentication, views) in
+this process, on `--threads` client threads sharing a file database. Per scenario it reports
+p50/p95/p99 latency, queries per request and unexpected statuses, plus the overall
+throughput. `--output` saves the results as JSON; `--compare` prints the change against a
+previous run, e.g. one from the parent commit.
+
+    python -m benchmarks.api_load --requests 5000 --output HEAD.json
+    python -m benchmarks.api_load --requests 5000 --compare HEAD.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from wsgiref.util import setup_testing_defaults
+
+from apps.jobs.sample_data import LOCATIONS, WORDS, make_rng, sentence
+from benchmarks._common import BASE_DIR, percentile, setup_django, test_database
+
+PASSWORD = "password123"
+URLCONFS = ["apps.user.urls", "apps.company.urls", "apps.jobs.urls"]
+
+
+class Workload:
+    """The generated dataset's ids and tokens, and the scenarios drawing requests from them."""
+
+    def __init__(self, rng, skew):
+        from django.conf import settings
+        from django.db.models import Count
+
+        from apps.company.models import Company
+        from apps.jobs.models import JobApplication, JobListing, ResumeBlob, ResumeUpload
+        from apps.user.authentication import issue_tokens
+        from apps.user.models import User
+
+        self.rng = rng
+        self.lock = threading.Lock()
+        self.counter = 0
+        companies = dict(Company.objects.values_list("owner_id", "id"))
+        employers = list(User.objects.filter(roles="employer", id__in=companies).order_by("id"))
+        candidates = list(User.objects.filter(roles="candidate").order_by("id")[:200])
+        self.employers = [(str(issue_tokens(user).access_token), companies[user.id]) for user in employers[:50]]
+        self.employer_tokens = {company_id: token for token, company_id in self.employers}
+        self.employer_usernames = [user.username for user in employers[:50]]
+        # Jobs by popularity, like the applications of the generated data.
+        self.jobs = list(
+            JobListing.objects.open().annotate(applicants=Count("jobapplication"))
+            .order_by("-applicants", "-id").values_list("id", "company_id")
+        )
+        self.job_weights = list(accumulate(1 / (rank + 1) ** skew for rank in range(len(self.jobs))))
+        # Candidates page through the open listings only, expired ones drop out of the list.
+        self.job_pages = max(1, min(20, -(-len(self.jobs) // settings.REST_FRAMEWORK["PAGE_SIZE"])))
+        self.company_jobs = defaultdict(list)
+        for job_id, company_id in self.jobs:
+            self.company_jobs[company_id].append(job_id)
+        self.applications = list(
+            JobApplication.objects.filter(job__company_id__in=self.employer_tokens).values_list("id", "job__company_id")
+        )
+        # Candidates apply with an already completed chunked upload, so applying writes no file.
+        blob = ResumeBlob.objects.create(sha256="0" * 64, size=1, file="resumes/benchmark.pdf", text_status="done")
+        self.candidates = []
+        for user in candidates:
+            upload = ResumeUpload.objects.create(
+                candidate=user, filename="resume.pdf", size=1, offset=1, status="complete", blob=blob
+            )
+            applied = set(JobApplication.objects.filter(candidate=user).values_list("job_id", flat=True))
+            self.candidates.append((str(issue_tokens(user).access_token), str(upload.id), applied, user.id))
+        staff = User.objects.create(username="benchmark-staff", email="staff@example.com", roles="employer", is_staff=True)
+        self.staff_token = str(issue_tokens(staff).access_token)
+        self.user_ids = [user.id for user in candidates] + [user.id for user in employers]
+        self.candidate_usernames = [user.username for user in candidates]
+
+    def next_number(self):
+        with self.lock:
+            self.counter += 1
+            return self.counter
+
+    def job(self):
+        return self.rng.choices(self.jobs, cum_weights=self.job_weights)[0][0]
+
+    def employer(self):
+        return self.rng.choice(self.employers)
+
+    def candidate(self):
+        return self.rng.choice(self.candidates)
+
+    def own_job(self):
+        token, company_id = self.employer()
+        return token, self.rng.choice(self.company_jobs[company_id] or [0])
+
+    def scenarios(self):
+        """`name: (weight, url name, expected statuses, request builder)`, builders returning request kwargs."""
+        from apps.jobs.models import ResumeUpload
+        from apps.jobs.resumes import write_chunk
+
+        rng = self.rng
+
+        def get(token, path, query=""):
+            return {"method": "GET", "path": path, "token": token, "query": query}
+
+        def send(method, token, path, body=None, content_type="application/json", raw=None):
+            return {
+                "method": method, "path": path, "token": token, "content_type": content_type,
+                "body": raw if raw is not None else json.dumps(body).encode(),
+            }
+
+        def apply():
+            token, upload_id, applied, _ = self.candidate()
+            job_id = self.job()
+            applied.add(job_id)
+            return send("POST", token, "/jobs/applications/", {"job": job_id, "resume_upload": upload_id})
+
+        def resume_upload():
+            token = self.candidate()[0]
+            return send("POST", token, "/jobs/resume-uploads/", {"filename": "resume.pdf", "size": 1024})
+
+        def resume_chunk():
+            token, _, _, user_id = self.candidate()
+            upload = ResumeUpload.objects.create(candidate_id=user_id, filename="resume.pdf", size=4096)
+            request = send("PATCH", token, f"/jobs/resume-uploads/{upload.id}/", raw=os.urandom(4096),
+                           content_type="application/octet-stream")
+            return {**request, "headers": {"Upload-Offset": "0"}}
+
+        def resume_status():
+            token, upload_id, _, _ = self.candidate()
+            return get(token, f"/jobs/resume-uploads/{upload_id}/")
+
+        def resume_complete():
+            token, _, _, user_id = self.candidate()
+            upload = ResumeUpload.objects.create(candidate_id=user_id, filename="resume.pdf", size=4096)
+            write_chunk(upload, 0, io.BytesIO(os.urandom(4096)))
+            return send("POST", token, f"/jobs/resume-uploads/{upload.id}/complete/", raw=b"")
+
+        def bulk_import():
+            rows = b"".join(
+                json.dumps({
+                    "job_title": sentence(rng, 3), "job_description": sentence(rng, 40),
+                    "job_location": rng.choice(LOCATIONS), "salary": rng.randrange(10000, 200000),
+                }).encode() + b"\n"
+                for _ in range(20)
+            )
+            return send("POST", self.employer()[0], "/jobs/jobs/bulk-import/", raw=rows, content_type="application/x-ndjson")
+
+        def bulk_change_status():
+            token, job_id = self.own_job()
+            return send("POST", token, "/jobs/employer/bulk-change-status/", {
+                "status": rng.choice(["accepted", "rejected"]), "job": job_id, "current_status": "pending",
+            })
+
+        def candidate_token():
+            return self.candidate()[0]
+
+        def login():
+            username = rng.choice(self.candidate_usernames + self.employer_usernames)
+            return send("POST", None, "/user/user/login/", {"username": username, "password": PASSWORD})
+
+        def register():
+            number = self.next_number()
+            return send("POST", None, "/user/user/register/", {
+                "username": f"load-{number}", "email": f"load-{number}@example.com",
+                "password": PASSWORD, "roles": rng.choice(["candidate", "employer"]),
+            })
+
+        return {
+            # Browsing, the bulk of the traffic.
+            "job list": (30, "job-list", {200}, lambda: get(candidate_token(), "/jobs/jobs/", f"page={rng.randint(1, self.job_pages)}")),
+            "job list search": (8, "job-list", {200}, lambda: get(candidate_token(), "/jobs/jobs/", f"search={rng.choice(WORDS)}")),
+            "job list filtered": (6, "job-list", {200}, lambda: get(
+                candidate_token(), "/jobs/jobs/",
+                f"job_location={rng.choice(LOCATIONS)}&salary_min={rng.randrange(10000, 100000, 10000)}&ordering=-salary",
+            )),
+            "job list facets": (3, "job-list", {200}, lambda: get(candidate_token(), "/jobs/jobs/", "facets=true")),
+            "job list cursor": (4, "job-list", {200}, lambda: get(candidate_token(), "/jobs/jobs/", "pagination=cursor")),
+            "job list employer": (3, "job-list", {200}, lambda: get(self.employer()[0], "/jobs/jobs/")),
+            "job detail": (20, "job-detail", {200}, lambda: get(candidate_token(), f"/jobs/jobs/{self.job()}/")),
+            "job recommended": (4, "job-recommended", {200}, lambda: get(candidate_token(), "/jobs/jobs/recommended/")),
+            "job cache stats": (1, "job-cache-stats", {200}, lambda: get(self.staff_token, "/jobs/jobs/cache-stats/")),
+            # Employer writes.
+            "job create": (2, "job-list", {201}, lambda: send("POST", self.employer()[0], "/jobs/jobs/", {
+                "job_title": sentence(rng, 3), "job_description": sentence(rng, 40),
+                "job_location": rng.choice(LOCATIONS), "salary": rng.randrange(10000, 200000),
+            })),
+            "job update": (2, "job-detail", {200, 404}, lambda: send(
+                "PATCH", *self.own_job_path(), {"salary": rng.randrange(10000, 200000)}
+            )),
+            "job delete": (1, "job-detail", {204, 404}, lambda: send("DELETE", *self.own_job_path())),
+            "job bulk import": (1, "job-bulk-import", {200}, bulk_import),
+            # Candidates.
+            "application list": (6, "applications-list", {200}, lambda: get(candidate_token(), "/jobs/applications/")),
+            "apply": (4, "applications-list", {201, 400}, apply),
+            "application update": (1, "applications-detail", {200, 404}, lambda: self.candidate_application("PATCH", send)),
+            "application withdraw": (1, "applications-detail", {204, 404}, lambda: self.candidate_application("DELETE", send)),
+            "resume upload create": (1, "resume-upload-list", {201}, resume_upload),
+            "resume upload chunk": (1, "resume-upload-detail", {200}, resume_chunk),
+            "resume upload status": (1, "resume-upload-detail", {200}, resume_status),
+            "resume upload complete": (1, "resume-upload-complete", {200}, resume_complete),
+            "resume upload stats": (1, "resume-upload-stats", {200}, lambda: get(self.staff_token, "/jobs/resume-uploads/stats/")),
+            # Employers reviewing applicants.
+            "applicants": (4, "employer-list-applications", {200}, lambda: get(*self.applicants_path())),
+            "applicants search": (2, "employer-list-applications", {200}, lambda: get(*self.applicants_path(), "q=python")),
+            "bulk change status": (1, "employer-bulk-change-status", {200, 404}, bulk_change_status),
+            "employer analytics": (2, "employer-analytics", {200}, lambda: get(
+                self.employer()[0], "/jobs/employer/analytics/", rng.choice(["", "start=2000-01-01&end=2000-12-31"])
+            )),
+            "employer applications": (1, "employer-list", {200}, lambda: get(self.employer()[0], "/jobs/employer/")),
+            "employer application": (1, "employer-detail", {200}, lambda: get(
+                self.employer()[0], f"/jobs/employer/{rng.choice(self.applications)[0]}/"
+            )),
+            "change status": (3, "employer-change-status", {200}, lambda: send(
+                "PATCH", *self.change_status_path(), {"status": rng.choice(["pending", "accepted", "rejected"])}
+            )),
+            # Accounts and companies.
+            "login": (3, "user-login", {200}, login),
+            "register": (1, "user-register", {201}, register),
+            "role": (3, "user-get-user-role", {200}, lambda: get(candidate_token(), "/user/user/role/")),
+            "user list": (1, "user-list", {200}, lambda: get(candidate_token(), "/user/user/")),
+            "user detail": (1, "user-detail", {200}, lambda: get(candidate_token(), f"/user/user/{rng.choice(self.user_ids)}/")),
+            "company list": (1, "company-list", {200}, lambda: get(self.employer()[0], "/company/company/")),
+            "company detail": (1, "company-detail", {200}, lambda: get(
+                self.employer()[0], f"/company/company/{self.employer()[1]}/"
+            )),
+            "company create": (1, "company-list", {409}, lambda: send("POST", self.employer()[0], "/company/company/", {
+                "company_name": f"load company {self.next_number()}", "company_location": "Kochi", "description": "x",
+            })),
+        }
+
+    def own_job_path(self):
+        token, job_id = self.own_job()
+        return token, f"/jobs/jobs/{job_id}/"
+
+    def applicants_path(self):
+        token, job_id = self.own_job()
+        return token, f"/jobs/employer/{job_id}/applicants/"
+
+    def change_status_path(self):
+        application_id, company_id = self.rng.choice(self.applications)
+        return self.employer_tokens[company_id], f"/jobs/employer/{application_id}/change-status/"
+
+    def candidate_application(self, method, send):
+        token, _, applied, _ = self.candidate()
+        job_id = self.rng.choice(sorted(applied)) if applied else 0
+        if method == "DELETE":
+            applied.discard(job_id)
+            return send(method, token, f"/jobs/applications/{job_id}/")
+        return send(method, token, f"/jobs/applications/{job_id}/", {"cover_letter": sentence(self.rng, 20)})
+
+
+def route_names():
+    """Names of every route of the benchmarked URLconfs, without the router's API root and format suffixes."""
+    from django.urls import URLResolver, get_resolver
+
+    names = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif pattern.name and pattern.name != "api-root":
+                names.add(pattern.name)
+
+    for urlconf in URLCONFS:
+        walk(get_resolver(urlconf).url_patterns)
+    return names
+
+
+def make_handler():
+    from django.core.handlers.wsgi import WSGIHandler
+
+    from apps.query_budget import count_queries
+
+    handler = WSGIHandler()
+
+    def request(method, path, token=None, query="", body=b"", content_type="application/json", headers=None):
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "HTTP_HOST": "testserver",
+            "CONTENT_TYPE": content_type,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+        }
+        if token:
+            environ["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        for name, value in (headers or {}).items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+        setup_testing_defaults(environ)
+        statuses = []
+        start = time.perf_counter()
+        with count_queries() as counter:
+            response = handler(environ, lambda status, headers: statuses.append(status))
+            b"".join(response)
+            response.close()
+        return (time.perf_counter() - start) * 1000, counter.count, int(statuses[0].split()[0])
+
+    return request
+
+
+def run(workload, total, threads):
+    scenarios = workload.scenarios()
+    names = list(scenarios)
+    cum_weights = list(accumulate(scenarios[name][0] for name in names))
+    plan = workload.rng.choices(names, cum_weights=cum_weights, k=total)
+    request = make_handler()
+    results = defaultdict(list)
+
+    def call(name):
+        _, _, expected, build = scenarios[name]
+        latency, queries, status = request(**build())
+        results[name].append((latency, queries, status in expected, status))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, plan))
+    elapsed = time.perf_counter() - start
+
+    report = {}
+    for name in names:
+        samples = results.get(name)
+        if not samples:
+            continue
+        latencies = [latency for latency, _, _, _ in samples]
+        report[name] = {
+            "route": scenarios[name][1],
+            "requests": len(samples),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "queries": round(statistics.fmean(queries for _, queries, _, _ in samples), 2),
+            "errors": sum(1 for _, _, ok, _ in samples if not ok),
+            "statuses": sorted({status for _, _, _, status in samples}),
+        }
+    covered = {scenario[1] for scenario in scenarios.values()}
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1),
+        "scenarios": report,
+        "uncovered_routes": sorted(route_names() - covered),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result, baseline=None):
+    base = (baseline or {}).get("scenarios", {})
+    print(f"{'scenario':<22} {'reqs':>5} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'queries':>7} {'errors':>6}"
+          + (f" {'p95_vs_base':>11}" if baseline else ""))
+    for name, row in result["scenarios"].items():
+        line = (f"{name:<22} {row['requests']:>5} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} "
+                f"{row['queries']:>7} {row['errors']:>6}")
+        if baseline:
+            before = base.get(name, {}).get("p95_ms")
+            line += f" {(row['p95_ms'] - before) / before * 100:>+10.1f}%" if before else f" {'-':>11}"
+        print(line)
+    summary = f"throughput {result['throughput_rps']} req/s over {result['elapsed_s']} s"
+    if baseline:
+        summary += f" (baseline {baseline['throughput_rps']} req/s at {baseline.get('revision')})"
+    print(summary)
+    if result["uncovered_routes"]:
+        print("routes without a scenario:", ", ".join(result["uncovered_routes"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=1, help="Concurrent clients.")
+    parser.add_argument("--employers", type=int, default=100)
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--listings", type=int, default=10000)
+    parser.add_argument("--applications", type=int, default=50000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--no-response-cache", action="store_true", help="Turn the job response cache off.")
+    parser.add_argument("--output", help="Save the results to this JSON file.")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare against.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    if args.no_response_cache:
+        settings.JOB_RESPONSE_CACHE_TIMEOUT = 0
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.MEDIA_ROOT = directory
+        # A file database, so that client threads share it like server workers would.
+        connections.settings["default"]["TEST"]["NAME"] = os.path.join(directory, f"{uuid.uuid4().hex}.sqlite3")
+        with test_database():
+            start = time.perf_counter()
+            call_command(
+                "generate_data",
+                employers=args.employers,
+                candidates=args.candidates,
+                listings=args.listings,
+                applications=args.applications,
+                skew=args.skew,
+                password=PASSWORD,
+                stdout=io.StringIO(),
+            )
+            generated_s = time.perf_counter() - start
+            workload = Workload(make_rng(), args.skew)
+            result = run(workload, args.requests, args.threads)
+
+    result.update({
+        "revision": git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "arguments": vars(args),
+        "generate_data_s": round(generated_s, 2),
+    })
+    print_report(result, baseline)
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(result, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
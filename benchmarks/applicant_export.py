@@ -0,0 +1,78 @@
+"""
+Peak Python memory of the applicant list: one unpaginated JSON response vs the
+streaming NDJSON/CSV export, against the number of applicants.
+
+    python -m benchmarks.applicant_export --applicants 10000 50000 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks._common import setup_django, test_database
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--applicants", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.company.models import Company
+    from apps.jobs.export import stream_applications
+    from apps.jobs.models import JobApplication, JobListing
+    from apps.jobs.serializers import JobApplicationSerializer
+    from apps.user.models import User
+
+    with test_database():
+        owner = User.objects.create(username="owner", email="owner@example.com", roles="employer")
+        company = Company.objects.create(company_name="Ola", company_location="Kochi", description="", owner=owner)
+        job = JobListing.objects.create(
+            company=company, job_title="developer", job_description="", job_location="Kochi", salary=1
+        )
+        created = 0
+        print(f"{'applicants':>10} {'mode':>10} {'seconds':>9} {'peak_mb':>9}")
+        for total in args.applicants:
+            candidates = User.objects.bulk_create(
+                (
+                    User(username=f"candidate{i}", email=f"candidate{i}@example.com", roles="candidate")
+                    for i in range(created, total)
+                ),
+                batch_size=2000,
+            )
+            JobApplication.objects.bulk_create(
+                (
+                    JobApplication(job=job, candidate=candidate, resume="resume.pdf", cover_letter="hello " * 50)
+                    for candidate in candidates
+                ),
+                batch_size=2000,
+            )
+            created = total
+            applications = JobApplication.objects.filter(job=job).order_by("applied_at", "id")
+
+            def full_response():
+                JSONRenderer().render(JobApplicationSerializer(applications, many=True).data)
+
+            modes = {
+                "json": full_response,
+                "ndjson": lambda: sum(map(len, stream_applications(applications, "ndjson", "export"))),
+                "csv": lambda: sum(map(len, stream_applications(applications, "csv", "export"))),
+            }
+            for mode, func in modes.items():
+                elapsed, peak = measure(func)
+                print(f"{total:>10} {mode:>10} {elapsed:>9.2f} {peak:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Throughput of the read endpoints under WSGI (the DRF viewsets on a fixed pool of worker
+threads, like `gunicorn --threads`) against ASGI (the async views on one event loop),
+as the number of concurrent clients grows.
+
+Requests go straight to Django's WSGI and ASGI handlers in this process, without a server
+or sockets, rotating over job list pages, job details and the candidate's applications.
+`--db-latency-ms` adds a sleep to every query to stand in for a database across the network.
+
+    python -m benchmarks.asgi_wsgi --concurrency 1 16 64 256 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from wsgiref.util import setup_testing_defaults
+
+from apps.jobs.sample_data import LOCATIONS, make_rng, sentence
+from benchmarks._common import percentile, setup_django, test_database
+
+
+def make_requests(job_ids, pages, total):
+    paths = cycle(
+        [("/jobs/jobs/", f"page={page}") for page in range(1, pages + 1)]
+        + [(f"/jobs/jobs/{job_id}/", "") for job_id in job_ids]
+        + [("/jobs/applications/", "")]
+    )
+    return [next(paths) for _ in range(total)]
+
+
+def run_wsgi(requests, token, concurrency, threads):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+
+    def handle(request):
+        path, query = request
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "HTTP_HOST": "testserver",
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "wsgi.input": io.BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        response = handler(environ, lambda status, headers: statuses.append(status))
+        b"".join(response)
+        response.close()
+        return statuses[0].startswith("200")
+
+    # `concurrency` clients share the server's `threads` workers; the latency includes the wait for one.
+    with ThreadPoolExecutor(max_workers=threads) as server, ThreadPoolExecutor(max_workers=concurrency) as clients:
+        def call(request):
+            start = time.perf_counter()
+            ok = server.submit(handle, request).result()
+            return (time.perf_counter() - start) * 1000, ok
+
+        start = time.perf_counter()
+        results = list(clients.map(call, requests))
+    return time.perf_counter() - start, results
+
+
+def run_asgi(requests, token, concurrency):
+    from job_portal.asgi import application
+
+    async def call(request, semaphore):
+        path, query = request
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+        sent = []
+
+        async def receive():
+            try:
+                return next(messages)
+            except StopIteration:
+                # The client never disconnects early; Django cancels this wait once it has responded.
+                await asyncio.Future()
+
+        async def send(message):
+            sent.append(message)
+
+        async with semaphore:
+            start = time.perf_counter()
+            await application(scope, receive, send)
+            return (time.perf_counter() - start) * 1000, sent[0]["status"] == 200
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(call(request, semaphore) for request in requests))
+        return time.perf_counter() - start, results
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run.")
+    parser.add_argument("--wsgi-threads", type=int, default=16, help="Worker threads of the WSGI server.")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Sleep added to every query.")
+    parser.add_argument("--listings", type=int, default=1000)
+    parser.add_argument(
+        "--response-cache", action="store_true", help="Keep the job response cache on; by default every request misses."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db.backends.signals import connection_created
+
+    from apps.company.models import Company
+    from apps.jobs.models import JobApplication, JobListing
+    from apps.user.authentication import issue_tokens
+    from apps.user.models import User
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    if not args.response_cache:
+        settings.JOB_RESPONSE_CACHE_TIMEOUT = 0
+    if args.db_latency_ms:
+        def delay(execute, sql, params, many, context):
+            time.sleep(args.db_latency_ms / 1000)
+            return execute(sql, params, many, context)
+
+        connection_created.connect(
+            lambda sender, connection, **kwargs: connection.execute_wrappers.append(delay), weak=False
+        )
+
+    rng = make_rng()
+    with test_database():
+        owner = User.objects.create(username="owner", email="owner@example.com", roles="employer")
+        candidate = User.objects.create(username="candidate", email="candidate@example.com", roles="candidate")
+        company = Company.objects.create(company_name="Ola", company_location="Kochi", description="", owner=owner)
+        jobs = JobListing.objects.bulk_create(
+            JobListing(
+                company=company,
+                job_title=sentence(rng, 3),
+                job_description=sentence(rng, 60),
+                job_location=rng.choice(LOCATIONS),
+                salary=rng.randint(10000, 200000),
+            )
+            for _ in range(args.listings)
+        )
+        JobApplication.objects.bulk_create(
+            JobApplication(job=job, candidate=candidate, cover_letter=sentence(rng, 20)) for job in jobs[:20]
+        )
+        token = str(issue_tokens(candidate).access_token)
+        requests = make_requests([job.id for job in rng.sample(jobs, 50)], 50, args.requests)
+
+        print(f"{'server':>6} {'clients':>7} {'req_s':>8} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'errors':>6}")
+        for concurrency in args.concurrency:
+            for server in ("wsgi", "asgi"):
+                if server == "wsgi":
+                    elapsed, results = run_wsgi(requests, token, concurrency, args.wsgi_threads)
+                else:
+                    elapsed, results = run_asgi(requests, token, concurrency)
+                latencies = [latency for latency, _ in results]
+                errors = sum(1 for _, ok in results if not ok)
+                print(
+                    f"{server:>6} {concurrency:>7} {len(results) / elapsed:>8.0f} {percentile(latencies, 50):>8.2f} "
+                    f"{percentile(latencies, 95):>8.2f} {percentile(latencies, 99):>8.2f} {errors:>6}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Bulk job import throughput and peak Python memory against upload size.
+
+Peak memory should stay flat as the row count grows, since rows are read from the
+body line by line and inserted one batch at a time.
+
+    python -m benchmarks.bulk_import --rows 10000 100000 300000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from apps.jobs.sample_data import LOCATIONS, make_rng, sentence
+from benchmarks._common import setup_django, test_database
+
+
+class GeneratedBody:
+    """A request body stand-in that produces NDJSON lines on demand, like a socket stream."""
+
+    def __init__(self, rows, rng):
+        self.remaining = rows
+        self.rng = rng
+
+    def readline(self):
+        if not self.remaining:
+            return b""
+        self.remaining -= 1
+        row = {
+            "job_title": sentence(self.rng, 3),
+            "job_description": sentence(self.rng, 60),
+            "job_location": self.rng.choice(LOCATIONS),
+            "salary": str(self.rng.randrange(20000, 200000)),
+        }
+        return json.dumps(row).encode("utf-8") + b"\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 100000])
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.company.models import Company
+    from apps.jobs.bulk_import import import_jobs, iter_rows
+    from apps.user.models import User
+
+    with test_database():
+        owner = User.objects.create(username="owner", email="owner@example.com", roles="employer")
+        company = Company.objects.create(company_name="Ola", company_location="Kochi", description="", owner=owner)
+        print(f"{'rows':>8} {'seconds':>9} {'rows/s':>9} {'peak_mb':>9}")
+        for rows in args.rows:
+            body = GeneratedBody(rows, make_rng())
+            tracemalloc.start()
+            start = time.perf_counter()
+            report = import_jobs(iter_rows(body, "application/x-ndjson"), company)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert report["created"] == rows, report
+            print(f"{rows:>8} {elapsed:>9.2f} {rows / elapsed:>9.0f} {peak / 2 ** 20:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
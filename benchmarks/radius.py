@@ -0,0 +1,99 @@
+"""
+"Jobs within N km of X" latitude against table size: the exact haversine distance over every
+listing, against a bounding box on the indexed latitude/longitude columns first.
+
+Listings are placed at gazetteer places with skewed popularity, as resolved listings are. Each
+sample runs what the list endpoint runs for `?near=`: the COUNT plus the first page, nearest first.
+
+    python -m benchmarks.radius --sizes 100000 1000000
+"""
+import argparse
+from itertools import accumulate
+
+from apps.jobs.sample_data import make_rng, sentence
+from benchmarks._common import setup_django, summarize, test_database, timed
+
+QUERIES = [("Kochi", 25), ("Kochi", 150), ("Bangalore", 50), ("Delhi", 300), ("London", 500), ("Nairobi", 10)]
+
+
+def seed(size, rng):
+    from apps.company.models import Company
+    from apps.jobs.models import JobListing
+    from apps.locations.gazetteer import get_places
+    from apps.user.models import User
+
+    companies = list(Company.objects.all())
+    if not companies:
+        owners = User.objects.bulk_create(
+            User(username=f"owner{i}", email=f"owner{i}@example.com", roles="employer") for i in range(50)
+        )
+        companies = Company.objects.bulk_create(
+            Company(company_name=f"Company {i}", company_location="Kochi", description="", owner=owner)
+            for i, owner in enumerate(owners)
+        )
+    # Places in gazetteer order (most populous first), weighted by a Zipf law.
+    places = list(get_places().values())
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(places))))
+    remaining = size - JobListing.objects.count()
+    while remaining > 0:
+        count = min(remaining, 20000)
+        JobListing.objects.bulk_create(
+            (
+                JobListing(
+                    company=rng.choice(companies),
+                    job_title=sentence(rng, 3),
+                    job_description=sentence(rng, 20),
+                    job_location=place.name,
+                    location_id=place.id,
+                    latitude=place.latitude,
+                    longitude=place.longitude,
+                    salary=rng.randrange(20000, 200000),
+                )
+                for place in rng.choices(places, cum_weights=cum_weights, k=count)
+            ),
+            batch_size=2000,
+        )
+        remaining -= count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    from apps.jobs.models import JobListing
+    from apps.locations.gazetteer import resolve_location
+    from apps.locations.geo import distance_km, in_bounding_box, within_radius
+
+    def scan(queryset, latitude, longitude, radius):
+        return queryset.annotate(distance_km=distance_km(latitude, longitude)).filter(distance_km__lte=radius)
+
+    strategies = {"scan": scan, "bbox": within_radius}
+    rng = make_rng()
+
+    with test_database():
+        print(f"{'rows':>8} {'query':>14} {'in_box':>8} {'matches':>8} {'strategy':>8} {'mean_ms':>9} {'p50_ms':>9} {'p95_ms':>9}")
+        for size in args.sizes:
+            seed(size, rng)
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            base = JobListing.objects.open()
+            for name, radius in QUERIES:
+                place = resolve_location(name)
+                in_box = base.filter(in_bounding_box(place.latitude, place.longitude, radius)).count()
+                for strategy, narrow in strategies.items():
+                    queryset = narrow(base, place.latitude, place.longitude, radius).order_by("distance_km", "-id")
+                    matches = queryset.count()
+                    stats = summarize(timed(lambda: (queryset.count(), list(queryset[:20])), args.repeat))
+                    print(
+                        f"{size:>8} {f'{name} {radius}km':>14} {in_box:>8} {matches:>8} {strategy:>8} "
+                        f"{stats['mean_ms']:>9} {stats['p50_ms']:>9} {stats['p95_ms']:>9}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Job recommendations against the number of listings: matrix build time and size,
+recommendation latency of the sparse matrix-vector product against a per-job Python
+loop, and the cost of replaying one listing change.
+
+    python -m benchmarks.recommendations --listings 10000 100000
+"""
+import argparse
+import math
+import time
+
+from apps.jobs.sample_data import LOCATIONS, make_rng, sentence
+from benchmarks._common import setup_django, summarize, test_database, timed
+
+
+def python_loop_recommend(documents, applied, limit):
+    """Baseline: cosine similarity computed job by job over dict vectors."""
+    document_frequency = {}
+    for terms in documents.values():
+        for term in terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+    total = len(documents)
+    idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+    def vector(terms):
+        weights = {term: (1 + math.log(tf)) * idf[term] for term, tf in terms.items()}
+        norm = math.sqrt(sum(value * value for value in weights.values())) or 1
+        return {term: value / norm for term, value in weights.items()}
+
+    profile = {}
+    for job_id in applied:
+        for term, value in vector(documents[job_id]).items():
+            profile[term] = profile.get(term, 0) + value
+    scores = []
+    for job_id, terms in documents.items():
+        if job_id in applied:
+            continue
+        weights = vector(terms)
+        scores.append((sum(value * profile.get(term, 0) for term, value in weights.items()), job_id))
+    scores.sort(reverse=True)
+    return scores[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--listings", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--baseline-max", type=int, default=20000, help="Skip the Python loop above this size.")
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.company.models import Company
+    from apps.jobs.models import JobListing
+    from apps.jobs.recommend import JobRecommender, job_terms, record_job_changes
+    from apps.user.models import User
+
+    rng = make_rng()
+    with test_database():
+        owner = User.objects.create(username="owner", email="owner@example.com", roles="employer")
+        company = Company.objects.create(company_name="Ola", company_location="Kochi", description="", owner=owner)
+        created = 0
+        print(
+            f"{'listings':>9} {'build_s':>8} {'matrix_mb':>9} {'vocab':>7} "
+            f"{'vector_p50':>10} {'vector_p95':>10} {'loop_p50':>9} {'replay_ms':>9}"
+        )
+        for total in args.listings:
+            JobListing.objects.bulk_create(
+                (
+                    JobListing(
+                        company=company,
+                        job_title=sentence(rng, 3),
+                        job_description=sentence(rng, 60),
+                        job_location=rng.choice(LOCATIONS),
+                        salary=rng.randint(10000, 200000),
+                    )
+                    for _ in range(created, total)
+                ),
+                batch_size=2000,
+            )
+            created = total
+            job_ids = list(JobListing.objects.values_list("id", flat=True))
+
+            recommender = JobRecommender()
+            start = time.perf_counter()
+            recommender.build()
+            build_seconds = time.perf_counter() - start
+            matrix = recommender.matrix
+            matrix_mb = (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2 ** 20
+
+            profiles = [rng.sample(job_ids, 5) for _ in range(args.repeat)]
+            profile_iter = iter(profiles * 2)
+            vector = summarize(timed(lambda: recommender.recommend(next(profile_iter), 10), args.repeat))
+
+            loop_p50 = "skipped"
+            if total <= args.baseline_max:
+                documents = {
+                    job_id: job_terms(title, description)
+                    for job_id, title, description in JobListing.objects.values_list(
+                        "id", "job_title", "job_description"
+                    )
+                }
+                loop_iter = iter(profiles)
+                loop = summarize(timed(lambda: python_loop_recommend(documents, set(next(loop_iter)), 10), 3))
+                loop_p50 = f"{loop['p50_ms']:.1f}"
+
+            def replay():
+                job = JobListing.objects.create(
+                    company=company,
+                    job_title=sentence(rng, 3),
+                    job_description=sentence(rng, 60),
+                    job_location="Kochi",
+                    salary=1,
+                )
+                record_job_changes([job.id])
+                recommender.sync()
+                recommender.recommend(profiles[0], 10)
+
+            replay_stats = summarize(timed(replay, 20))
+            created += 20
+            print(
+                f"{total:>9} {build_seconds:>8.2f} {matrix_mb:>9.1f} {len(recommender.vocabulary):>7} "
+                f"{vector['p50_ms']:>10.2f} {vector['p95_ms']:>10.2f} {loop_p50:>9} {replay_stats['p50_ms']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
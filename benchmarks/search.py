@@ -0,0 +1,75 @@
+"""
+Job search latency against table size: `icontains` scans vs the FTS5 index.
+
+Each sample runs what the list endpoint runs for `?search=`: the pagination
+COUNT plus the first page.
+
+    python -m benchmarks.search --sizes 1000 10000 100000
+"""
+import argparse
+
+from apps.jobs.sample_data import LOCATIONS, make_rng, sentence
+from benchmarks._common import setup_django, summarize, test_database, timed
+
+
+def seed(size, rng):
+    from apps.company.models import Company
+    from apps.jobs.models import JobListing
+    from apps.user.models import User
+
+    JobListing.objects.all().delete()
+    companies = list(Company.objects.all())
+    if not companies:
+        owners = User.objects.bulk_create(
+            User(username=f"owner{i}", email=f"owner{i}@example.com", roles="employer") for i in range(50)
+        )
+        companies = Company.objects.bulk_create(
+            Company(company_name=f"Company {i}", company_location=rng.choice(LOCATIONS), description="", owner=owner)
+            for i, owner in enumerate(owners)
+        )
+    JobListing.objects.bulk_create(
+        (
+            JobListing(
+                company=rng.choice(companies),
+                job_title=sentence(rng, 3),
+                job_description=sentence(rng, 60),
+                job_location=rng.choice(LOCATIONS),
+                salary=rng.randrange(20000, 200000),
+            )
+            for _ in range(size)
+        ),
+        batch_size=2000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.jobs.models import JobListing
+    from apps.jobs.search import DatabaseSearchBackend, SQLiteFTSBackend
+
+    queries = [["python"], ["senior", "devops"], ["kochi", "java"], ["term2500"], ["term40", "term9"], ["kub"]]
+    backends = {"icontains": DatabaseSearchBackend(), "fts5": SQLiteFTSBackend()}
+    rng = make_rng()
+
+    with test_database():
+        print(f"{'rows':>8} {'backend':>10} {'mean_ms':>9} {'p50_ms':>9} {'p95_ms':>9}")
+        for size in args.sizes:
+            seed(size, rng)
+            backends["fts5"].rebuild()
+            base = JobListing.objects.select_related("company").open()
+            for name, backend in backends.items():
+                samples = []
+                for terms in queries:
+                    queryset = backend.search(base, terms)
+                    samples += timed(lambda: (queryset.count(), list(queryset[:20])), args.repeat)
+                stats = summarize(samples)
+                print(f"{size:>8} {name:>10} {stats['mean_ms']:>9} {stats['p50_ms']:>9} {stats['p95_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
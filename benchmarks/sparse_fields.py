@@ -0,0 +1,94 @@
+"""
+Job list payload size and latency with sparse fieldsets: every field against `?fields=` (the
+columns a listing card shows) and `?omit=` (everything but the descriptions).
+
+Requests go through the full view stack with the response cache off, for a 100-job keyset page
+and a page-number page, against tables with long job and company descriptions.
+
+    python -m benchmarks.sparse_fields --listings 1000 10000 100000
+"""
+import argparse
+
+from apps.jobs.sample_data import LOCATIONS, make_rng, sentence
+from benchmarks._common import setup_django, summarize, test_database, timed
+
+MODES = {
+    "full": {},
+    "fields": {"fields": "id,job_title,job_location,salary,company.company_name"},
+    "omit": {"omit": "job_description,company.description"},
+}
+PAGES = {
+    "cursor": {"pagination": "cursor", "page_size": 100},
+    "page": {"page": 1},
+}
+
+
+def seed(size, rng):
+    from apps.company.models import Company
+    from apps.jobs.models import JobListing
+    from apps.user.models import User
+
+    companies = list(Company.objects.all())
+    if not companies:
+        owners = User.objects.bulk_create(
+            User(username=f"owner{i}", email=f"owner{i}@example.com", roles="employer") for i in range(50)
+        )
+        companies = Company.objects.bulk_create(
+            Company(
+                company_name=f"Company {i}",
+                company_location=rng.choice(LOCATIONS),
+                description=sentence(rng, 150),
+                owner=owner,
+            )
+            for i, owner in enumerate(owners)
+        )
+    JobListing.objects.bulk_create(
+        (
+            JobListing(
+                company=rng.choice(companies),
+                job_title=sentence(rng, 3),
+                job_description=sentence(rng, 400),
+                job_location=rng.choice(LOCATIONS),
+                salary=rng.randrange(20000, 200000),
+            )
+            for _ in range(size - JobListing.objects.count())
+        ),
+        batch_size=2000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--listings", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from rest_framework.test import APIClient
+
+    from apps.user.models import User
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.JOB_RESPONSE_CACHE_TIMEOUT = 0
+    rng = make_rng()
+
+    with test_database():
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="candidate", email="c@example.com", roles="candidate"))
+        print(f"{'rows':>8} {'page':>7} {'mode':>7} {'bytes':>9} {'mean_ms':>9} {'p50_ms':>9} {'p95_ms':>9}")
+        for size in args.listings:
+            seed(size, rng)
+            for page, page_params in PAGES.items():
+                for mode, mode_params in MODES.items():
+                    params = {**page_params, **mode_params}
+                    size_bytes = len(client.get("/jobs/jobs/", params).content)
+                    stats = summarize(timed(lambda: client.get("/jobs/jobs/", params), args.repeat))
+                    print(
+                        f"{size:>8} {page:>7} {mode:>7} {size_bytes:>9} "
+                        f"{stats['mean_ms']:>9} {stats['p50_ms']:>9} {stats['p95_ms']:>9}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
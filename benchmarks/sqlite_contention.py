@@ -0,0 +1,201 @@
+"""
+Write contention on SQLite: concurrent applies and status changes, with readers paging the
+job list meanwhile, under the default SQLite settings and under the production profile
+(`SQLITE_PRODUCTION`: WAL, synchronous=NORMAL, mmap, page cache, busy timeout, IMMEDIATE
+transactions, persistent connections) with locked writes retried.
+
+Each profile runs on its own database file, since WAL mode sticks to the file. Requests go
+straight to Django's WSGI handler, one thread per client, which closes or keeps its
+connection after each request like a threaded server does.
+
+    python -m benchmarks.sqlite_contention --writers 8 --readers 8 --operations 100
+"""
+import argparse
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from apps.jobs.sample_data import LOCATIONS, make_rng, sentence
+from benchmarks._common import percentile, setup_django, test_database
+
+PROFILES = ("default", "production")
+
+
+def use_profile(profile, database_name):
+    from django.conf import settings
+    from django.db import connections
+
+    settings_dict = connections.settings["default"]
+    settings_dict["TEST"]["NAME"] = database_name
+    if profile == "production":
+        settings_dict["CONN_MAX_AGE"] = 600
+        settings_dict["CONN_HEALTH_CHECKS"] = True
+        settings_dict["OPTIONS"] = {
+            "init_command": ";".join(f"PRAGMA {name}={value}" for name, value in settings.SQLITE_PRAGMAS.items()),
+            "transaction_mode": "IMMEDIATE",
+        }
+        settings.DATABASE_LOCKED_RETRIES = 4
+    else:
+        settings_dict["CONN_MAX_AGE"] = 0
+        settings_dict["CONN_HEALTH_CHECKS"] = False
+        settings_dict["OPTIONS"] = {}
+        settings.DATABASE_LOCKED_RETRIES = 0
+
+
+def make_handler():
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+
+    def request(method, path, token, body=None, query=""):
+        payload = json.dumps(body).encode() if body is not None else b""
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "HTTP_HOST": "testserver",
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(payload)),
+            "wsgi.input": io.BytesIO(payload),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        start = time.perf_counter()
+        response = handler(environ, lambda status, headers: statuses.append(status))
+        b"".join(response)
+        response.close()
+        return (time.perf_counter() - start) * 1000, int(statuses[0].split()[0])
+
+    return request
+
+
+def seed(rng, args):
+    from apps.company.models import Company
+    from apps.jobs.models import JobApplication, JobListing, ResumeBlob, ResumeUpload
+    from apps.user.authentication import issue_tokens
+    from apps.user.models import User
+
+    owner = User.objects.create(username="owner", email="owner@example.com", roles="employer")
+    company = Company.objects.create(company_name="Ola", company_location="Kochi", description="", owner=owner)
+    jobs = JobListing.objects.bulk_create(
+        JobListing(
+            company=company,
+            job_title=sentence(rng, 3),
+            job_description=sentence(rng, 60),
+            job_location=rng.choice(LOCATIONS),
+            salary=rng.randint(10000, 200000),
+        )
+        for _ in range(args.operations)
+    )
+    blob = ResumeBlob.objects.create(sha256="0" * 64, size=1, file="resumes/benchmark.txt")
+    candidates = User.objects.bulk_create(
+        User(username=f"candidate{n}", email=f"candidate{n}@example.com", roles="candidate")
+        for n in range(args.writers)
+    )
+    uploads = ResumeUpload.objects.bulk_create(
+        ResumeUpload(candidate=candidate, filename="resume.txt", size=1, offset=1, status="complete", blob=blob)
+        for candidate in candidates
+    )
+    # The applications the employer changes the status of, one candidate apart from the appliers.
+    reviewed = User.objects.create(username="reviewed", email="reviewed@example.com", roles="candidate")
+    applications = JobApplication.objects.bulk_create(
+        JobApplication(job=job, candidate=reviewed, resume=blob.file.name, resume_blob=blob) for job in jobs
+    )
+    writers = [
+        (str(issue_tokens(candidate).access_token), str(upload.id)) for candidate, upload in zip(candidates, uploads)
+    ]
+    return (
+        [job.id for job in jobs],
+        [application.id for application in applications],
+        writers,
+        str(issue_tokens(owner).access_token),
+        str(issue_tokens(reviewed).access_token),
+    )
+
+
+def run(args, profile, database_name):
+    use_profile(profile, database_name)
+    rng = make_rng()
+    with test_database():
+        job_ids, application_ids, writers, employer_token, reader_token = seed(rng, args)
+        request = make_handler()
+        done = threading.Event()
+        writes, reads = [], []
+
+        def write(worker):
+            token, upload_id = writers[worker]
+            for operation, job_id in enumerate(job_ids):
+                if operation % 2:
+                    application_id = application_ids[(worker * len(job_ids) + operation) % len(application_ids)]
+                    status = rng.choice(["pending", "accepted", "rejected"])
+                    writes.append(request(
+                        "PATCH", f"/jobs/employer/{application_id}/change-status/", employer_token, {"status": status}
+                    ))
+                else:
+                    writes.append(request(
+                        "POST", "/jobs/applications/", token, {"job": job_id, "resume_upload": upload_id}
+                    ))
+
+        def read():
+            page = 0
+            while not done.is_set():
+                # Pages 1-10, which all exist with the seeded jobs.
+                page = page % 10 + 1
+                reads.append(request("GET", "/jobs/jobs/", reader_token, query=f"page={page}"))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.readers) as readers:
+            for _ in range(args.readers):
+                readers.submit(read)
+            with ThreadPoolExecutor(max_workers=args.writers) as pool:
+                list(pool.map(write, range(args.writers)))
+            elapsed = time.perf_counter() - start
+            done.set()
+
+    def summary(results):
+        latencies = [latency for latency, _ in results]
+        return {
+            "per_s": round(len(results) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "errors": sum(1 for _, status in results if status >= 400),
+        }
+
+    return {"profile": profile, "writes": summary(writes), "reads": summary(reads)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8, help="Threads applying and changing statuses.")
+    parser.add_argument("--readers", type=int, default=8, help="Threads paging the job list meanwhile.")
+    parser.add_argument("--operations", type=int, default=100, help="Writes per writer thread.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    # Every read goes to the database.
+    settings.JOB_RESPONSE_CACHE_TIMEOUT = 0
+
+    print(f"{'profile':>10} {'kind':>6} {'per_s':>8} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'errors':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in PROFILES:
+            result = run(args, profile, os.path.join(directory, f"{profile}.sqlite3"))
+            for kind in ("writes", "reads"):
+                row = result[kind]
+                print(
+                    f"{profile:>10} {kind:>6} {row['per_s']:>8} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+                    f"{row['p99_ms']:>8} {row['errors']:>6}"
+                )
+
+
+if __name__ == "__main__":
+    main()
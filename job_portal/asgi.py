@@ -2,6 +2,8 @@
 ASGI config for job_portal project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests are routed with ``settings.ASGI_URLCONF``, which serves the hot read
+endpoints with async views.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -9,8 +11,24 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_portal.settings')
 
-application = get_asgi_application()
+
+class JobPortalASGIHandler(ASGIHandler):
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = settings.ASGI_URLCONF
+        return request, error_response
+
+
+django.setup(set_prefix=False)
+application = JobPortalASGIHandler()
+
+from apps.jobs.recommend import warm_up  # noqa: E402
+
+warm_up()
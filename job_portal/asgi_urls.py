@@ -0,0 +1,38 @@
+"""
+URLconf of the ASGI deployment (see `job_portal.asgi`).
+
+The hot read endpoints are served by async views; the other methods of their routes, and
+every other route, by the same DRF views as under WSGI.
+"""
+from django.urls import path
+
+from apps.jobs.async_views import AsyncJobApplicationListView, AsyncJobDetailView, AsyncJobListView
+from apps.jobs.views import JobApplicationViewSet, JobViewSet
+from apps.user.async_views import AsyncLoginView
+from job_portal import urls
+
+urlpatterns = [
+    path(
+        'jobs/jobs/',
+        AsyncJobListView.as_view(sync_view=JobViewSet.as_view({'post': 'create'}, basename='job', detail=False)),
+        name='job-list',
+    ),
+    path(
+        'jobs/jobs/<int:pk>/',
+        AsyncJobDetailView.as_view(
+            sync_view=JobViewSet.as_view(
+                {'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}, basename='job', detail=True
+            )
+        ),
+        name='job-detail',
+    ),
+    path(
+        'jobs/applications/',
+        AsyncJobApplicationListView.as_view(
+            sync_view=JobApplicationViewSet.as_view({'post': 'create'}, basename='applications', detail=False)
+        ),
+        name='applications-list',
+    ),
+    path('user/user/login/', AsyncLoginView.as_view(), name='user-login'),
+    *urls.urlpatterns,
+]
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -30,6 +31,9 @@ INSTALLED_APPS = [
     'apps.user',
     'apps.company',
     'apps.jobs',
+    'apps.notifications',
+    'apps.replicas',
+    'apps.locations',
 
     'rest_framework',
     'rest_framework_simplejwt',
@@ -37,6 +41,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.metrics.MetricsMiddleware',
+    'apps.replicas.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -44,10 +50,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.query_budget.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'job_portal.urls'
 
+# URLconf of the ASGI deployment (job_portal.asgi): async views for job list/detail,
+# the candidate's applications and login, the WSGI routes for everything else.
+ASGI_URLCONF = 'job_portal.asgi_urls'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -77,6 +88,55 @@ DATABASES = {
     }
 }
 
+# Production SQLite profile (SQLITE_PRODUCTION=1). WAL lets readers run alongside the writer,
+# IMMEDIATE transactions take the write lock at BEGIN (a deferred one that later writes fails
+# at once instead of waiting), and connections are kept across requests so the PRAGMAs run once.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    # Durable up to the last checkpoint on power loss, no fsync per commit.
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative: in KiB, so 64 MiB of page cache per connection.
+    'cache_size': -64 * 1024,
+    # Wait this long for a lock before "database is locked", in milliseconds.
+    'busy_timeout': 5000,
+}
+if os.environ.get('SQLITE_PRODUCTION'):
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    })
+
+# Applies and status changes that still find the database locked are retried this many times,
+# after a random wait of up to DATABASE_LOCKED_RETRY_DELAY seconds, doubled per retry and capped
+# at DATABASE_LOCKED_RETRY_MAX_DELAY; then they fail with 503.
+DATABASE_LOCKED_RETRIES = 4
+DATABASE_LOCKED_RETRY_DELAY = 0.05
+DATABASE_LOCKED_RETRY_MAX_DELAY = 1.0
+
+# Read replicas: ReplicaRouter sends the reads of list/retrieve requests (REPLICA_READ_ACTIONS)
+# to the healthy ones. Add each replica to DATABASES with 'TEST': {'MIRROR': 'default'}.
+# Locally, SQLITE_REPLICAS=2 adds db.replica1.sqlite3 and db.replica2.sqlite3 as stand-ins, kept
+# up to date by `python manage.py replica_heartbeat --copy-sqlite --loop`.
+DATABASE_REPLICAS = [f'replica{number}' for number in range(1, int(os.environ.get('SQLITE_REPLICAS', 0)) + 1)]
+for alias in DATABASE_REPLICAS:
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / f'db.{alias}.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['apps.replicas.router.ReplicaRouter']
+REPLICA_READ_ACTIONS = ['list', 'retrieve']
+# A replica whose heartbeat (`replica_heartbeat --loop`) is older than this is skipped, in seconds.
+REPLICA_MAX_LAG_SECONDS = 5
+REPLICA_HEALTH_CHECK_INTERVAL = 5
+# After a write, the client reads from the primary for this long (db_primary cookie), in seconds.
+REPLICA_STICKY_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -127,25 +187,95 @@ AUTH_USER_MODEL = 'user.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.user.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 3,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
 }
 
+# QueryBudgetMiddleware (DEBUG only): "warn" logs requests over their view's `query_budgets`, "raise" fails them.
+QUERY_BUDGET_MODE = 'warn'
+
+# Use a shared backend (Redis/Memcached) when running several workers, so that
+# response cache invalidation is seen by every process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Whether CACHES['default'] is shared by every process. Token claims and the in-process user cache are
+# only trusted when it is, since the auth versions that invalidate them live there; otherwise every
+# request loads its user. None decides from the backend (LocMem and Dummy are process-local).
+AUTH_SHARED_CACHE = None
+
+# Role-scoped response cache for /jobs/jobs/ list and detail, in seconds.
+JOB_RESPONSE_CACHE_TIMEOUT = 300
+
+# Upper bounds of the salary facet buckets of /jobs/jobs/?facets=true; the last bucket is open-ended.
+JOB_SALARY_FACET_BUCKETS = [25000, 50000, 100000, 200000]
+
+# Keyset pagination for /jobs/jobs/ and /jobs/applications/ ("page" keeps ?page= as the default).
+DEFAULT_PAGINATION_MODE = 'page'
+KEYSET_PAGE_SIZE = 20
+KEYSET_MAX_PAGE_SIZE = 100
+
+# /jobs/jobs/bulk-import/: rows per bulk_create batch and per-row errors kept in the report.
+BULK_IMPORT_BATCH_SIZE = 1000
+BULK_IMPORT_MAX_ERRORS = 1000
+
+# Largest resume accepted by the chunked upload API (/jobs/resume-uploads/), in bytes.
+RESUME_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+
+# Most application ids one /jobs/employer/bulk-change-status/ request may list.
+BULK_STATUS_CHANGE_MAX_IDS = 1000
+
+# Longest date range of one /jobs/employer/analytics/ request, in days.
+EMPLOYER_ANALYTICS_MAX_DAYS = 366
+
+# New job listings expire (candidates stop seeing them) this many days after creation, and
+# `archive_expired_jobs` moves them to the archive tables this many days after expiry.
+JOB_LISTING_TTL_DAYS = 60
+JOB_ARCHIVE_GRACE_DAYS = 30
+
+# Build the job recommender in the background when a WSGI/ASGI process starts, not in its first request.
+JOB_RECOMMENDER_WARM_UP = True
+
+# Default and largest `radius_km` of `?near=` job searches.
+JOB_RADIUS_DEFAULT_KM = 25
+JOB_RADIUS_MAX_KM = 500
+
+# Rows fetched per chunk by the streaming applicant export.
+EXPORT_CHUNK_SIZE = 2000
+
+JOB_SEARCH_BACKEND = 'apps.jobs.search.SQLiteFTSBackend'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-    'UPDATE_LAST_LOGIN': True,
+    # User has no last_login field.
+    'UPDATE_LAST_LOGIN': False,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
-    'AUTH_HEADER_TYPES': ('Bearer',)
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.user.authentication.ClaimsTokenObtainPairSerializer',
 }
 
+# Users kept per process by ClaimsJWTAuthentication for tokens whose claims went stale.
+AUTH_USER_CACHE_SIZE = 1024
+
+# Threads hashing passwords for the async login view, off the event loop.
+PASSWORD_HASHING_WORKERS = 4
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'sandbox.smtp.mailtrap.io'
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = '15e9f99716dea9'
 EMAIL_HOST_PASSWORD = '1d79c5ba7601d1'
-EMAIL_PORT = '2525'
\ No newline at end of file
+EMAIL_PORT = '2525'
+
+# Emails are queued in the outbox and sent by `python manage.py send_queued_mail`.
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_RETRY_MAX_SECONDS = 3600